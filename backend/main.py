@@ -1,6 +1,15 @@
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from backend.routers.history import router as history_router
 from backend.routers.resume import router as resume_router
+from backend.utils.config import close_clients
+from backend.utils.metrics import metrics
+from backend.workflow.checkpoint import checkpointer
+from backend.workflow.graph import warm_graph_registry
+from backend.workflow.history import history_store
+from backend.workflow.jobs import job_queue
 
 
 # 데이터베이스 초기화를 위한 임포트 추가
@@ -9,15 +18,38 @@ from backend.routers.resume import router as resume_router
 # 데이터베이스 초기화
 # Base.metadata.create_all(bind=engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 시작 시 워크플로우 그래프를 미리 컴파일
+    warm_graph_registry()
+    # 백그라운드 작업 워커 시작
+    await job_queue.start()
+    yield
+    await job_queue.stop()
+    # 저장 대기 중인 히스토리 기록
+    history_store.close()
+    checkpointer.close()
+    # 종료 시 풀링된 LLM/임베딩 HTTP 커넥션 정리
+    await close_clients()
+
+
 # FastAPI 앱 인스턴스 생성
 app = FastAPI(
     title="Debate Arena API",
     description="AI Debate Arena 서비스를 위한 API",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # /resume prefix 추가
 app.include_router(resume_router, prefix="/resume")
+app.include_router(history_router, prefix="/resume")
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """프로세스 누적 메트릭을 Prometheus 텍스트 형식으로 반환합니다."""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
 
 
 # if __name__ == "__main__":
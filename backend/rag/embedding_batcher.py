@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from backend.utils.metrics import metrics
+from backend.utils.tokens import count_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class _Request:
+    """embed()/aembed() 호출 하나 (여러 배치에 나뉘어 들어갈 수 있음)"""
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.vectors: List[Optional[List[float]]] = [None] * len(texts)
+        self.remaining = len(texts)
+        self.future: Future = Future()
+        self.submitted_at = time.perf_counter()
+
+
+# (요청, 요청 내 위치, 텍스트, 토큰 수)
+_Item = Tuple[_Request, int, str, int]
+
+
+def _settle(future: Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+    """Future가 아직 완료되지 않았으면 결과나 예외를 지정합니다. (여러 배치 워커가 동시에 완료할 수 있음)"""
+    try:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+class EmbeddingBatcher:
+    """동시에 들어온 임베딩 요청을 모아 토큰 수 기준 배치로 나눠 병렬로 요청합니다.
+
+    - max_concurrency개 워커가 대기 중인 텍스트를 가져가 배치로 요청합니다. 가장 먼저 들어온 텍스트가
+      window만큼 기다린 뒤 가져가므로 그 사이 다른 세션의 텍스트가 같은 배치에 합쳐집니다.
+    - 워커는 대기 중인 토큰을 쉬고 있는 워커 수로 나눈 만큼 도착 순서대로 가져가며(tiktoken 기준),
+      max_batch_tokens와 max_batch_texts를 넘지 않습니다. 한 텍스트가 한도보다 길면 단독 배치로 보냅니다.
+      모든 워커가 바쁜 동안 쌓인 텍스트는 다음 배치에 한꺼번에 담깁니다.
+    - 스레드와 asyncio 호출을 모두 지원하며, 배치별 텍스트 수/토큰 수/소요 시간은
+      embedding_batch_* 메트릭과 stats()로 확인합니다.
+    - 배치 처리 중 어떤 오류가 나도 해당 배치의 호출에 예외를 전달하고 워커는 계속 동작하며,
+      호출 측은 최대 timeout초까지만 기다립니다.
+    """
+
+    def __init__(
+        self,
+        embeddings_factory: Callable[[], Embeddings],
+        window: float = 0.01,
+        max_batch_tokens: int = 100_000,
+        max_batch_texts: int = 2048,
+        max_concurrency: int = 4,
+        timeout: float = 120.0,
+    ):
+        self._embeddings_factory = embeddings_factory
+        self.timeout = timeout
+        self.window = window
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_texts = max_batch_texts
+        self.max_concurrency = max_concurrency
+        self._pending: Deque[_Item] = deque()
+        self._pending_tokens = 0
+        self._idle = max_concurrency
+        self._cond = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        # 최근 배치의 (텍스트 수, 토큰 수, 소요 시간(초)) - window 조정용 통계
+        self._recent: Deque[Tuple[int, int, float]] = deque(maxlen=1024)
+
+    def submit(self, texts: List[str]) -> Future:
+        """텍스트 목록을 대기열에 넣고 벡터 목록을 돌려줄 Future를 반환합니다."""
+        request = _Request(texts)
+        if not texts:
+            request.future.set_result([])
+            return request.future
+        items = [(request, index, text, count_tokens(text)) for index, text in enumerate(texts)]
+        with self._cond:
+            if not self._workers:
+                self._workers = [
+                    threading.Thread(target=self._worker, name=f"embedding-batch-{i}", daemon=True)
+                    for i in range(self.max_concurrency)
+                ]
+                for worker in self._workers:
+                    worker.start()
+            self._pending.extend(items)
+            self._pending_tokens += sum(item[3] for item in items)
+            self._cond.notify_all()
+        metrics.inc("embedding_batch_requests_total")
+        return request.future
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return self.submit(texts).result(timeout=self.timeout)
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.wait_for(asyncio.wrap_future(self.submit(texts)), self.timeout)
+
+    # 배치 구성
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                batch = self._next_batch()
+                self._idle -= 1
+            try:
+                self._run_batch(batch)
+            except Exception as e:
+                # 예상하지 못한 오류도 기다리는 호출에 전달하고 워커는 계속 동작
+                logger.error(f"Embedding batch failed ({len(batch)} texts): {str(e)}", exc_info=True)
+                self._fail(batch, e)
+            finally:
+                with self._cond:
+                    self._idle += 1
+                    self._cond.notify_all()
+
+    def _next_batch(self) -> List[_Item]:
+        """대기 중인 텍스트가 window만큼 모이기를 기다린 뒤 이번 워커가 요청할 배치를 꺼냅니다. (_cond 안에서 호출)"""
+        while True:
+            if not self._pending:
+                self._cond.wait()
+                continue
+            remaining = self._pending[0][0].submitted_at + self.window - time.perf_counter()
+            if remaining <= 0:
+                break
+            self._cond.wait(remaining)
+
+        # 쉬고 있는 워커끼리 대기 중인 토큰을 나눠 가져감 (이번 워커 포함)
+        max_tokens = min(self.max_batch_tokens, max(1, math.ceil(self._pending_tokens / self._idle)))
+        max_texts = min(self.max_batch_texts, max(1, math.ceil(len(self._pending) / self._idle)))
+        batch: List[_Item] = []
+        batch_tokens = 0
+        while self._pending:
+            tokens = self._pending[0][3]
+            if batch and (batch_tokens + tokens > max_tokens or len(batch) >= max_texts):
+                break
+            batch.append(self._pending.popleft())
+            batch_tokens += tokens
+        self._pending_tokens -= batch_tokens
+        return batch
+
+    # 배치 실행
+
+    def _run_batch(self, batch: List[_Item]) -> None:
+        tokens = sum(item[3] for item in batch)
+        started_at = time.perf_counter()
+        # 첫 요청이 대기열에 들어온 뒤 배치가 실행되기까지의 시간 (window + 대기)
+        queued = started_at - min(item[0].submitted_at for item in batch)
+        vectors = self._embeddings_factory().embed_documents([item[2] for item in batch])
+        if len(vectors) != len(batch):
+            raise ValueError(f"임베딩 결과 수({len(vectors)})가 요청한 텍스트 수({len(batch)})와 다릅니다.")
+
+        elapsed = time.perf_counter() - started_at
+        self._recent.append((len(batch), tokens, elapsed))
+        metrics.inc("embedding_batches_total", result="ok")
+        metrics.inc("embedding_batch_texts_total", len(batch))
+        metrics.inc("embedding_batch_tokens_total", tokens)
+        metrics.inc("embedding_batch_seconds_total", elapsed)
+        metrics.inc("embedding_batch_queue_seconds_total", queued)
+
+        completed = []
+        with self._cond:
+            for (request, index, _, _), vector in zip(batch, vectors):
+                request.vectors[index] = vector
+                request.remaining -= 1
+                if request.remaining == 0:
+                    completed.append(request)
+        for request in completed:
+            _settle(request.future, result=request.vectors)
+
+    @staticmethod
+    def _fail(batch: List[_Item], error: Exception) -> None:
+        """배치에 포함된 호출에 예외를 전달합니다. (다른 배치에 나뉘어 들어간 텍스트가 있어도 호출 전체가 실패)"""
+        metrics.inc("embedding_batches_total", result="error")
+        for request in {id(item[0]): item[0] for item in batch}.values():
+            _settle(request.future, error=error)
+
+    def stats(self) -> Dict[str, Any]:
+        """최근 배치의 평균/p95 소요 시간과 처리량(텍스트/초)을 반환합니다."""
+        recent = list(self._recent)
+        if not recent:
+            return {"batches": 0}
+        latencies = sorted(seconds for _, _, seconds in recent)
+        texts = sum(size for size, _, _ in recent)
+        total_seconds = sum(latencies)
+        return {
+            "batches": len(recent),
+            "texts_per_batch": round(texts / len(recent), 1),
+            "tokens_per_batch": round(sum(tokens for _, tokens, _ in recent) / len(recent), 1),
+            "batch_latency_ms": {
+                "mean": round(total_seconds / len(recent) * 1000, 1),
+                "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1),
+            },
+            "texts_per_second": round(texts / total_seconds, 1) if total_seconds else None,
+        }
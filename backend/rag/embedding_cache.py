@@ -0,0 +1,255 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from backend.rag.embedding_batcher import EmbeddingBatcher
+from backend.utils import db
+from backend.utils.cache import MISSING, MemoryCache
+from backend.utils.config import get_embeddings, settings
+from backend.utils.metrics import metrics
+from backend.utils.singleflight import SingleFlight, wait
+
+# SQLite의 바인딩 변수 개수 제한을 넘지 않도록 조회를 나눠서 수행
+_LOOKUP_CHUNK = 500
+
+
+class CachedEmbeddings(Embeddings):
+    """임베딩 결과를 (모델명 + 텍스트) 해시로 캐시하는 래퍼
+
+    벡터는 float32 blob으로 SQLite(settings.DB_PATH)에 저장되므로 재시작 후에도 유지되고
+    같은 호스트의 여러 워커가 공유합니다. 디스크 캐시는 SQLiteCache와 같이 TTL과 최대 항목 수(LRU)를 가지며
+    쓰기 PRUNE_INTERVAL회마다 정리됩니다. 캐시에 없는 텍스트만 한 번에 모아 임베딩 API를 호출하며,
+    batcher를 지정하면 동시에 들어온 다른 호출의 텍스트와 함께 배치로 요청합니다.
+    """
+
+    # 쓰기 N회마다 만료/초과 항목 정리
+    PRUNE_INTERVAL = 100
+
+    def __init__(
+        self,
+        model_name: str,
+        embeddings_factory: Callable[[], Embeddings],
+        path: Optional[str] = None,
+        memory_size: int = 4096,
+        batcher: Optional[EmbeddingBatcher] = None,
+        max_entries: int = 20_000,
+        ttl: Optional[float] = None,
+    ):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._embeddings_factory = embeddings_factory
+        self._batcher = batcher
+        self.path = path
+        self._memory = MemoryCache(memory_size)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        # 동시 세션이 같은 텍스트를 동시에 임베딩하면 한 번만 요청하고 벡터를 공유
+        self._flight = SingleFlight("embedding")
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = db.connect(self.path)
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS embedding_cache (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    dim INTEGER NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL DEFAULT 0
+                )"""
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(embedding_cache)")}
+            if "accessed_at" not in columns:
+                # 접근 시각이 없던 이전 테이블 (기존 항목은 가장 오래된 항목으로 취급)
+                conn.execute("ALTER TABLE embedding_cache ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_embedding_cache_accessed_at ON embedding_cache (accessed_at)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        disk_keys = []
+        for key in keys:
+            vector = self._memory.get(key)
+            if vector is MISSING:
+                disk_keys.append(key)
+            else:
+                found[key] = vector
+
+        if not disk_keys:
+            return found
+
+        now = time.time()
+        # TTL이 지난 항목은 조회하지 않음 (삭제는 _prune에서)
+        created_after = now - self.ttl if self.ttl else 0
+        try:
+            with self._lock:
+                conn = self._connection()
+                for i in range(0, len(disk_keys), _LOOKUP_CHUNK):
+                    chunk = disk_keys[i:i + _LOOKUP_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        f"SELECT key, vector FROM embedding_cache WHERE key IN ({placeholders}) AND created_at > ?",
+                        (*chunk, created_after),
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32).tolist()
+                        self._memory.set(key, vector)
+                        found[key] = vector
+                    if rows:
+                        hit_keys = [key for key, _ in rows]
+                        conn.execute(
+                            f"UPDATE embedding_cache SET accessed_at = ? WHERE key IN ({','.join('?' * len(hit_keys))})",
+                            (now, *hit_keys),
+                        )
+        except sqlite3.Error as e:
+            print(f"임베딩 캐시 조회 중 오류 발생: {str(e)}")
+        return found
+
+    def _store(self, vectors: Dict[str, List[float]]) -> None:
+        now = time.time()
+        rows = []
+        for key, vector in vectors.items():
+            self._memory.set(key, vector)
+            array = np.asarray(vector, dtype=np.float32)
+            rows.append((key, self.model_name, array.shape[0], array.tobytes(), now, now))
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute("BEGIN")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embedding_cache (key, model, dim, vector, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                conn.execute("COMMIT")
+                # 배치 저장은 여러 항목을 한 번에 쓰므로 PRUNE_INTERVAL 경계를 넘을 때마다 정리
+                before = self._writes
+                self._writes += len(rows)
+                if self._writes // self.PRUNE_INTERVAL != before // self.PRUNE_INTERVAL:
+                    self._prune(conn, now)
+        except sqlite3.Error as e:
+            print(f"임베딩 캐시 저장 중 오류 발생: {str(e)}")
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        if self.ttl:
+            conn.execute("DELETE FROM embedding_cache WHERE created_at <= ?", (now - self.ttl,))
+        conn.execute(
+            """DELETE FROM embedding_cache WHERE key IN (
+                SELECT key FROM embedding_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )""",
+            (self.max_entries,),
+        )
+
+    def _split(self, texts: List[str]) -> Tuple[List[str], Dict[str, List[float]], Dict[str, str]]:
+        """캐시 적중 벡터와, 임베딩이 필요한 (중복 제거된) 텍스트 목록을 반환합니다."""
+        keys = [self._key(text) for text in texts]
+        found = self._lookup(list(dict.fromkeys(keys)))
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+
+        metrics.inc("embedding_cache_hits_total", sum(1 for key in keys if key in found))
+        metrics.inc("embedding_cache_misses_total", len(missing))
+        return keys, found, missing
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        if self._batcher is not None:
+            return self._batcher.embed(texts)
+        return self._embeddings_factory().embed_documents(texts)
+
+    async def _aembed(self, texts: List[str]) -> List[List[float]]:
+        if self._batcher is not None:
+            return await self._batcher.aembed(texts)
+        return await self._embeddings_factory().aembed_documents(texts)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = self._split(texts)
+        if missing:
+            # 다른 호출이 이미 임베딩 중인 텍스트는 그 결과를 기다리고 나머지만 요청
+            owned, shared = self._flight.claim(missing)
+            if owned:
+                try:
+                    vectors = self._embed([missing[key] for key in owned])
+                    new_vectors = dict(zip(owned, vectors))
+                    self._store(new_vectors)
+                except BaseException as e:
+                    self._flight.fail(owned, e)
+                    raise
+                self._flight.resolve(owned, new_vectors)
+                found.update(new_vectors)
+            for key, future in shared.items():
+                found[key] = future.result()
+        return [found[key] for key in keys]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = await asyncio.to_thread(self._split, texts)
+        if missing:
+            owned, shared = self._flight.claim(missing)
+            if owned:
+                try:
+                    vectors = await self._aembed([missing[key] for key in owned])
+                    new_vectors = dict(zip(owned, vectors))
+                    await asyncio.to_thread(self._store, new_vectors)
+                except BaseException as e:
+                    self._flight.fail(owned, e)
+                    raise
+                self._flight.resolve(owned, new_vectors)
+                found.update(new_vectors)
+            for key, future in shared.items():
+                found[key] = await wait(future)
+        return [found[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+_cached_embeddings: Optional[CachedEmbeddings] = None
+_cached_embeddings_lock = threading.Lock()
+
+
+def get_cached_embeddings() -> Embeddings:
+    """캐시가 적용된 임베딩 인스턴스를 반환합니다. (EMBEDDING_CACHE_ENABLED=false이면 원본 반환)"""
+    global _cached_embeddings
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return get_embeddings()
+    if _cached_embeddings is not None:
+        return _cached_embeddings
+
+    # 동시에 들어온 첫 요청들이 각자 배처(워커 스레드)를 만들지 않도록 한 번만 생성
+    with _cached_embeddings_lock:
+        if _cached_embeddings is None:
+            batcher = EmbeddingBatcher(
+                embeddings_factory=get_embeddings,
+                window=settings.EMBEDDING_BATCH_WINDOW,
+                max_batch_tokens=settings.EMBEDDING_BATCH_MAX_TOKENS,
+                max_batch_texts=settings.EMBEDDING_BATCH_MAX_TEXTS,
+                max_concurrency=settings.EMBEDDING_BATCH_CONCURRENCY,
+                timeout=settings.EMBEDDING_BATCH_TIMEOUT,
+            ) if settings.EMBEDDING_BATCH_ENABLED else None
+            _cached_embeddings = CachedEmbeddings(
+                model_name=settings.OPENAI_EMBEDDING_MODEL,
+                embeddings_factory=get_embeddings,
+                batcher=batcher,
+                max_entries=settings.EMBEDDING_CACHE_DISK_SIZE,
+                ttl=settings.EMBEDDING_CACHE_TTL,
+            )
+    return _cached_embeddings
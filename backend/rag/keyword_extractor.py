@@ -0,0 +1,164 @@
+import math
+import re
+from collections import defaultdict
+from typing import Dict, List
+
+from backend.workflow.state import AgentType
+
+# 한글 어절, 영문/기술 용어(C++, Node.js, CI/CD 등), 숫자를 토큰으로 분리
+_TOKEN_PATTERN = re.compile(r"[가-힣]+|[A-Za-z][A-Za-z0-9+#./-]*[A-Za-z0-9+#]|[A-Za-z]|\d+")
+_SENTENCE_PATTERN = re.compile(r"[.!?。\n]+")
+
+# 어절 끝에 붙는 조사/어미 (긴 것부터 제거)
+_SUFFIXES = sorted([
+    "으로써", "으로서", "에서는", "에게서", "이라는", "라는", "이라고", "라고",
+    "했습니다", "하였습니다", "합니다", "됩니다", "입니다", "습니다", "였습니다",
+    "하면서", "하였고", "했으며", "했고", "하고", "하며", "하여", "해서", "했던", "하는", "하던",
+    "되었고", "되어", "되는", "이었", "였던",
+    "에서", "에게", "으로", "부터", "까지", "처럼", "보다", "마다", "이나", "이며", "이고",
+    "과의", "와의", "에는", "에도", "로서", "로써",
+    "은", "는", "이", "가", "을", "를", "의", "에", "로", "와", "과", "도", "만", "들",
+], key=len, reverse=True)
+
+# 서술어로 끝나는 어절 (키워드 후보에서 제외)
+_PREDICATE_SUFFIXES = (
+    "습니다", "니다", "했다", "한다", "된다", "였다", "었다", "았다", "겠다", "하겠", "싶",
+)
+
+# 절을 잇는 연결 어미 (어절은 유지하되 뒤에서 구(phrase)를 끊음)
+_CONNECTIVE_SUFFIXES = (
+    "하며", "하고", "하여", "해서", "하면서", "했고", "했으며", "하였고", "되어", "되었고",
+)
+
+_STOPWORDS = {
+    # 한국어 불용어
+    "저는", "저", "제", "저의", "제가", "우리", "그", "이", "그리고", "하지만", "또한", "그래서",
+    "통해", "위해", "대한", "대해", "있는", "있습니다", "없는", "같은", "많은", "모든", "이런", "그런",
+    "것", "수", "등", "때", "점", "더", "및", "중", "내", "후", "전", "년", "월", "개월",
+    "경험", "생각", "과정", "부분", "다양한", "하다", "되다", "있다", "지원", "회사",
+    # 영어 불용어
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "by", "is", "are", "i", "we",
+}
+
+# 역할별로 가중치를 높일 관점 어휘
+_ROLE_LEXICON: Dict[AgentType, set] = {
+    AgentType.TECHNICAL_EVALUATOR: {
+        "개발", "설계", "구현", "성능", "최적화", "아키텍처", "서버", "데이터", "배포", "테스트",
+        "시스템", "알고리즘", "인프라", "프레임워크", "데이터베이스", "트래픽", "장애", "자동화",
+    },
+    AgentType.CULTURE_EVALUATOR: {
+        "협업", "소통", "커뮤니케이션", "가치", "문화", "성장", "도전", "책임", "팀", "리더십",
+        "신뢰", "열정", "고객", "배려", "주도", "피드백", "팀워크", "혁신",
+    },
+}
+
+_ROLE_LEXICON_BOOST = 1.5
+_TECH_TERM_BOOST = 2.0
+
+
+def _normalize(token: str) -> str:
+    """한글 어절에서 조사/어미를 떼어내고, 영문은 그대로 유지합니다."""
+    if not re.match(r"[가-힣]", token):
+        return token
+    # "팀원들과"처럼 조사가 겹친 경우를 위해 두 번까지 제거
+    for _ in range(2):
+        for suffix in _SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+                token = token[:-len(suffix)]
+                break
+        else:
+            break
+    return token
+
+
+def tokenize(text: str) -> List[List[str]]:
+    """문장별 내용어 토큰 목록을 반환합니다. 불용어 위치는 None으로 남겨 구(phrase) 경계로 사용합니다."""
+    sentences = []
+    for sentence in _SENTENCE_PATTERN.split(text):
+        tokens = []
+        for raw in _TOKEN_PATTERN.findall(sentence):
+            token = _normalize(raw)
+            if token.lower() in _STOPWORDS or raw in _STOPWORDS or token.isdigit():
+                tokens.append(None)
+            elif raw.endswith(_PREDICATE_SUFFIXES):
+                tokens.append(None)
+            elif re.match(r"[가-힣]", token) and len(token) < 2:
+                tokens.append(None)
+            else:
+                tokens.append(token)
+                if raw.endswith(_CONNECTIVE_SUFFIXES):
+                    tokens.append(None)
+        if any(tokens):
+            sentences.append(tokens)
+    return sentences
+
+
+def _candidates(sentence: List[str], max_ngram: int = 2) -> List[str]:
+    candidates = []
+    for i in range(len(sentence)):
+        for n in range(1, max_ngram + 1):
+            window = sentence[i:i + n]
+            if len(window) < n or any(token is None for token in window):
+                break
+            candidates.append(" ".join(window))
+    return candidates
+
+
+def extract_keywords(content: str, role: AgentType, top_n: int = 3) -> List[str]:
+    """LLM 없이 자기소개서에서 검색용 키워드를 추출합니다.
+
+    YAKE 방식과 유사하게 빈도, 문장 분포(문장 단위 TF-IDF), 첫 등장 위치를 조합해 점수를 매기고
+    역할별 관점 어휘와 영문 기술 용어에 가중치를 줍니다.
+    """
+    sentences = tokenize(content)
+    if not sentences:
+        return []
+
+    term_freq: Dict[str, int] = defaultdict(int)
+    sentence_freq: Dict[str, int] = defaultdict(int)
+    first_position: Dict[str, int] = {}
+
+    for index, sentence in enumerate(sentences):
+        seen = set()
+        for candidate in _candidates(sentence):
+            term_freq[candidate] += 1
+            first_position.setdefault(candidate, index)
+            if candidate not in seen:
+                sentence_freq[candidate] += 1
+                seen.add(candidate)
+
+    total_sentences = len(sentences)
+    lexicon = _ROLE_LEXICON.get(role, set())
+    scores: Dict[str, float] = {}
+
+    for candidate, tf in term_freq.items():
+        words = candidate.split(" ")
+        # 여러 문장에 고르게 등장하는 단어는 주제어일 가능성이 높으므로 분포를 가산
+        spread = sentence_freq[candidate] / total_sentences
+        idf = math.log(1 + total_sentences / sentence_freq[candidate])
+        position = 1 / math.log(math.e + first_position[candidate])
+        score = (1 + math.log(tf)) * (idf + spread) * position
+
+        is_tech_term = any(re.match(r"[A-Za-z]", word) for word in words)
+        if len(words) > 1:
+            # 반복해서 함께 쓰인 구나 영문 복합 용어(Spring Boot 등)는 단어보다 우선
+            is_compound = all(re.match(r"[A-Za-z]", word) for word in words)
+            score *= 1.2 if tf > 1 or is_compound else 0.8
+        if any(word in lexicon for word in words):
+            score *= _ROLE_LEXICON_BOOST
+        if is_tech_term and role != AgentType.CULTURE_EVALUATOR:
+            score *= _TECH_TERM_BOOST
+        scores[candidate] = score
+
+    keywords: List[str] = []
+    chosen_words = set()
+    for candidate in sorted(scores, key=lambda c: (-scores[c], first_position[c])):
+        # 이미 선택된 키워드와 단어가 겹치거나 포함 관계인 후보는 제외
+        words = set(candidate.split(" "))
+        if words & chosen_words or any(candidate in chosen or chosen in candidate for chosen in keywords):
+            continue
+        keywords.append(candidate)
+        chosen_words |= words
+        if len(keywords) == top_n:
+            break
+    return keywords
@@ -0,0 +1,130 @@
+import asyncio
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from langchain.schema import Document
+
+from backend.rag.embedding_cache import get_cached_embeddings
+from backend.rag.search_service import aget_search_content, get_search_content
+from backend.rag.session_store import SessionCorpus
+from backend.utils.config import settings
+from backend.utils.metrics import metrics
+from backend.utils.tracing import timed
+
+RoleKey = Tuple[str, str]
+
+# 검색 결과가 없어 채우지 못한 코퍼스를 다시 시도하기까지의 시간(초)
+_EMPTY_RETRY_SECONDS = 60.0
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def role_key(organization: str, position: str) -> RoleKey:
+    """대소문자/공백 차이는 같은 (회사, 직무)로 취급합니다."""
+    return (
+        _WHITESPACE.sub(" ", organization or "").strip().lower(),
+        _WHITESPACE.sub(" ", position or "").strip().lower(),
+    )
+
+
+def role_queries(organization: str, position: str) -> List[str]:
+    """(회사, 직무) 코퍼스를 채울 때 사용하는 검색어 목록"""
+    return [
+        f"{organization} {position}",
+        f"{organization} {position} 채용 자격요건",
+        f"{organization} 인재상 기업문화",
+    ]
+
+
+class RoleCorpus:
+    """(회사, 직무)별로 한 번 수집해 모든 문항/지원자가 공유하는 회사·직무 검색 코퍼스"""
+
+    def __init__(self, organization: str, position: str, ttl: float):
+        self.organization = organization
+        self.position = position
+        self.corpus = SessionCorpus(get_cached_embeddings())
+        self.ttl = ttl
+        self.expires_at = float("inf")
+        self.filled = False
+        self._lock = threading.Lock()
+        self._fill_task: Optional[asyncio.Task] = None
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def _finish(self, documents: List[Document]) -> None:
+        # 검색 결과가 전혀 없으면 짧은 시간 뒤 다시 채우도록 만료 시간을 앞당김
+        self.expires_at = time.monotonic() + (self.ttl if documents else _EMPTY_RETRY_SECONDS)
+        self.filled = True
+        metrics.inc("role_context_fills_total", result="ok" if documents else "empty")
+
+    def ensure_filled(self) -> None:
+        if self.filled:
+            return
+        with self._lock:
+            if self.filled:
+                return
+            with timed("role_context_fill"):
+                documents = get_search_content(role_queries(self.organization, self.position))
+                self.corpus.add_documents(documents)
+            self._finish(documents)
+
+    async def _afill(self) -> None:
+        with timed("role_context_fill"):
+            documents = await aget_search_content(role_queries(self.organization, self.position))
+            await self.corpus.aadd_documents(documents)
+        self._finish(documents)
+
+    async def aensure_filled(self) -> None:
+        """ensure_filled의 비동기 버전. 동시에 들어온 요청은 하나의 수집 작업을 함께 기다립니다."""
+        if self.filled:
+            return
+        if self._fill_task is None or (self._fill_task.done() and not self.filled):
+            self._fill_task = asyncio.ensure_future(self._afill())
+        # 기다리던 요청 하나가 취소되어도 다른 요청이 공유하는 수집 작업은 계속 진행
+        await asyncio.shield(self._fill_task)
+
+
+class RoleContextRegistry:
+    """(회사, 직무)별 RoleCorpus를 LRU로 관리합니다. TTL이 지나면 다음 요청에서 새로 수집합니다."""
+
+    def __init__(self, ttl: float, max_roles: int):
+        self.ttl = ttl
+        self.max_roles = max_roles
+        self._roles: "OrderedDict[RoleKey, RoleCorpus]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, organization: str, position: str) -> RoleCorpus:
+        key = role_key(organization, position)
+        with self._lock:
+            role = self._roles.get(key)
+            if role is not None and role.expired:
+                del self._roles[key]
+                role = None
+                metrics.inc("role_context_expired_total")
+
+            if role is None:
+                metrics.inc("role_context_requests_total", result="miss")
+                role = RoleCorpus(organization, position, self.ttl)
+                self._roles[key] = role
+                while len(self._roles) > self.max_roles:
+                    self._roles.popitem(last=False)
+                    metrics.inc("role_context_evicted_total")
+            else:
+                metrics.inc("role_context_requests_total", result="hit")
+                self._roles.move_to_end(key)
+            return role
+
+    def __len__(self) -> int:
+        return len(self._roles)
+
+
+# 회사/직무 컨텍스트 레지스트리 인스턴스 생성
+role_contexts = RoleContextRegistry(
+    ttl=settings.ROLE_CONTEXT_TTL,
+    max_roles=settings.ROLE_CONTEXT_MAX_ROLES,
+)
@@ -1,14 +1,54 @@
-from typing import List, Literal
+import asyncio
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
 from langchain.schema import Document, HumanMessage, SystemMessage
 from duckduckgo_search import DDGS
-from backend.utils.config import get_llm
+from backend.rag.keyword_extractor import extract_keywords
+from backend.utils.cache import MISSING, MemoryCache, SQLiteCache, TieredCache
+from backend.utils.config import get_llm, settings
+from backend.utils.llm_cache import llm_cache, llm_temperature
+from backend.utils.metrics import metrics
+from backend.utils.rate_limit import TokenBucket
+from backend.utils.singleflight import SingleFlight
+from backend.utils.tracing import traced
 from backend.workflow.state import AgentType
 
-def improve_search_query(
-    content: str,
-    role: AgentType,
-) -> List[str]:
-    
+# LLM 응답 캐시에서 검색어 개선 호출을 구분하는 이름
+QUERY_CACHE_NAME = "SEARCH_QUERY"
+
+# 검색 결과 캐시 (메모리 LRU + settings.DB_PATH의 SQLite)
+_search_cache = TieredCache(
+    "search",
+    memory=MemoryCache(settings.SEARCH_CACHE_MEMORY_SIZE, ttl=settings.SEARCH_CACHE_TTL),
+    disk=SQLiteCache("search_cache", settings.SEARCH_CACHE_DISK_SIZE, ttl=settings.SEARCH_CACHE_TTL),
+)
+
+# DDGS는 동기 클라이언트이므로 프로세스 공유 스레드 풀에서 검색어별로 동시에 실행하고,
+# 동시 세션이 많아도 DuckDuckGo에 차단되지 않도록 프로세스 단위로 요청 속도를 제한
+_search_executor = ThreadPoolExecutor(
+    max_workers=settings.SEARCH_MAX_WORKERS,
+    thread_name_prefix="ddgs",
+)
+_search_rate_limiter = TokenBucket(
+    rate=settings.SEARCH_RATE_LIMIT,
+    capacity=settings.SEARCH_RATE_BURST,
+)
+
+# 동시 세션이 같은 검색어를 동시에 조회하면 한 번만 요청하고 결과를 공유
+_search_flight = SingleFlight("search")
+
+# 검색 클라이언트 생성 함수 (DDGS().text와 같은 시그니처의 text 메서드를 가진 객체)
+_search_client_factory: Callable[[], Any] = DDGS
+
+def set_search_client(factory: Optional[Callable[[], Any]] = None) -> None:
+    """웹 검색 클라이언트를 교체합니다. (오프라인 벤치마크용, None이면 DDGS로 복원)"""
+    global _search_client_factory
+    _search_client_factory = factory or DDGS
+
+def _build_query_messages(content: str, role: AgentType) -> list:
+    """키워드 추출용 LLM 메시지를 구성합니다."""
     template = """
     다음 자기소개서 내용을 {perspective}의 관점에서 분석하기 위한 
     핵심 키워드나 주제를 3개 추출해주세요:
@@ -32,67 +72,263 @@ def improve_search_query(
         perspective=perspective_map[role]
     )
 
-    messages = [
+    return [
         SystemMessage(
             content="당신은 자기소개서 검증 전문가입니다. 주어진 내용에서 검증이 필요한 핵심 키워드를 추출해주세요."
         ),
         HumanMessage(content=prompt),
     ]
 
-    response = get_llm().invoke(messages)
-    
-    suggested_queries = [q.strip() for q in response.content.split(",")]
-
+def _parse_queries(text: str) -> List[str]:
+    suggested_queries = [q.strip() for q in text.split(",")]
     return suggested_queries[:3]
 
+def _extract_locally(content: str, role: AgentType) -> List[str]:
+    """KEYWORD_EXTRACTOR가 local이면 LLM 없이 키워드를 추출합니다. 실패 시 빈 리스트를 반환합니다."""
+    if settings.KEYWORD_EXTRACTOR != "local":
+        return []
+    try:
+        keywords = extract_keywords(content, role, top_n=3)
+    except Exception as e:
+        print(f"로컬 키워드 추출 중 오류 발생: {str(e)}")
+        keywords = []
+    if keywords:
+        metrics.inc("keyword_extractions_total", method="local")
+    return keywords
+
+@traced("improve_search_query")
+def improve_search_query(
+    content: str,
+    role: AgentType,
+) -> List[str]:
+    keywords = _extract_locally(content, role)
+    if keywords:
+        return keywords
+
+    # LLM 기반 추출 (기본 경로 또는 로컬 추출 실패 시 폴백)
+    messages = _build_query_messages(content, role)
+    response = llm_cache.invoke(QUERY_CACHE_NAME, get_llm(temperature=llm_temperature()), messages)
+    metrics.inc("keyword_extractions_total", method="llm")
+    return _parse_queries(response)
+
+@traced("improve_search_query")
+async def aimprove_search_query(
+    content: str,
+    role: AgentType,
+) -> List[str]:
+    """improve_search_query의 비동기 버전"""
+    keywords = _extract_locally(content, role)
+    if keywords:
+        return keywords
+
+    messages = _build_query_messages(content, role)
+    response = await llm_cache.ainvoke(QUERY_CACHE_NAME, get_llm(temperature=llm_temperature()), messages)
+    metrics.inc("keyword_extractions_total", method="llm")
+    return _parse_queries(response)
+
+def get_search_cache_stats() -> Dict[str, Any]:
+    """검색 캐시 적중/미스 통계를 반환합니다."""
+    return _search_cache.stats()
+
+def _search_text(
+    query: str,
+    region: str,
+    timelimit: str,
+    max_results: int,
+    use_cache: bool,
+) -> List[Dict[str, str]]:
+    """DuckDuckGo 텍스트 검색. (query, region, timelimit, max_results) 단위로 캐시합니다."""
+    use_cache = use_cache and settings.SEARCH_CACHE_ENABLED
+    cache_key = json.dumps([query, region, timelimit, max_results], ensure_ascii=False)
+
+    if use_cache:
+        cached = _search_cache.get(cache_key)
+        if cached is not MISSING:
+            return cached
+
+    return _search_flight.do(
+        cache_key, _request_text, query, region, timelimit, max_results, use_cache, cache_key
+    )
+
+def _request_text(
+    query: str,
+    region: str,
+    timelimit: str,
+    max_results: int,
+    use_cache: bool,
+    cache_key: str,
+) -> List[Dict[str, str]]:
+    """캐시에 없는 검색어를 DuckDuckGo에 요청하고 결과를 캐시에 저장합니다."""
+    # 실제 네트워크 요청에만 속도 제한 적용
+    _search_rate_limiter.acquire()
+    results = _search_client_factory().text(
+        query,
+        region=region,
+        safesearch="moderate",
+        timelimit=timelimit,
+        max_results=max_results,
+    ) or []
+
+    if use_cache:
+        _search_cache.set(cache_key, results)
+    return results
+
+def _fetch_query(
+    query: str,
+    language: str,
+    max_results: int,
+    use_cache: bool,
+) -> List[Document]:
+    """검색어 하나를 조회해 Document 목록으로 변환합니다. (스레드 풀에서 실행)"""
+    results = _search_text(
+        query,
+        region=language,
+        timelimit="y",
+        max_results=max_results,
+        use_cache=use_cache,
+    )
+
+    documents = []
+    for result in results:
+        
+        title = result.get("title", "")
+        body = result.get("body", "")
+        url = result.get("href", "")
+
+        if body:
+
+            documents.append(
+                Document(
+                    page_content=body,
+                    metadata={
+                        "source": url,
+                        "section": "content",
+                        "topic": title,
+                        "query": query,
+                    },
+                )
+            )
+    return documents
+
+def _record_query(query: str, status: str, elapsed: float, error: Optional[Exception] = None) -> None:
+    """검색어별 소요 시간과 결과(ok/error/timeout)를 기록합니다."""
+    metrics.inc("search_queries_total", status=status)
+    metrics.inc("search_query_seconds_total", elapsed, status=status)
+    if status != "ok":
+        print(f"검색 중 오류 발생 ({status}, {elapsed:.2f}s): {query} {str(error or '')}")
+
+def _submit_query(
+    query: str,
+    language: str,
+    max_results: int,
+    use_cache: bool,
+) -> Tuple[Future, List[float]]:
+    """검색어를 스레드 풀에 제출하고, (future, 실행 시작 시각을 담을 목록)을 반환합니다.
+
+    제한 시간은 풀의 대기열에서 기다린 시간을 빼고 실제 실행이 시작된 시점부터 계산합니다.
+    제한 시간이 지나 포기한 검색도 스레드는 끝날 때까지 풀의 자리를 차지하므로,
+    뒤의 검색어는 자리가 실제로 빌 때까지 대기열에서 기다립니다.
+    """
+    started: List[float] = []
+
+    def run() -> List[Document]:
+        started.append(time.perf_counter())
+        return _fetch_query(query, language, max_results, use_cache)
+
+    return _search_executor.submit(run), started
+
+def _remaining(started: List[float], now: float) -> Optional[float]:
+    """실행 중인 검색어의 남은 제한 시간을 반환합니다. (아직 대기열에 있으면 None)"""
+    if not started:
+        return None
+    return started[0] + settings.SEARCH_QUERY_TIMEOUT - now
+
+@traced("get_search_content")
 def get_search_content(
     improved_queries: List[str],
     language: str = "ko",
     max_results: int = 5,
+    use_cache: bool = True,
 ) -> List[Document]:
-    try:
-        documents = []
-        ddgs = DDGS()
-        
-        for query in improved_queries:
-            try:
-                results = ddgs.text(
-                    query,
-                    region=language,
-                    safesearch="moderate",
-                    timelimit="y",
-                    max_results=max_results,
-                )
+    """검색어들을 동시에 조회합니다.
 
-                if not results:
-                    continue
-                
-                for result in results:
-                    
-                    title = result.get("title", "")
-                    body = result.get("body", "")
-                    url = result.get("href", "")
-
-                    if body:
-
-                        documents.append(
-                            Document(
-                                page_content=body,
-                                metadata={
-                                    "source": url,
-                                    "section": "content",
-                                    "topic": title,
-                                    "query": query,
-                                },
-                            )
-                        )
+    실패하거나 실행을 시작한 뒤 SEARCH_QUERY_TIMEOUT 안에 끝나지 않은 검색어는 건너뛰고
+    (제한 시간은 검색어마다 따로 적용) 나머지 검색어의 결과를 검색어 순서대로 반환합니다.
+    """
+    queries = [query for query in improved_queries if query]
+    runs: Dict[Future, Tuple[str, List[float]]] = {}
+    for query in queries:
+        future, started = _submit_query(query, language, max_results, use_cache)
+        runs[future] = (query, started)
+    results: Dict[str, List[Document]] = {}
 
+    pending = set(runs)
+    while pending:
+        now = time.perf_counter()
+        timeouts = []
+        for future in list(pending):
+            query, started = runs[future]
+            remaining = _remaining(started, now)
+            if remaining is not None and remaining <= 0:
+                # 실행 중인 스레드는 멈출 수 없으므로 결과만 버림
+                pending.discard(future)
+                _record_query(query, "timeout", now - started[0])
+            else:
+                timeouts.append(settings.SEARCH_QUERY_TIMEOUT if remaining is None else remaining)
+        if not pending:
+            break
+
+        done, pending = wait(pending, timeout=min(timeouts), return_when=FIRST_COMPLETED)
+        for future in done:
+            query, started = runs[future]
+            elapsed = time.perf_counter() - started[0]
+            try:
+                results[query] = future.result()
+                _record_query(query, "ok", elapsed)
             except Exception as e:
-                print(f"검색 중 오류 발생: {str(e)}")
-                continue
-        
-        return documents
+                _record_query(query, "error", elapsed, e)
+
+    return [doc for query in queries for doc in results.get(query, [])]
+
+async def _afetch_query(
+    query: str,
+    language: str,
+    max_results: int,
+    use_cache: bool,
+) -> List[Document]:
+    future, started = _submit_query(query, language, max_results, use_cache)
+    waiter = asyncio.wrap_future(future)
+    while True:
+        remaining = _remaining(started, time.perf_counter())
+        if remaining is not None and remaining <= 0:
+            _record_query(query, "timeout", time.perf_counter() - started[0])
+            return []
+        done, _ = await asyncio.wait(
+            {waiter}, timeout=settings.SEARCH_QUERY_TIMEOUT if remaining is None else remaining
+        )
+        if done:
+            break
 
+    elapsed = time.perf_counter() - started[0]
+    try:
+        documents = waiter.result()
     except Exception as e:
-        print(f"검색 서비스 오류 발생: {str(e)}")
-        return [] 
\ No newline at end of file
+        _record_query(query, "error", elapsed, e)
+        return []
+
+    _record_query(query, "ok", elapsed)
+    return documents
+
+@traced("get_search_content")
+async def aget_search_content(
+    improved_queries: List[str],
+    language: str = "ko",
+    max_results: int = 5,
+    use_cache: bool = True,
+) -> List[Document]:
+    """get_search_content의 비동기 버전"""
+    queries = [query for query in improved_queries if query]
+    results = await asyncio.gather(
+        *(_afetch_query(query, language, max_results, use_cache) for query in queries)
+    )
+    return [doc for documents in results for doc in documents]
@@ -0,0 +1,303 @@
+import asyncio
+import contextvars
+import random
+import sqlite3
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import Runnable
+
+from backend.rag.embedding_cache import get_cached_embeddings
+from backend.utils import db
+from backend.utils.config import settings
+from backend.utils.metrics import metrics
+from backend.utils.tracing import record_llm_usage
+
+
+class SemanticMatch(NamedTuple):
+    """의미 캐시 조회 결과 (vector는 미스 후 저장할 때 재사용)"""
+    vector: List[float]
+    response: Optional[str] = None
+    score: float = 0.0
+    matched_text: str = ""
+    audit_id: Optional[int] = None
+
+    @property
+    def found(self) -> bool:
+        return self.response is not None
+
+
+class SemanticCache:
+    """프롬프트의 가변 부분이 거의 같은 과거 응답을 재사용하는 의미 기반 캐시
+
+    에이전트별로 (정확히 일치해야 하는 구분 키, 임베딩할 가변 텍스트)를 받아
+    구분 키마다 별도의 FAISS 인덱스(코사인 유사도)에서 가장 가까운 과거 프롬프트를 찾습니다.
+    - 유사도 >= threshold: 저장된 응답 재사용
+    - seed_threshold <= 유사도 < threshold: 저장된 응답을 참고 자료로 반환 (호출 측에서 프롬프트에 추가)
+    항목과 적중 감사 기록은 settings.DB_PATH에 저장되어 재시작 후에도 유지됩니다.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        threshold: float,
+        seed_threshold: float,
+        max_entries: int,
+        ttl: float,
+        audit_rate: float,
+        audit_agreement: float,
+        path: Optional[str] = None,
+    ):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.seed_threshold = seed_threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.audit_rate = audit_rate
+        self.audit_agreement = audit_agreement
+        self.path = path
+        self._stores: Optional[Dict[Tuple[str, str], FAISS]] = None
+        self._size = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = db.connect(self.path)
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS semantic_cache (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    agent TEXT NOT NULL,
+                    partition TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS semantic_cache_audit (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    agent TEXT NOT NULL,
+                    query_text TEXT NOT NULL,
+                    matched_text TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    cached_response TEXT NOT NULL,
+                    fresh_response TEXT,
+                    agreement REAL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_semantic_cache_created_at ON semantic_cache (created_at)")
+            self._conn = conn
+        return self._conn
+
+    def _new_store(self, text: str, vector: List[float], metadata: Dict) -> FAISS:
+        return FAISS.from_embeddings(
+            [(text, vector)],
+            self.embeddings,
+            metadatas=[metadata],
+            normalize_L2=True,
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+        )
+
+    def _add_to_store(self, agent: str, partition: str, text: str, vector: List[float], response: str) -> None:
+        """_lock을 잡은 상태에서 호출해야 합니다."""
+        key = (agent, partition)
+        metadata = {"response": response}
+        store = self._stores.get(key)
+        if store is None:
+            self._stores[key] = self._new_store(text, vector, metadata)
+        else:
+            store.add_embeddings([(text, vector)], metadatas=[metadata])
+        self._size += 1
+
+    def _load(self) -> None:
+        """처음 사용할 때 만료되지 않은 최근 항목을 인덱스로 불러옵니다. _lock을 잡은 상태에서 호출해야 합니다."""
+        if self._stores is not None:
+            return
+        self._stores = {}
+        try:
+            rows = self._connection().execute(
+                """SELECT agent, partition, text, vector, response FROM semantic_cache
+                   WHERE created_at > ? ORDER BY created_at DESC LIMIT ?""",
+                (time.time() - self.ttl, self.max_entries),
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"의미 캐시 로드 중 오류 발생: {str(e)}")
+            return
+        for agent, partition, text, blob, response in reversed(rows):
+            vector = np.frombuffer(blob, dtype=np.float32).tolist()
+            self._add_to_store(agent, partition, text, vector, response)
+
+    def _search(self, agent: str, partition: str, text: str, vector: List[float]) -> SemanticMatch:
+        started_at = time.perf_counter()
+        with self._lock:
+            self._load()
+            store = self._stores.get((agent, partition))
+            results = store.similarity_search_with_score_by_vector(vector, k=1) if store else []
+
+        if not results or results[0][1] < self.seed_threshold:
+            metrics.inc("semantic_cache_requests_total", agent=agent, result="miss")
+            return SemanticMatch(vector=vector)
+
+        doc, score = results[0][0], float(results[0][1])
+        response = doc.metadata["response"]
+        if score < self.threshold:
+            metrics.inc("semantic_cache_requests_total", agent=agent, result="seed")
+            return SemanticMatch(vector, response, score, doc.page_content)
+
+        metrics.inc("semantic_cache_requests_total", agent=agent, result="hit")
+        # 미스 시 평균 LLM 호출 시간 대비 절약한 시간 기록
+        calls = metrics.get("semantic_cache_llm_calls_total", agent=agent)
+        if calls:
+            average = metrics.get("semantic_cache_llm_seconds_total", agent=agent) / calls
+            saved = max(average - (time.perf_counter() - started_at), 0.0)
+            metrics.inc("semantic_cache_saved_seconds_total", saved, agent=agent)
+        audit_id = self._record_hit(agent, text, doc.page_content, score, response)
+        return SemanticMatch(vector, response, score, doc.page_content, audit_id)
+
+    def _record_hit(self, agent: str, text: str, matched_text: str, score: float, response: str) -> Optional[int]:
+        """잘못된 적중 여부를 사후에 검토할 수 있도록 적중 내역을 기록합니다."""
+        try:
+            with self._lock:
+                cursor = self._connection().execute(
+                    """INSERT INTO semantic_cache_audit
+                       (agent, query_text, matched_text, score, cached_response, created_at)
+                       VALUES (?, ?, ?, ?, ?, ?)""",
+                    (agent, text, matched_text, score, response, time.time()),
+                )
+                return cursor.lastrowid
+        except sqlite3.Error as e:
+            print(f"의미 캐시 감사 기록 중 오류 발생: {str(e)}")
+            return None
+
+    def lookup(self, agent: str, partition: str, text: str) -> SemanticMatch:
+        vector = self.embeddings.embed_query(text)
+        return self._search(agent, partition, text, vector)
+
+    async def alookup(self, agent: str, partition: str, text: str) -> SemanticMatch:
+        """lookup의 비동기 버전"""
+        vector = await self.embeddings.aembed_query(text)
+        return await asyncio.to_thread(self._search, agent, partition, text, vector)
+
+    def add(
+        self,
+        agent: str,
+        partition: str,
+        text: str,
+        vector: List[float],
+        response: str,
+        elapsed: float,
+    ) -> None:
+        """LLM으로 새로 생성한 응답을 저장합니다. elapsed는 절약 시간 계산에 쓰이는 LLM 호출 시간입니다."""
+        metrics.inc("semantic_cache_llm_calls_total", agent=agent)
+        metrics.inc("semantic_cache_llm_seconds_total", elapsed, agent=agent)
+        blob = np.asarray(vector, dtype=np.float32).tobytes()
+        with self._lock:
+            self._load()
+            if self._size >= self.max_entries:
+                # FAISS 인덱스에서 개별 삭제가 번거로우므로 상한 도달 시 재시작 전까지 추가하지 않음
+                metrics.inc("semantic_cache_skipped_total", agent=agent)
+                return
+            self._add_to_store(agent, partition, text, vector, response)
+            try:
+                self._connection().execute(
+                    """INSERT INTO semantic_cache (agent, partition, text, vector, response, created_at)
+                       VALUES (?, ?, ?, ?, ?, ?)""",
+                    (agent, partition, text, blob, response, time.time()),
+                )
+            except sqlite3.Error as e:
+                print(f"의미 캐시 저장 중 오류 발생: {str(e)}")
+
+    async def aadd(self, *args, **kwargs) -> None:
+        """add의 비동기 버전"""
+        await asyncio.to_thread(self.add, *args, **kwargs)
+
+    def maybe_audit(self, agent: str, llm: Runnable, messages: List[BaseMessage], match: SemanticMatch) -> None:
+        """적중 중 일부(audit_rate)는 백그라운드에서 실제 LLM 응답을 생성해 재사용한 응답과 비교합니다."""
+        if match.audit_id is None or random.random() >= self.audit_rate:
+            return
+        # 요청의 콜백/스트리밍 이벤트에 섞이지 않도록 빈 컨텍스트에서 실행
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # 동기 호출 경로에는 이벤트 루프가 없으므로 별도 스레드에서 실행 (새 스레드는 빈 컨텍스트로 시작)
+            threading.Thread(
+                target=asyncio.run, args=(self._audit(agent, llm, messages, match),), daemon=True
+            ).start()
+            return
+        asyncio.create_task(
+            self._audit(agent, llm, messages, match),
+            context=contextvars.Context(),
+        )
+
+    async def _audit(self, agent: str, llm: Runnable, messages: List[BaseMessage], match: SemanticMatch) -> None:
+        try:
+            response = await llm.ainvoke(messages)
+            record_llm_usage(agent, getattr(llm, "model_name", ""), getattr(response, "usage_metadata", None))
+            fresh = response.content
+            cached_vector, fresh_vector = await self.embeddings.aembed_documents([match.response, fresh])
+            a, b = np.asarray(cached_vector), np.asarray(fresh_vector)
+            agreement = float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+            result = "agree" if agreement >= self.audit_agreement else "disagree"
+            metrics.inc("semantic_cache_audits_total", agent=agent, result=result)
+            with self._lock:
+                self._connection().execute(
+                    "UPDATE semantic_cache_audit SET fresh_response = ?, agreement = ? WHERE id = ?",
+                    (fresh, agreement, match.audit_id),
+                )
+        except Exception as e:
+            print(f"의미 캐시 감사 중 오류 발생: {str(e)}")
+
+    def stats(self) -> Dict[str, float]:
+        """에이전트 구분 없이 합산한 적중률과 절약 시간을 반환합니다."""
+        snapshot = metrics.snapshot()
+
+        def total(name: str, **labels: str) -> float:
+            return sum(
+                value for key, value in snapshot.get(name, {}).items()
+                if all((k, v) in key for k, v in labels.items())
+            )
+
+        hits = total("semantic_cache_requests_total", result="hit")
+        requests = total("semantic_cache_requests_total")
+        return {
+            "hits": int(hits),
+            "seeds": int(total("semantic_cache_requests_total", result="seed")),
+            "requests": int(requests),
+            "hit_ratio": round(hits / requests, 4) if requests else 0.0,
+            "saved_seconds": round(total("semantic_cache_saved_seconds_total"), 3),
+            "audits_disagree": int(total("semantic_cache_audits_total", result="disagree")),
+            "entries": self._size,
+        }
+
+
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """의미 캐시 인스턴스를 반환합니다. (SEMANTIC_CACHE_ENABLED=false이면 None)"""
+    global _semantic_cache
+    if not settings.SEMANTIC_CACHE_ENABLED:
+        return None
+    if _semantic_cache is None:
+        with _semantic_cache_lock:
+            if _semantic_cache is None:
+                _semantic_cache = SemanticCache(
+                    embeddings=get_cached_embeddings(),
+                    threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+                    seed_threshold=settings.SEMANTIC_CACHE_SEED_THRESHOLD,
+                    max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+                    ttl=settings.SEMANTIC_CACHE_TTL,
+                    audit_rate=settings.SEMANTIC_CACHE_AUDIT_RATE,
+                    audit_agreement=settings.SEMANTIC_CACHE_AUDIT_AGREEMENT,
+                )
+    return _semantic_cache
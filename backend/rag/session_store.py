@@ -0,0 +1,177 @@
+import hashlib
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from langchain.schema import Document
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+
+from backend.rag.embedding_cache import get_cached_embeddings
+from backend.utils.config import settings
+from backend.utils.metrics import metrics
+from backend.utils.tracing import timed
+
+
+class SessionCorpus:
+    """세션(요청) 단위로 공유되는 검색 코퍼스
+
+    여러 에이전트/문항이 수집한 문서를 하나의 FAISS 인덱스에 점진적으로 추가하며,
+    URL과 본문 해시로 중복 문서를 걸러냅니다. 각 에이전트는 자신의 질의로 이 인덱스를 조회합니다.
+    """
+
+    def __init__(self, embeddings: Embeddings):
+        self.embeddings = embeddings
+        self.store: Optional[FAISS] = None
+        self.last_access = time.monotonic()
+        self._seen_urls: Set[str] = set()
+        self._seen_hashes: Set[str] = set()
+        # 인덱스 변경은 짧은 동기 구간에서만 일어나므로 동기/비동기 경로 모두 스레드 락으로 보호
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._seen_hashes)
+
+    def _touch(self) -> None:
+        self.last_access = time.monotonic()
+
+    @staticmethod
+    def _keys(doc: Document) -> Tuple[str, str]:
+        """중복 판정용 (URL, 본문 해시)"""
+        return doc.metadata.get("source", ""), hashlib.sha256(doc.page_content.encode("utf-8")).hexdigest()
+
+    def _filter_new(self, documents: List[Document]) -> List[Document]:
+        """아직 코퍼스에 없는 문서만 골라내고 중복 판정용 키를 등록합니다.
+
+        동시에 같은 문서가 두 번 추가되지 않도록 임베딩 전에 등록하며, 추가에 실패하면 _release로 되돌립니다.
+        """
+        new_documents = []
+        with self._lock:
+            for doc in documents:
+                url, content_hash = self._keys(doc)
+                if content_hash in self._seen_hashes or (url and url in self._seen_urls):
+                    continue
+                self._seen_hashes.add(content_hash)
+                if url:
+                    self._seen_urls.add(url)
+                new_documents.append(doc)
+
+        metrics.inc("session_corpus_duplicates_total", len(documents) - len(new_documents))
+        return new_documents
+
+    def _release(self, documents: List[Document]) -> None:
+        """임베딩/인덱스 추가에 실패한 문서의 키를 해제해 이후 검색에서 다시 추가할 수 있게 합니다."""
+        with self._lock:
+            for doc in documents:
+                url, content_hash = self._keys(doc)
+                self._seen_hashes.discard(content_hash)
+                if url:
+                    self._seen_urls.discard(url)
+        metrics.inc("session_corpus_add_failures_total", len(documents))
+
+    def _add_vectors(self, documents: List[Document], vectors: List[List[float]]) -> None:
+        text_embeddings = [(doc.page_content, vector) for doc, vector in zip(documents, vectors)]
+        metadatas = [doc.metadata for doc in documents]
+        with self._lock:
+            if self.store is None:
+                with timed("faiss_build"):
+                    self.store = FAISS.from_embeddings(text_embeddings, self.embeddings, metadatas=metadatas)
+            else:
+                with timed("faiss_add"):
+                    self.store.add_embeddings(text_embeddings, metadatas=metadatas)
+        metrics.inc("session_corpus_documents_added_total", len(documents))
+
+    def add_documents(self, documents: List[Document]) -> int:
+        """새 문서를 임베딩해 인덱스에 추가하고 추가된 문서 수를 반환합니다."""
+        self._touch()
+        new_documents = self._filter_new(documents)
+        if new_documents:
+            try:
+                with timed("embed_documents"):
+                    vectors = self.embeddings.embed_documents([doc.page_content for doc in new_documents])
+                self._add_vectors(new_documents, vectors)
+            except BaseException:
+                self._release(new_documents)
+                raise
+        return len(new_documents)
+
+    async def aadd_documents(self, documents: List[Document]) -> int:
+        """add_documents의 비동기 버전"""
+        self._touch()
+        new_documents = self._filter_new(documents)
+        if new_documents:
+            try:
+                with timed("embed_documents"):
+                    vectors = await self.embeddings.aembed_documents([doc.page_content for doc in new_documents])
+                self._add_vectors(new_documents, vectors)
+            except BaseException:
+                self._release(new_documents)
+                raise
+        return len(new_documents)
+
+    def similarity_search(self, query: str, k: int) -> List[Document]:
+        self._touch()
+        if self.store is None:
+            return []
+        vector = self.embeddings.embed_query(query)
+        with self._lock:
+            return self.store.similarity_search_by_vector(vector, k=k)
+
+    async def asimilarity_search(self, query: str, k: int) -> List[Document]:
+        """similarity_search의 비동기 버전 (질의 임베딩만 비동기로 수행)"""
+        self._touch()
+        if self.store is None:
+            return []
+        vector = await self.embeddings.aembed_query(query)
+        with self._lock:
+            return self.store.similarity_search_by_vector(vector, k=k)
+
+
+class SessionStoreRegistry:
+    """session_id별 SessionCorpus를 관리하고 유휴 세션을 정리합니다."""
+
+    def __init__(self, idle_ttl: float):
+        self.idle_ttl = idle_ttl
+        self._sessions: Dict[str, SessionCorpus] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> SessionCorpus:
+        with self._lock:
+            self._evict_idle()
+            corpus = self._sessions.get(session_id)
+            if corpus is None:
+                corpus = SessionCorpus(get_cached_embeddings())
+                self._sessions[session_id] = corpus
+            return corpus
+
+    def end(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _evict_idle(self) -> None:
+        deadline = time.monotonic() - self.idle_ttl
+        idle = [sid for sid, corpus in self._sessions.items() if corpus.last_access < deadline]
+        for session_id in idle:
+            del self._sessions[session_id]
+        if idle:
+            metrics.inc("session_corpus_evicted_total", len(idle))
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+# 세션 코퍼스 레지스트리 인스턴스 생성
+session_stores = SessionStoreRegistry(idle_ttl=settings.SESSION_STORE_IDLE_TTL)
+
+
+def get_session_corpus(session_id: Optional[str]) -> SessionCorpus:
+    """세션 코퍼스를 반환합니다. session_id가 없으면 공유되지 않는 일회성 코퍼스를 반환합니다."""
+    if not session_id:
+        return SessionCorpus(get_cached_embeddings())
+    return session_stores.get(session_id)
+
+
+def end_session(session_id: Optional[str]) -> None:
+    """세션 종료 시 해당 세션의 인덱스를 해제합니다."""
+    if session_id:
+        session_stores.end(session_id)
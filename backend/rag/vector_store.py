@@ -1,61 +1,116 @@
-from langchain_community.vectorstores import FAISS
 from typing import Any, Dict, Optional, List
-from backend.rag.search_service import get_search_content, improve_search_query
-from backend.utils.config import get_embeddings
+from backend.rag.search_service import (
+    get_search_content,
+    improve_search_query,
+    aget_search_content,
+    aimprove_search_query,
+)
+from backend.rag.role_context import role_contexts
+from backend.rag.session_store import get_session_corpus
 
-def get_resume_vector_store(
-    content: str,
-    role: str,
-    language: str = "ko"
-) -> Optional[FAISS]:
-    """자소서 내용에 대한 벡터 스토어 생성"""
-    
-    # 검증이 필요한 키워드 추출 및 검색어 개선
-    improved_queries = improve_search_query(content, role)
-    
-    # 개선된 검색어로 검색 콘텐츠 가져오기
-    documents = get_search_content(improved_queries, language)
-    
-    if not documents:
-        return None
-    
-    try:
-        return FAISS.from_documents(documents, get_embeddings())
-    except Exception as e:
-        print(f"Vector DB 생성 중 오류 발생: {str(e)}")
-        return None
+def _format_results(results: List[Any]) -> List[Dict[str, Any]]:
+    """검색 결과 포맷팅"""
+    formatted_results = []
+    for doc in results:
+        formatted_results.append({
+            "content": doc.page_content,
+            "source": doc.metadata.get("source", "Unknown"),
+            "topic": doc.metadata.get("topic", ""),
+            "query": doc.metadata.get("query", "")
+        })
+    return formatted_results
 
 def search_info(
     content: str,
     role: str,
     query: str,
-    k: int = 5
+    k: int = 5,
+    session_id: Optional[str] = None,
+    language: str = "ko",
 ) -> List[Dict[str, Any]]:
-    """자소서 내용 검증을 위한 정보 검색"""
+    """자소서 내용 검증을 위한 정보 검색
+
+    역할별 키워드로 수집한 문서를 세션 코퍼스에 추가(중복 제거)한 뒤,
+    에이전트의 질의로 세션 코퍼스 전체를 검색합니다.
+    """
 
     print("===== search_info ",content, role, query, k)
 
-    # 벡터 스토어 생성
-    vector_store = get_resume_vector_store(content, role)
-    if not vector_store:
-        return []
-        
+    corpus = get_session_corpus(session_id)
+
     try:
+        # 검증이 필요한 키워드 추출 및 검색어 개선
+        improved_queries = improve_search_query(content, role)
+
+        # 개선된 검색어로 검색 콘텐츠를 가져와 세션 코퍼스에 추가
+        documents = get_search_content(improved_queries, language)
+        corpus.add_documents(documents)
+
         # 유사도 검색 수행
-        results = vector_store.similarity_search(query, k=k)
+        results = corpus.similarity_search(query, k=k)
         print("===== search_info results ",results)
-        # 검색 결과 포맷팅
-        formatted_results = []
-        for doc in results:
-            formatted_results.append({
-                "content": doc.page_content,
-                "source": doc.metadata.get("source", "Unknown"),
-                "topic": doc.metadata.get("topic", ""),
-                "query": doc.metadata.get("query", "")
-            })
-            
-        return formatted_results
-        
+        return _format_results(results)
+
     except Exception as e:
         print(f"검색 중 오류 발생: {str(e)}")
-        return [] 
\ No newline at end of file
+        return []
+
+async def asearch_info(
+    content: str,
+    role: str,
+    query: str,
+    k: int = 5,
+    session_id: Optional[str] = None,
+    language: str = "ko",
+) -> List[Dict[str, Any]]:
+    """search_info의 비동기 버전"""
+
+    corpus = get_session_corpus(session_id)
+
+    try:
+        improved_queries = await aimprove_search_query(content, role)
+        documents = await aget_search_content(improved_queries, language)
+        await corpus.aadd_documents(documents)
+
+        results = await corpus.asimilarity_search(query, k=k)
+        return _format_results(results)
+
+    except Exception as e:
+        print(f"검색 중 오류 발생: {str(e)}")
+        return []
+
+def search_role_info(
+    organization: str,
+    position: str,
+    query: str,
+    k: int = 5,
+) -> List[Dict[str, Any]]:
+    """자소서 작성을 위한 회사/직무 정보 검색
+
+    (회사, 직무)별 공유 코퍼스는 처음 요청될 때 한 번만 웹 검색으로 채워지고,
+    이후 같은 직무에 지원하는 모든 문항/지원자는 검색 없이 코퍼스만 조회합니다.
+    """
+    try:
+        role = role_contexts.get(organization, position)
+        role.ensure_filled()
+        return _format_results(role.corpus.similarity_search(query, k=k))
+
+    except Exception as e:
+        print(f"회사/직무 정보 검색 중 오류 발생: {str(e)}")
+        return []
+
+async def asearch_role_info(
+    organization: str,
+    position: str,
+    query: str,
+    k: int = 5,
+) -> List[Dict[str, Any]]:
+    """search_role_info의 비동기 버전"""
+    try:
+        role = role_contexts.get(organization, position)
+        await role.aensure_filled()
+        return _format_results(await role.corpus.asimilarity_search(query, k=k))
+
+    except Exception as e:
+        print(f"회사/직무 정보 검색 중 오류 발생: {str(e)}")
+        return []
@@ -0,0 +1,50 @@
+import asyncio
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from backend.workflow.history import DEFAULT_SECTIONS, MAX_PAGE_SIZE, SECTIONS, history_store
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/histories", tags=["history"])
+
+@router.get("")
+async def list_histories(
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    organization: Optional[str] = Query(None, description="회사/조직명으로 필터링"),
+):
+    """작성 히스토리를 최신순으로 조회합니다. next_cursor가 null이면 마지막 페이지입니다."""
+    try:
+        return await asyncio.to_thread(history_store.list, limit, cursor, organization)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{history_id}")
+async def get_history(
+    history_id: int,
+    sections: Optional[str] = Query(
+        None,
+        description=f"쉼표로 구분한 조회 섹션 ({', '.join(SECTIONS)}). 기본값은 messages를 제외한 전체",
+    ),
+):
+    """작성 히스토리 상세 정보를 조회합니다."""
+    selected = [s.strip() for s in sections.split(",") if s.strip()] if sections else DEFAULT_SECTIONS
+    unknown = [s for s in selected if s not in SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 섹션: {', '.join(unknown)}")
+
+    detail = await asyncio.to_thread(history_store.get, history_id, selected)
+    if detail is None:
+        raise HTTPException(status_code=404, detail=f"히스토리를 찾을 수 없습니다: {history_id}")
+    return detail
+
+@router.delete("/{history_id}")
+async def delete_history(history_id: int):
+    """작성 히스토리를 삭제합니다."""
+    if not await asyncio.to_thread(history_store.delete, history_id):
+        raise HTTPException(status_code=404, detail=f"히스토리를 찾을 수 없습니다: {history_id}")
+    logger.info(f"History deleted (id={history_id})")
+    return {"deleted": history_id}
@@ -1,10 +1,29 @@
+import asyncio
+import hashlib
+import json
 import logging
-from fastapi import APIRouter, HTTPException
+import time
+import uuid
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
 
-from backend.workflow.graph import create_resume_graph
-from backend.workflow.state import ResumeState
+from backend.rag.session_store import end_session
+from backend.utils.config import settings
+from backend.utils.metrics import metrics
+from backend.utils.singleflight import SingleFlight, wait
+from backend.utils.tracing import start_trace
+from backend.workflow.graph import (
+    astream_progress,
+    finish_run,
+    get_resume_graph,
+    is_running,
+    prepare_input,
+    request_config,
+)
+from backend.workflow.history import history_store
+from backend.workflow.jobs import job_queue
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -12,6 +31,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/resume", tags=["resume"])
 
+# 같은 요청 본문이 동시에 들어오면(중복 제출, Streamlit 재실행) 파이프라인을 한 번만 실행하고 결과를 공유
+_create_flight = SingleFlight("create")
+
 class ResumeQuestion(BaseModel):
     question_id: int
     content: str
@@ -35,83 +57,238 @@ class ResumeRequest(BaseModel):
     company_values: Optional[str] = Field(None, description="회사 가치/문화")
     user_profile: UserProfile = Field(..., description="지원자 프로필")
     questions: List[ResumeQuestion] = Field(..., description="자기소개서 문항 목록")
+    session_id: Optional[str] = Field(
+        None,
+        description="실패한 요청을 재시도할 때 이전 응답의 session_id (완료된 노드 다음부터 이어서 실행). "
+                    "/create 실패 응답은 detail.session_id, 스트리밍은 session 이벤트, 백그라운드 작업은 등록 응답에 포함",
+    )
+
+def _build_initial_state(request: ResumeRequest) -> Dict[str, Any]:
+    """요청으로부터 그래프 초기 상태를 생성합니다. (문항별 current_question_id는 그래프가 문항마다 지정)"""
+    return {
+        "organization": request.organization,
+        "position": request.position,
+        "requirements": request.requirements,
+        "description": request.description,
+        "company_values": request.company_values,
+        "user_profile": request.user_profile.dict(),
+        "questions": [q.dict() for q in request.questions],
+        "drafts": {},
+        "evaluation_types": {},
+        "technical_feedbacks": {},
+        "culture_feedbacks": {},
+        "final_drafts": {},
+        "messages": []
+    }
+
+def _build_response(final_state: Dict[str, Any], session_id: str) -> Dict[str, Any]:
+    return {
+        "session_id": session_id,
+        "drafts": final_state.get("drafts", {}),
+        "evaluation_types": final_state.get("evaluation_types", {}),
+        "technical_feedbacks": final_state.get("technical_feedbacks", {}),
+        "culture_feedbacks": final_state.get("culture_feedbacks", {}),
+        "final_drafts": final_state.get("final_drafts", {}),
+        "messages": final_state.get("messages", [])
+    }
+
+def _request_key(request: ResumeRequest) -> str:
+    """요청 본문 해시 (동시에 들어온 같은 요청을 구분하는 키)"""
+    payload = json.dumps(request.model_dump(), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
-class ResumeState:
-    def __init__(self, organization: str, position: str, requirements: str, 
-                 description: str, company_values: Optional[str], 
-                 user_profile: Dict[str, Any], questions: List[Dict[str, Any]]):
-        self.state = {
-            "organization": organization,
-            "position": position,
-            "requirements": requirements,
-            "description": description,
-            "company_values": company_values,
-            "user_profile": user_profile,
-            "questions": questions,
-            "drafts": {},
-            "evaluation_types": {},
-            "technical_feedbacks": {},
-            "culture_feedbacks": {},
-            "final_drafts": {},
-            "messages": []
-        }
+def _session_id(request: ResumeRequest) -> str:
+    """재시도 요청이면 전달받은 session_id를, 새 요청이면 새 session_id를 반환합니다."""
+    if request.session_id is None:
+        return uuid.uuid4().hex
+    job = job_queue.get(request.session_id)
+    if is_running(request.session_id) or (job is not None and not job.finished):
+        raise HTTPException(
+            status_code=409,
+            detail=f"이미 실행 중인 세션입니다: {request.session_id}"
+        )
+    return request.session_id
+
+def _submit_job(request: ResumeRequest) -> JSONResponse:
+    """작업 큐에 생성 작업을 등록하고 202로 응답합니다. 대기열이 가득 차면 429로 응답합니다."""
+    logger.info(f"Received background resume request: {request}")
+    session_id = _session_id(request)
+    try:
+        job = job_queue.submit(session_id, _build_initial_state(request))
+    except asyncio.QueueFull:
+        logger.warning(f"Job queue is full ({job_queue.queue_size()} waiting)")
+        raise HTTPException(
+            status_code=429,
+            detail="요청이 많아 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "30"},
+        )
+    return JSONResponse(
+        status_code=202,
+        content={"session_id": session_id, "status": job.status.value},
+    )
 
 @router.post("/create")
-async def create_resume(request: ResumeRequest):
+async def create_resume(
+    request: ResumeRequest,
+    background: bool = Query(False, description="true이면 작업 큐에 등록하고 session_id를 즉시 반환"),
+):
+    if background:
+        return _submit_job(request)
+
+    if not settings.CREATE_COALESCING_ENABLED:
+        return await _create_resume(request)
+    return await _create_flight.ado(_request_key(request), lambda: _create_resume(request))
+
+async def _create_resume(request: ResumeRequest) -> Dict[str, Any]:
+    session_id = _session_id(request)
     try:
         logger.info(f"Received resume creation request: {request}")
         
-        # 초기 상태 생성 - current_question_id 추가
-        initial_state = {
-            "organization": request.organization,
-            "position": request.position,
-            "requirements": request.requirements,
-            "description": request.description,
-            "company_values": request.company_values,
-            "user_profile": request.user_profile.dict(),
-            "questions": [q.dict() for q in request.questions],
-            "current_question_id": 1,  # 첫 번째 문항부터 시작
-            "drafts": {},
-            "evaluation_types": {},
-            "technical_feedbacks": {},
-            "culture_feedbacks": {},
-            "final_drafts": {},
-            "messages": []
-        }
+        initial_state = _build_initial_state(request)
         
-        logger.info("Creating resume graph...")
-        graph = create_resume_graph()
+        # 요청별 데이터는 컴파일된 그래프가 아닌 config로 전달
+        config = request_config(session_id)
+        graph = get_resume_graph()
         
-        logger.info("Executing resume graph...")
-        final_state = graph.invoke(initial_state)
+        logger.info(f"Executing resume graph... (session_id={session_id})")
+        with start_trace() as trace:
+            completed = False
+            try:
+                final_state = await graph.ainvoke(await prepare_input(session_id, initial_state), config)
+                completed = True
+            finally:
+                # 세션 검색 코퍼스 해제, 실패한 경우 재시도를 위해 체크포인트 보관
+                end_session(session_id)
+                finish_run(session_id, completed)
+        # 히스토리 저장은 백그라운드 스레드에서 처리
+        history_store.submit(session_id, initial_state, final_state)
         
-        response = {
-            "drafts": final_state.get("drafts", {}),
-            "evaluation_types": final_state.get("evaluation_types", {}),
-            "technical_feedbacks": final_state.get("technical_feedbacks", {}),
-            "culture_feedbacks": final_state.get("culture_feedbacks", {}),
-            "final_drafts": final_state.get("final_drafts", {}),
-            "messages": final_state.get("messages", [])
-        }
+        # 단계별 소요 시간과 LLM 토큰/추정 비용
+        response = {**_build_response(final_state, session_id), "metrics": trace.to_dict()}
         
         logger.info("Resume creation completed successfully")
         return response
         
     except Exception as e:
-        logger.error(f"Error during resume creation: {str(e)}", exc_info=True)
+        logger.error(f"Error during resume creation: {str(e)} (session_id={session_id})", exc_info=True)
+        # 실패한 실행의 체크포인트는 보관되므로 같은 session_id로 재시도할 수 있도록 함께 반환
         raise HTTPException(
             status_code=500,
-            detail=f"자기소개서 생성 중 오류가 발생했습니다: {str(e)}"
+            detail={
+                "message": f"자기소개서 생성 중 오류가 발생했습니다: {str(e)}",
+                "session_id": session_id,
+            },
+            headers={"X-Session-Id": session_id},
         )
 
-@router.get("/status/{session_id}")
-async def get_resume_status(session_id: str):
-    """자기소개서 생성 상태를 확인합니다."""
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Server-Sent Events 형식의 메시지를 만듭니다."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+async def _stream_resume(
+    initial_state: Dict[str, Any],
+    session_id: str,
+    flight: Dict[str, Any],
+) -> AsyncIterator[str]:
+    """그래프 진행 상황을 SSE 메시지로 변환합니다.
+
+    - session: 세션 ID (가장 먼저 전송)
+    - node_start / node_end / token: astream_progress의 이벤트를 그대로 전달
+    - result: /create와 같은 형식의 최종 결과와 첫 토큰까지의 시간(ttft_ms) 등 측정값
+    - error: 실행 중 오류
+
+    flight는 같은 요청을 기다리는 다른 스트림에 최종 결과(또는 오류)를 전달할 _create_flight 키입니다.
+    """
+    config = request_config(session_id)
+    graph = get_resume_graph()
+    started_at = time.perf_counter()
+    ttft_ms: Optional[float] = None
+
+    yield _sse("session", {"session_id": session_id})
+    with start_trace() as trace:
+        completed = False
+        try:
+            graph_input = await prepare_input(session_id, initial_state)
+            async for name, data in astream_progress(graph, graph_input, config):
+                if name == "result":
+                    completed = True
+                    total_ms = (time.perf_counter() - started_at) * 1000
+                    logger.info(f"Resume streaming completed in {total_ms:.0f}ms (session_id={session_id})")
+                    history_store.submit(session_id, initial_state, data)
+                    result = {
+                        **_build_response(data, session_id),
+                        "metrics": {**trace.to_dict(), "ttft_ms": ttft_ms, "total_ms": total_ms},
+                    }
+                    _create_flight.resolve(flight, {key: result for key in flight})
+                    yield _sse("result", result)
+                    continue
+
+                if name == "token" and ttft_ms is None:
+                    ttft_ms = (time.perf_counter() - started_at) * 1000
+                    metrics.inc("stream_ttft_seconds_total", ttft_ms / 1000)
+                    metrics.inc("stream_first_tokens_total")
+                    logger.info(f"First token after {ttft_ms:.0f}ms (session_id={session_id})")
+                yield _sse(name, data)
+
+        except Exception as e:
+            logger.error(f"Error during resume streaming: {str(e)}", exc_info=True)
+            _create_flight.fail(flight, e)
+            yield _sse("error", {"detail": f"자기소개서 생성 중 오류가 발생했습니다: {str(e)}"})
+        finally:
+            # 클라이언트 연결이 끊겨 제너레이터가 닫힌 경우에도 세션 검색 코퍼스 해제
+            end_session(session_id)
+            finish_run(session_id, completed)
+            if not completed:
+                _create_flight.fail(flight, RuntimeError("스트리밍이 중단되었습니다."))
+
+async def _coalesced_stream(request: ResumeRequest, session_id: str) -> AsyncIterator[str]:
+    """같은 요청이 이미 스트리밍 중이면 그 결과를 함께 받고, 아니면 새로 실행합니다.
+
+    응답이 시작되지 않으면 실행 중으로 등록되지 않도록 제너레이터 안에서 키를 선점합니다.
+    """
+    if not settings.CREATE_COALESCING_ENABLED:
+        owned, shared = {}, {}
+    else:
+        owned, shared = _create_flight.claim([_request_key(request)])
+    if shared:
+        stream = _follow_stream(next(iter(shared.values())))
+    else:
+        stream = _stream_resume(_build_initial_state(request), session_id, owned)
     try:
-        # TODO: 세션 상태 조회 로직 구현
-        return {"status": "processing"}
+        async for message in stream:
+            yield message
+    finally:
+        await stream.aclose()
+
+async def _follow_stream(future) -> AsyncIterator[str]:
+    """같은 요청을 실행 중인 스트림의 최종 결과를 기다려 session/result(또는 error)만 전송합니다."""
+    try:
+        result = await wait(future)
     except Exception as e:
+        yield _sse("error", {"detail": f"자기소개서 생성 중 오류가 발생했습니다: {str(e)}"})
+        return
+    yield _sse("session", {"session_id": result["session_id"]})
+    yield _sse("result", result)
+
+@router.post("/create/stream")
+async def create_resume_stream(request: ResumeRequest):
+    """자기소개서 생성 과정을 Server-Sent Events로 스트리밍합니다."""
+    logger.info(f"Received resume streaming request: {request}")
+    metrics.inc("stream_requests_total")
+    session_id = _session_id(request)
+    return StreamingResponse(
+        _coalesced_stream(request, session_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/status/{session_id}")
+async def get_resume_status(session_id: str):
+    """자기소개서 생성 상태(현재 노드, 완료된 문항, 중간 결과)를 확인합니다."""
+    job = job_queue.get(session_id)
+    if job is None:
         raise HTTPException(
             status_code=404,
-            detail=f"세션을 찾을 수 없습니다: {str(e)}"
-        ) 
\ No newline at end of file
+            detail=f"세션을 찾을 수 없습니다: {session_id}"
+        )
+    return job.to_dict()
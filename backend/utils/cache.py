@@ -0,0 +1,185 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from backend.utils import db
+from backend.utils.metrics import metrics
+
+# 캐시에 값이 없음을 나타내는 표식 (None/빈 리스트도 유효한 캐시 값이므로 구분)
+MISSING = object()
+
+
+class MemoryCache:
+    """TTL과 최대 크기(LRU)를 갖는 메모리 캐시"""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return MISSING
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                return MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache:
+    """TTL과 최대 항목 수(LRU)를 갖는 SQLite 디스크 캐시. 값은 JSON으로 저장합니다."""
+
+    # 쓰기 N회마다 만료/초과 항목 정리
+    PRUNE_INTERVAL = 100
+
+    def __init__(self, table: str, max_entries: int, ttl: Optional[float] = None, path: Optional[str] = None):
+        if not table.isidentifier():
+            raise ValueError(f"잘못된 테이블 이름: {table}")
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # 임포트 시점에 DB 파일이 생기지 않도록 처음 사용할 때 연결
+        if self._conn is None:
+            conn = db.connect(self.path)
+            conn.execute(
+                f"""CREATE TABLE IF NOT EXISTS {self.table} (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{self.table}_accessed_at ON {self.table} (accessed_at)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Any:
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute(
+                    f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return MISSING
+                value, expires_at = row
+                if expires_at is not None and expires_at <= now:
+                    conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                    return MISSING
+                conn.execute(
+                    f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+            return json.loads(value)
+        except sqlite3.Error as e:
+            print(f"캐시 조회 중 오류 발생: {str(e)}")
+            return MISSING
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else None
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), expires_at, now),
+                )
+                self._writes += 1
+                if self._writes % self.PRUNE_INTERVAL == 0:
+                    self._prune(conn, now)
+        except sqlite3.Error as e:
+            print(f"캐시 저장 중 오류 발생: {str(e)}")
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute(f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        conn.execute(
+            f"""DELETE FROM {self.table} WHERE key IN (
+                SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )""",
+            (self.max_entries,),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute(f"DELETE FROM {self.table}")
+
+
+class TieredCache:
+    """메모리 → 디스크 순으로 조회하는 2단 캐시. 조회 결과는 메트릭 카운터에 기록됩니다."""
+
+    def __init__(self, name: str, memory: MemoryCache, disk: Optional[SQLiteCache] = None):
+        self.name = name
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str) -> Any:
+        value = self.memory.get(key)
+        if value is not MISSING:
+            metrics.inc("cache_hits_total", cache=self.name, tier="memory")
+            return value
+
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not MISSING:
+                self.memory.set(key, value)
+                metrics.inc("cache_hits_total", cache=self.name, tier="disk")
+                return value
+
+        metrics.inc("cache_misses_total", cache=self.name)
+        return MISSING
+
+    def set(self, key: str, value: Any) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/미스 횟수와 적중률을 반환합니다."""
+        memory_hits = metrics.get("cache_hits_total", cache=self.name, tier="memory")
+        disk_hits = metrics.get("cache_hits_total", cache=self.name, tier="disk")
+        misses = metrics.get("cache_misses_total", cache=self.name)
+        total = memory_hits + disk_hits + misses
+        return {
+            "memory_hits": int(memory_hits),
+            "disk_hits": int(disk_hits),
+            "misses": int(misses),
+            "hit_ratio": round((memory_hits + disk_hits) / total, 4) if total else 0.0,
+            "memory_size": len(self.memory),
+        }
@@ -1,6 +1,12 @@
 import os
+import threading
+from typing import Callable, Dict, Literal, Optional, Tuple
+
+import httpx
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 
 # .env 파일에서 환경 변수 로드
@@ -10,13 +16,111 @@ load_dotenv()
 class Settings(BaseSettings):
     # OpenAI 설정
     OPENAI_API_KEY: str
-    OPENAI_MODEL_NAME: str = 'gpt-4-turbo',  # 모델명
+    OPENAI_MODEL_NAME: str = "gpt-4-turbo"  # 모델명
     OPENAI_EMBEDDING_MODEL: str = "text-embedding-3-small"
 
-    # Langfuse 설정
-    # LANGFUSE_PUBLIC_KEY: str
-    # LANGFUSE_SECRET_KEY: str
-    # LANGFUSE_HOST: str
+    # HTTP 커넥션 풀 설정 (LLM/임베딩 클라이언트가 공유)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0  # 초
+    HTTP_CONNECT_TIMEOUT: float = 10.0  # 초
+    HTTP_READ_TIMEOUT: float = 120.0  # 초
+
+    # Langfuse 설정 (선택, 활성화하면 그래프 실행 트레이스를 전송)
+    LANGFUSE_ENABLED: bool = False
+    LANGFUSE_PUBLIC_KEY: Optional[str] = None
+    LANGFUSE_SECRET_KEY: Optional[str] = None
+    LANGFUSE_HOST: Optional[str] = None
+
+    # 모델별 토큰 가격 (100만 토큰당 USD, (입력, 출력)) - 요청별 추정 비용 계산에 사용
+    LLM_PRICING: Dict[str, Tuple[float, float]] = {
+        "gpt-4-turbo": (10.0, 30.0),
+        "gpt-4o-mini": (0.15, 0.6),
+        "gpt-4o": (2.5, 10.0),
+        "gpt-4": (30.0, 60.0),
+        "gpt-3.5-turbo": (0.5, 1.5),
+    }
+
+    # 워크플로우 설정
+    MAX_CONCURRENT_QUESTIONS: int = 4  # 동시에 처리할 최대 문항 수
+
+    # 백그라운드 작업 큐 설정
+    JOB_WORKERS: int = 2  # 동시에 실행할 최대 자소서 생성 작업 수
+    JOB_QUEUE_SIZE: int = 16  # 대기 가능한 최대 작업 수 (초과 시 429 응답)
+    JOB_RESULT_TTL: int = 60 * 30  # 완료된 작업 결과 보관 시간(초)
+
+    # 웹 검색 결과 캐시 설정 (디스크 캐시는 DB_PATH 사용)
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_TTL: int = 60 * 60 * 24  # 초
+    SEARCH_CACHE_MEMORY_SIZE: int = 512  # 메모리 캐시 최대 항목 수
+    SEARCH_CACHE_DISK_SIZE: int = 10000  # 디스크 캐시 최대 항목 수
+
+    # LLM 응답 캐시 설정 (프롬프트가 완전히 같은 호출의 응답 재사용)
+    LLM_CACHE_ENABLED: bool = False
+    LLM_CACHE_BACKEND: Literal["memory", "sqlite"] = "sqlite"  # sqlite: 메모리 + DB_PATH 디스크 캐시
+    LLM_CACHE_TTL: int = 60 * 60 * 24 * 7  # 초
+    LLM_CACHE_MEMORY_SIZE: int = 256
+    LLM_CACHE_DISK_SIZE: int = 5000
+    # 캐시를 사용하지 않을 에이전트 (AgentType 값 또는 SEARCH_QUERY)
+    LLM_CACHE_DISABLED_AGENTS: list[str] = []
+    # 결정적 모드: temperature를 0으로 고정해 같은 프롬프트에 같은 응답이 나오도록 함
+    LLM_CACHE_DETERMINISTIC: bool = False
+
+    # 의미 기반 프롬프트 캐시 설정 (가변 부분이 거의 같은 과거 프롬프트의 응답 재사용)
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_THRESHOLD: float = 0.97  # 이 코사인 유사도 이상이면 응답 재사용
+    SEMANTIC_CACHE_SEED_THRESHOLD: float = 0.9  # 이 이상이면 과거 응답을 참고 자료로 프롬프트에 추가
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 5000
+    SEMANTIC_CACHE_TTL: int = 60 * 60 * 24 * 7  # 초
+    SEMANTIC_CACHE_AUDIT_RATE: float = 0.05  # 적중 중 실제 응답과 비교 검증할 비율
+    SEMANTIC_CACHE_AUDIT_AGREEMENT: float = 0.9  # 검증 시 일치로 판단할 응답 유사도
+
+    # 검색 키워드 추출 방식: "local"(LLM 없이 로컬 추출, 실패 시 LLM 폴백) | "llm"
+    KEYWORD_EXTRACTOR: Literal["local", "llm"] = "local"
+
+    # 평가 유형 분류 방식: "local"(로컬 분류, 신뢰도가 낮으면 LLM으로 넘김) | "llm"
+    CONTENT_CLASSIFIER: Literal["local", "llm"] = "local"
+    CONTENT_CLASSIFIER_THRESHOLD: float = 0.6  # 이 신뢰도 미만이면 LLM으로 판단
+    # 로컬로 확정한 요청 중 LLM 결과와 비교할 비율 (content_classifier_agreement_total로 일치율 확인)
+    CONTENT_CLASSIFIER_SHADOW_RATE: float = 0.05
+
+    # 웹 검색 동시 실행/속도 제한 설정
+    SEARCH_MAX_WORKERS: int = 8  # DDGS 호출용 스레드 풀 크기
+    SEARCH_QUERY_TIMEOUT: float = 10.0  # 검색어별 제한 시간(초, 대기열 대기 제외 실행 시작부터)
+    SEARCH_RATE_LIMIT: float = 2.0  # 프로세스 전체 초당 검색 요청 수 (0 이하이면 제한 없음)
+    SEARCH_RATE_BURST: int = 5  # 순간 허용 요청 수
+
+    # 임베딩 캐시 설정 (DB_PATH에 float32 blob으로 저장)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_TTL: int = 60 * 60 * 24 * 30  # 초
+    EMBEDDING_CACHE_DISK_SIZE: int = 20_000  # 디스크 캐시 최대 항목 수 (1536차원 기준 약 6KB/항목)
+
+    # 임베딩 배치 설정 (캐시에 없는 텍스트를 동시 요청끼리 모아 토큰 수 기준 배치로 요청)
+    EMBEDDING_BATCH_ENABLED: bool = True
+    EMBEDDING_BATCH_WINDOW: float = 0.01  # 요청을 모으는 시간(초)
+    EMBEDDING_BATCH_MAX_TOKENS: int = 100_000  # 배치당 최대 토큰 수 (OpenAI 요청당 한도 300,000)
+    EMBEDDING_BATCH_MAX_TEXTS: int = 2048  # 배치당 최대 텍스트 수 (OpenAI 요청당 한도)
+    EMBEDDING_BATCH_CONCURRENCY: int = 4  # 동시에 요청할 최대 배치 수
+    EMBEDDING_BATCH_TIMEOUT: float = 120.0  # 호출 측이 배치 결과를 기다리는 최대 시간(초)
+
+    # 세션 검색 코퍼스 설정
+    SESSION_STORE_IDLE_TTL: int = 60 * 10  # 유휴 세션 인덱스 제거 시간(초)
+
+    # 작성 에이전트용 (회사, 직무)별 공유 검색 코퍼스 설정
+    ROLE_CONTEXT_TTL: int = 60 * 60 * 24  # 수집한 회사/직무 정보 재사용 시간(초)
+    ROLE_CONTEXT_MAX_ROLES: int = 256  # 메모리에 유지할 최대 (회사, 직무) 수
+
+    # 생성 결과 히스토리 저장 설정 (DB_PATH 사용)
+    HISTORY_ENABLED: bool = True
+    HISTORY_QUEUE_SIZE: int = 256  # 저장 대기 가능한 최대 결과 수 (초과 시 기록하지 않음)
+
+    # 같은 요청 본문이 동시에 들어오면 /create, /create/stream 파이프라인을 한 번만 실행하고 결과 공유
+    CREATE_COALESCING_ENABLED: bool = True
+
+    # 그래프 체크포인트 설정 (DB_PATH 사용, 실패한 실행을 같은 session_id로 재시도하면 이어서 실행)
+    CHECKPOINT_ENABLED: bool = True
+    CHECKPOINT_FLUSH_INTERVAL: float = 0.05  # 체크포인트를 모아서 기록하는 간격(초)
+    CHECKPOINT_TTL: int = 60 * 60 * 24  # 실패한 실행의 체크포인트 보관 시간(초)
 
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Debate Arena API"
@@ -32,45 +136,139 @@ class Settings(BaseSettings):
 
     def get_llm(self):
         """OpenAI LLM 인스턴스를 반환합니다."""
-        return ChatOpenAI(
-            api_key=self.OPENAI_API_KEY,
-            model=self.OPENAI_MODEL_NAME,
-            temperature=0.7,
-            streaming=True,  # 스트리밍 활성화
-        )
+        return get_llm(model=self.OPENAI_MODEL_NAME)
 
     def get_embeddings(self):
         """OpenAI Embeddings 인스턴스를 반환합니다."""
-        return OpenAIEmbeddings(
-            model=self.OPENAI_EMBEDDING_MODEL,
-            api_key=self.OPENAI_API_KEY,
-        )
-    
+        return get_embeddings(model=self.OPENAI_EMBEDDING_MODEL)
+
 
 # 설정 인스턴스 생성
 settings = Settings()
 
 
+# 클라이언트 풀: 설정별로 하나의 클라이언트를 만들어 재사용하고,
+# 모든 클라이언트가 하나의 HTTP 커넥션 풀(keep-alive)을 공유합니다.
+_client_lock = threading.Lock()
+_http_client: Optional[httpx.Client] = None
+_http_async_client: Optional[httpx.AsyncClient] = None
+_llm_clients: Dict[Tuple[str, float, bool], ChatOpenAI] = {}
+_embedding_clients: Dict[str, OpenAIEmbeddings] = {}
+
+# 오프라인 실행(벤치마크 등)에서 OpenAI 클라이언트 대신 사용할 생성 함수
+_llm_factory: Optional[Callable[[str, float, bool], BaseChatModel]] = None
+_embeddings_factory: Optional[Callable[[str], Embeddings]] = None
+
+
+def override_clients(
+    llm_factory: Optional[Callable[[str, float, bool], BaseChatModel]] = None,
+    embeddings_factory: Optional[Callable[[str], Embeddings]] = None,
+) -> None:
+    """get_llm/get_embeddings가 반환할 인스턴스의 생성 함수를 교체합니다. (None이면 OpenAI 클라이언트 사용)
+
+    llm_factory는 (model, temperature, streaming), embeddings_factory는 model을 인자로 받습니다.
+    """
+    global _llm_factory, _embeddings_factory
+    with _client_lock:
+        _llm_factory = llm_factory
+        _embeddings_factory = embeddings_factory
+
+
+def _http_options() -> dict:
+    return {
+        "limits": httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        "timeout": httpx.Timeout(
+            settings.HTTP_READ_TIMEOUT,
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+        ),
+    }
+
+
+def _get_http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """공유 HTTP 클라이언트를 반환합니다. _client_lock을 잡은 상태에서 호출해야 합니다."""
+    global _http_client, _http_async_client
+    if _http_client is None:
+        _http_client = httpx.Client(**_http_options())
+    if _http_async_client is None:
+        _http_async_client = httpx.AsyncClient(**_http_options())
+    return _http_client, _http_async_client
+
+
 # 편의를 위한 함수들, 하위 호환성을 위해 유지
-def get_llm():
-    """LLM 인스턴스를 생성하고 반환합니다."""
-    print("============= MODEL NAME",settings.OPENAI_MODEL_NAME)
-    try:
-        llm = ChatOpenAI(
-            model_name="gpt-4-turbo",  # "gpt-3.5-turbo"
-            temperature=0.7,
-            api_key=settings.OPENAI_API_KEY,
-            streaming=True
-        )
+def get_llm(
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    streaming: bool = True,
+) -> ChatOpenAI:
+    """(model, temperature, streaming) 조합별로 풀링된 LLM 인스턴스를 반환합니다."""
+    key = (model or settings.OPENAI_MODEL_NAME, temperature, streaming)
+    if _llm_factory is not None:
+        return _llm_factory(*key)
+    llm = _llm_clients.get(key)
+    if llm is not None:
+        return llm
+
+    with _client_lock:
+        llm = _llm_clients.get(key)
+        if llm is not None:
+            return llm
+        try:
+            http_client, http_async_client = _get_http_clients()
+            llm = ChatOpenAI(
+                model_name=key[0],
+                temperature=temperature,
+                api_key=settings.OPENAI_API_KEY,
+                streaming=streaming,
+                # 스트리밍 호출에서도 토큰 사용량(usage_metadata)을 받음
+                stream_usage=True,
+                http_client=http_client,
+                http_async_client=http_async_client,
+            )
+        except Exception as e:
+            print(f"LLM 초기화 중 에러 발생: {str(e)}")
+            raise
+        _llm_clients[key] = llm
         return llm
-    except Exception as e:
-        print(f"LLM 초기화 중 에러 발생: {str(e)}")
-        raise
 
 
-def get_embeddings():
-    """임베딩 모델 인스턴스를 생성하고 반환합니다."""
-    return OpenAIEmbeddings(
-        model="text-embedding-3-small",
-        api_key=settings.OPENAI_API_KEY
-    )
+def get_embeddings(model: Optional[str] = None) -> OpenAIEmbeddings:
+    """모델별로 풀링된 임베딩 인스턴스를 반환합니다."""
+    key = model or settings.OPENAI_EMBEDDING_MODEL
+    if _embeddings_factory is not None:
+        return _embeddings_factory(key)
+    embeddings = _embedding_clients.get(key)
+    if embeddings is not None:
+        return embeddings
+
+    with _client_lock:
+        embeddings = _embedding_clients.get(key)
+        if embeddings is None:
+            http_client, http_async_client = _get_http_clients()
+            embeddings = OpenAIEmbeddings(
+                model=key,
+                api_key=settings.OPENAI_API_KEY,
+                http_client=http_client,
+                http_async_client=http_async_client,
+            )
+            _embedding_clients[key] = embeddings
+        return embeddings
+
+
+async def close_clients() -> None:
+    """풀링된 클라이언트와 HTTP 커넥션을 정리합니다. (애플리케이션 종료 시 호출)"""
+    global _http_client, _http_async_client
+    with _client_lock:
+        http_client, http_async_client = _http_client, _http_async_client
+        _http_client = None
+        _http_async_client = None
+        _llm_clients.clear()
+        _embedding_clients.clear()
+
+    if http_async_client is not None:
+        await http_async_client.aclose()
+    if http_client is not None:
+        http_client.close()
@@ -0,0 +1,21 @@
+import sqlite3
+from typing import Optional
+
+from backend.utils.config import settings
+
+
+def connect(path: Optional[str] = None) -> sqlite3.Connection:
+    """SQLite 연결을 생성합니다.
+
+    여러 워커 프로세스가 같은 파일을 공유할 수 있도록 WAL 모드와 busy timeout을 설정합니다.
+    기본 경로는 settings.DB_PATH입니다.
+    """
+    conn = sqlite3.connect(
+        path or settings.DB_PATH,
+        timeout=30,
+        check_same_thread=False,
+        isolation_level=None,  # autocommit
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
@@ -0,0 +1,129 @@
+import asyncio
+import hashlib
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import Runnable, RunnableBinding
+
+from backend.utils.cache import MISSING, MemoryCache, SQLiteCache, TieredCache
+from backend.utils.config import settings
+from backend.utils.metrics import metrics
+from backend.utils.tracing import record_llm_usage
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def llm_temperature(default: float = 0.7) -> float:
+    """결정적 모드(LLM_CACHE_DETERMINISTIC)이면 캐시 적중이 의미 있도록 temperature 0을 사용합니다."""
+    return 0.0 if settings.LLM_CACHE_DETERMINISTIC else default
+
+
+def _normalize(text: str) -> str:
+    # 프롬프트 템플릿의 들여쓰기/줄바꿈 차이는 같은 프롬프트로 취급
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _model_name(llm: Runnable) -> str:
+    return getattr(llm, "model_name", None) or llm._llm_type
+
+
+def make_key(llm: Runnable, messages: List[BaseMessage]) -> str:
+    """모델명, temperature, 정규화한 메시지 목록으로 캐시 키를 만듭니다."""
+    payload = {
+        "model": _model_name(llm),
+        "temperature": getattr(llm, "temperature", None),
+        # bind()로 지정한 호출 옵션(response_format 등)이 다르면 다른 응답으로 취급
+        "options": llm.kwargs if isinstance(llm, RunnableBinding) else None,
+        "messages": [[message.type, _normalize(str(message.content))] for message in messages],
+    }
+    serialized = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """프롬프트가 완전히 같은 LLM 호출의 응답을 재사용하는 캐시
+
+    호출 측에서 만든 LLM 인스턴스를 그대로 받아 키를 계산하므로, 모델/temperature가 다르면
+    서로 다른 항목이 됩니다. name(에이전트 역할 등)별로 LLM_CACHE_DISABLED_AGENTS에서 끌 수 있습니다.
+    """
+
+    def __init__(self, cache: TieredCache, enabled: bool, disabled: Optional[List[str]] = None):
+        self.cache = cache
+        self.enabled = enabled
+        self.disabled = set(disabled or [])
+
+    def enabled_for(self, name: str) -> bool:
+        return self.enabled and name not in self.disabled
+
+    def _lookup(self, name: str, key: str) -> Any:
+        content = self.cache.get(key)
+        result = "miss" if content is MISSING else "hit"
+        metrics.inc("llm_cache_requests_total", agent=name, result=result)
+        if content is not MISSING:
+            logger.info(f"LLM cache hit (agent={name}, hit_ratio={self.hit_ratio(name):.2f})")
+        return content
+
+    @staticmethod
+    def _call(name: str, llm: Runnable, messages: List[BaseMessage]) -> str:
+        response = llm.invoke(messages)
+        record_llm_usage(name, _model_name(llm), getattr(response, "usage_metadata", None))
+        return response.content
+
+    @staticmethod
+    async def _acall(name: str, llm: Runnable, messages: List[BaseMessage]) -> str:
+        response = await llm.ainvoke(messages)
+        record_llm_usage(name, _model_name(llm), getattr(response, "usage_metadata", None))
+        return response.content
+
+    def invoke(self, name: str, llm: Runnable, messages: List[BaseMessage]) -> str:
+        """캐시에 있으면 저장된 응답을, 없으면 LLM을 호출해 응답 본문을 반환합니다."""
+        if not self.enabled_for(name):
+            return self._call(name, llm, messages)
+
+        key = make_key(llm, messages)
+        content = self._lookup(name, key)
+        if content is MISSING:
+            content = self._call(name, llm, messages)
+            self.cache.set(key, content)
+        return content
+
+    async def ainvoke(self, name: str, llm: Runnable, messages: List[BaseMessage]) -> str:
+        """invoke의 비동기 버전"""
+        if not self.enabled_for(name):
+            return await self._acall(name, llm, messages)
+
+        key = make_key(llm, messages)
+        # SQLite 백엔드 조회/저장이 이벤트 루프를 막지 않도록 스레드에서 실행
+        content = await asyncio.to_thread(self._lookup, name, key)
+        if content is MISSING:
+            content = await self._acall(name, llm, messages)
+            await asyncio.to_thread(self.cache.set, key, content)
+        return content
+
+    def hit_ratio(self, name: str) -> float:
+        """name별 캐시 적중률 (전체 적중률은 stats()의 hit_ratio)"""
+        hits = metrics.get("llm_cache_requests_total", agent=name, result="hit")
+        misses = metrics.get("llm_cache_requests_total", agent=name, result="miss")
+        total = hits + misses
+        return hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.cache.stats(), "enabled": self.enabled, "disabled_agents": sorted(self.disabled)}
+
+
+# LLM 응답 캐시 인스턴스 생성
+llm_cache = LLMResponseCache(
+    TieredCache(
+        "llm",
+        MemoryCache(settings.LLM_CACHE_MEMORY_SIZE, ttl=settings.LLM_CACHE_TTL),
+        SQLiteCache("llm_cache", settings.LLM_CACHE_DISK_SIZE, ttl=settings.LLM_CACHE_TTL)
+        if settings.LLM_CACHE_BACKEND == "sqlite" else None,
+    ),
+    enabled=settings.LLM_CACHE_ENABLED,
+    disabled=settings.LLM_CACHE_DISABLED_AGENTS,
+)
@@ -0,0 +1,54 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """프로세스 단위 카운터 저장소 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = defaultdict(lambda: defaultdict(float))
+
+    @staticmethod
+    def _label_key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        """카운터를 증가시킵니다."""
+        with self._lock:
+            self._counters[name][self._label_key(labels)] += amount
+
+    def get(self, name: str, **labels: str) -> float:
+        """카운터 값을 반환합니다."""
+        with self._lock:
+            return self._counters.get(name, {}).get(self._label_key(labels), 0.0)
+
+    def snapshot(self) -> Dict[str, Dict[LabelKey, float]]:
+        """모든 카운터의 현재 값을 복사해 반환합니다."""
+        with self._lock:
+            return {name: dict(series) for name, series in self._counters.items()}
+
+    def render_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식으로 변환합니다. (모든 값은 counter)"""
+        lines = []
+        for name, series in sorted(self.snapshot().items()):
+            lines.append(f"# TYPE {name} counter")
+            for label_key, value in sorted(series.items()):
+                labels = ",".join(f'{key}="{_escape(label)}"' for key, label in label_key)
+                lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+# 메트릭 인스턴스 생성
+metrics = Metrics()
@@ -0,0 +1,35 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """토큰 버킷 방식의 속도 제한기 (스레드 안전)
+
+    초당 rate개의 토큰이 채워지고 최대 capacity개까지 쌓입니다.
+    rate가 0 이하이면 제한하지 않습니다.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """토큰을 하나 가져옵니다. 부족하면 다음 토큰까지 기다려야 할 시간(초)을 반환합니다."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """토큰을 얻을 때까지 현재 스레드를 대기시킵니다."""
+        while (wait := self._take()) > 0:
+            time.sleep(wait)
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Tuple
+
+from backend.utils.metrics import metrics
+
+
+async def wait(future: Future) -> Any:
+    """공유된 Future를 기다립니다. 기다리던 호출이 취소되어도 Future 자체는 취소하지 않습니다."""
+    return await asyncio.shield(asyncio.wrap_future(future))
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 호출이 하나의 실행 결과를 공유하도록 합니다.
+
+    먼저 들어온 호출(leader)만 실제로 실행하고, 실행 중에 같은 키로 들어온 호출은
+    leader의 결과(또는 예외)를 함께 기다립니다. 결과를 보관하지는 않으므로 실행이 끝난 뒤
+    들어온 호출은 다시 실행합니다. (결과 재사용은 캐시의 역할)
+    concurrent.futures.Future를 사용하므로 스레드와 asyncio 호출이 섞여도 동작하며,
+    공유된 호출 수는 singleflight_calls_total{operation, result="shared"}로 집계합니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, keys: Iterable[Hashable]) -> Tuple[Dict[Hashable, Future], Dict[Hashable, Future]]:
+        """키 목록을 (직접 실행할 키, 다른 호출이 실행 중인 키)로 나눕니다.
+
+        직접 실행할 키는 반드시 resolve() 또는 fail()로 완료해야 합니다.
+        """
+        owned: Dict[Hashable, Future] = {}
+        shared: Dict[Hashable, Future] = {}
+        with self._lock:
+            for key in keys:
+                if key in owned or key in shared:
+                    continue
+                future = self._calls.get(key)
+                if future is None:
+                    future = self._calls[key] = Future()
+                    owned[key] = future
+                else:
+                    shared[key] = future
+        if owned:
+            metrics.inc("singleflight_calls_total", len(owned), operation=self.name, result="leader")
+        if shared:
+            metrics.inc("singleflight_calls_total", len(shared), operation=self.name, result="shared")
+        return owned, shared
+
+    def resolve(self, owned: Dict[Hashable, Future], results: Dict[Hashable, Any]) -> None:
+        """직접 실행한 키의 결과를 기다리는 호출들에 전달합니다."""
+        with self._lock:
+            for key in owned:
+                self._calls.pop(key, None)
+        for key, future in owned.items():
+            if not future.done():
+                future.set_result(results[key])
+
+    def fail(self, owned: Dict[Hashable, Future], error: BaseException) -> None:
+        """직접 실행한 키가 실패했음을 기다리는 호출들에 전달합니다."""
+        if isinstance(error, asyncio.CancelledError):
+            # leader의 취소가 기다리던 호출의 취소로 전파되지 않도록 일반 예외로 전달
+            error = RuntimeError(f"{self.name} 실행이 취소되었습니다.")
+        with self._lock:
+            for key in owned:
+                self._calls.pop(key, None)
+        for future in owned.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        """fn(*args)를 실행하거나, 같은 키로 실행 중인 호출이 있으면 그 결과를 기다려 반환합니다."""
+        owned, shared = self.claim([key])
+        if shared:
+            return shared[key].result()
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            self.fail(owned, e)
+            raise
+        self.resolve(owned, {key: result})
+        return result
+
+    async def ado(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """do의 비동기 버전
+
+        실행은 별도 작업으로 진행되므로 leader 호출이 취소되어도 결과를 기다리는 다른 호출에는 영향이 없습니다.
+        """
+        owned, shared = self.claim([key])
+        if shared:
+            return await wait(shared[key])
+
+        async def run() -> Any:
+            try:
+                result = await factory()
+            except BaseException as e:
+                self.fail(owned, e)
+                raise
+            self.resolve(owned, {key: result})
+            return result
+
+        return await asyncio.shield(asyncio.ensure_future(run()))
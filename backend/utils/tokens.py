@@ -0,0 +1,62 @@
+import math
+import threading
+from typing import Any
+
+import tiktoken
+
+from backend.utils.config import settings
+
+# 잘라낸 텍스트 끝에 붙이는 표시
+TRUNCATION_MARKER = "\n...(이하 생략)"
+
+_encoding: Any = None
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    """모델에 맞는 tiktoken 인코딩을 반환합니다. 불러올 수 없으면 False를 반환합니다."""
+    global _encoding
+    if _encoding is None:
+        with _encoding_lock:
+            if _encoding is None:
+                try:
+                    _encoding = tiktoken.encoding_for_model(settings.OPENAI_MODEL_NAME)
+                except KeyError:
+                    _encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception as e:
+                    # 오프라인 환경 등에서 인코딩 파일을 내려받지 못한 경우 근사치로 계산
+                    print(f"tiktoken 인코딩 로드 실패, 토큰 수를 근사치로 계산합니다: {str(e)}")
+                    _encoding = False
+    return _encoding
+
+
+def tokenizer_name() -> str:
+    encoding = _get_encoding()
+    return encoding.name if encoding else "approximate"
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text))
+    # 한글은 대략 글자당 1토큰, 영문/숫자는 4글자당 1토큰
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """텍스트를 max_tokens 이내로 자릅니다. (앞부분 유지)"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    budget = max(max_tokens - count_tokens(TRUNCATION_MARKER), 0)
+    encoding = _get_encoding()
+    if encoding:
+        head = encoding.decode(encoding.encode(text)[:budget])
+    else:
+        # 근사 계산에서는 글자 수를 줄여가며 예산에 맞춤
+        head = text[:budget]
+        while head and count_tokens(head) > budget:
+            head = head[:int(len(head) * 0.9)]
+    return head + TRUNCATION_MARKER
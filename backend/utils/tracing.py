@@ -0,0 +1,158 @@
+import asyncio
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from backend.utils.config import settings
+from backend.utils.metrics import metrics
+
+_current_trace: ContextVar[Optional["RequestTrace"]] = ContextVar("request_trace", default=None)
+
+
+class RequestTrace:
+    """요청 하나에서 실행된 단계별 소요 시간과 LLM 토큰/비용 합계
+
+    contextvars로 전파되므로 그래프 노드, 검색 스레드 등 요청 안에서 호출된 곳에서 기록한 값이
+    모두 같은 객체에 모입니다. 병렬 실행되는 노드가 동시에 기록하므로 락으로 보호합니다.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self._llm: Dict[str, Dict[str, float]] = {}
+
+    def record_stage(self, stage: str, elapsed: float) -> None:
+        with self._lock:
+            entry = self._stages.setdefault(stage, {"calls": 0, "seconds": 0.0})
+            entry["calls"] += 1
+            entry["seconds"] += elapsed
+
+    def record_llm(self, name: str, prompt_tokens: int, completion_tokens: int, cost: float) -> None:
+        with self._lock:
+            entry = self._llm.setdefault(
+                name, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+            )
+            entry["calls"] += 1
+            entry["prompt_tokens"] += prompt_tokens
+            entry["completion_tokens"] += completion_tokens
+            entry["cost_usd"] += cost
+
+    def to_dict(self) -> Dict[str, Any]:
+        """응답에 포함할 형식으로 변환합니다. (시간은 ms 단위)"""
+        with self._lock:
+            stages = {
+                stage: {"calls": int(entry["calls"]), "total_ms": round(entry["seconds"] * 1000, 1)}
+                for stage, entry in sorted(self._stages.items())
+            }
+            llm = {name: dict(entry) for name, entry in sorted(self._llm.items())}
+        return {
+            "total_ms": round((time.perf_counter() - self.started_at) * 1000, 1),
+            "stages": stages,
+            "llm": llm,
+            "prompt_tokens": sum(entry["prompt_tokens"] for entry in llm.values()),
+            "completion_tokens": sum(entry["completion_tokens"] for entry in llm.values()),
+            "cost_usd": round(sum(entry["cost_usd"] for entry in llm.values()), 6),
+        }
+
+
+@contextmanager
+def start_trace() -> Iterator[RequestTrace]:
+    """현재 컨텍스트에서 요청 단위 측정을 시작합니다."""
+    trace = RequestTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        try:
+            _current_trace.reset(token)
+        except ValueError:
+            # 스트리밍 제너레이터가 다른 컨텍스트에서 닫힌 경우 (해당 컨텍스트는 더 쓰이지 않음)
+            pass
+
+
+def _record_stage(stage: str, elapsed: float, labels: Dict[str, str]) -> None:
+    metrics.inc("stage_seconds_total", elapsed, stage=stage, **labels)
+    metrics.inc("stage_calls_total", stage=stage, **labels)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.record_stage(f"{labels['agent']}.{stage}" if "agent" in labels else stage, elapsed)
+
+
+@contextmanager
+def timed(stage: str, **labels: str) -> Iterator[None]:
+    """블록의 소요 시간을 stage_seconds_total과 현재 요청의 측정값에 기록합니다."""
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record_stage(stage, time.perf_counter() - started_at, labels)
+
+
+def traced(stage: str, **labels: str) -> Callable[[Callable], Callable]:
+    """함수(동기/비동기) 실행 시간을 timed와 같은 방식으로 기록하는 데코레이터"""
+
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with timed(stage, **labels):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(stage, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """LLM_PRICING(100만 토큰당 USD)으로 호출 비용을 추정합니다. 가격 정보가 없는 모델은 0입니다."""
+    # 날짜가 붙은 모델명(gpt-4-turbo-2024-04-09 등)은 가장 긴 접두어로 찾음
+    prefix = max((name for name in settings.LLM_PRICING if model.startswith(name)), key=len, default=None)
+    if prefix is None:
+        return 0.0
+    input_price, output_price = settings.LLM_PRICING[prefix]
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+def record_llm_usage(name: str, model: str, usage: Optional[Dict[str, Any]]) -> None:
+    """LLM 호출의 토큰 사용량과 추정 비용을 기록합니다. (캐시 적중 시에는 호출하지 않음)"""
+    if not usage:
+        metrics.inc("llm_usage_missing_total", agent=name)
+        return
+    prompt_tokens = int(usage.get("input_tokens", 0))
+    completion_tokens = int(usage.get("output_tokens", 0))
+    cost = estimate_cost(model, prompt_tokens, completion_tokens)
+
+    metrics.inc("llm_calls_total", agent=name, model=model)
+    metrics.inc("llm_prompt_tokens_total", prompt_tokens, agent=name, model=model)
+    metrics.inc("llm_completion_tokens_total", completion_tokens, agent=name, model=model)
+    metrics.inc("llm_cost_usd_total", cost, agent=name, model=model)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.record_llm(name, prompt_tokens, completion_tokens, cost)
+
+
+def trace_callbacks(session_id: str) -> List[Any]:
+    """LANGFUSE_ENABLED이면 그래프 실행을 Langfuse로 보내는 콜백을 반환합니다."""
+    if not settings.LANGFUSE_ENABLED:
+        return []
+    try:
+        from langfuse.callback import CallbackHandler
+
+        return [CallbackHandler(
+            public_key=settings.LANGFUSE_PUBLIC_KEY,
+            secret_key=settings.LANGFUSE_SECRET_KEY,
+            host=settings.LANGFUSE_HOST,
+            session_id=session_id,
+        )]
+    except Exception as e:
+        print(f"Langfuse 콜백 초기화 중 오류 발생: {str(e)}")
+        return []
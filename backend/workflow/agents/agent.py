@@ -1,40 +1,86 @@
 from langchain.schema import HumanMessage, SystemMessage, AIMessage
+from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import BaseMessage
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from langchain_core.runnables.config import merge_configs
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, TypedDict
+from typing import List, Dict, Any, Optional, Tuple, TypedDict
 from langgraph.graph import StateGraph, END
 from backend.utils.config import get_llm
+from backend.utils.llm_cache import llm_cache, llm_temperature
+from backend.utils.metrics import metrics
+from backend.utils.tracing import traced
+from backend.utils.tokens import count_tokens, truncate_to_tokens
+from backend.workflow.context import message_tokens, select_history
 from backend.workflow.state import ResumeState, AgentType
-from backend.rag.vector_store import search_info
-import json
+from backend.rag.vector_store import search_info, asearch_info
+from backend.rag.semantic_cache import get_semantic_cache
+import functools
+import time
 
+# 에이전트 서브그래프의 각 노드는 변경한 키만 반환합니다. (상태 전체를 복사해 반환하지 않음)
 class AgentState(TypedDict):
     resume_state: Dict[str, Any]  # 전체 자소서 상태
     context: str  # 검색된 컨텍스트
     messages: List[BaseMessage]  # LLM에 전달할 메시지
     response: str  # LLM 응답
+    updates: Dict[str, Any]  # 상위 그래프에 반영할 상태 변경분
+
+def get_session_id(config: Optional[RunnableConfig]) -> Optional[str]:
+    """RunnableConfig에서 요청 세션 ID를 꺼냅니다."""
+    if not config:
+        return None
+    return config.get("configurable", {}).get("session_id")
+
+def _agent_config(config: Optional[RunnableConfig], role: str) -> RunnableConfig:
+    """스트리밍 이벤트에서 어느 에이전트의 토큰인지 구분할 수 있도록 metadata에 역할을 추가합니다."""
+    return merge_configs(config, {"metadata": {"agent": role}})
 
 class Agent(ABC):
+    # 프롬프트에 포함할 이전 단계 출력 (초안/피드백처럼 _create_prompt에 이미 들어가는 출력은 선언하지 않음)
+    context_sources: Tuple[str, ...] = ()
+    # 이전 단계 출력과 검색 컨텍스트에 허용할 최대 토큰 수
+    context_token_budget: int = 2000
+    # 의미 캐시에서 유사도가 재사용 기준에 못 미치는 과거 응답을 참고 자료로 쓸지 여부
+    semantic_cache_seed: bool = False
+    # 검색 결과를 프롬프트에 넣을 때 사용하는 제목
+    context_heading: str = "검증을 위해 수집된 정보"
+
     def __init__(
         self, 
         system_prompt: str, 
         role: str, 
-        k: int = 2, 
-        session_id: str = None
+        k: int = 2
     ):
+        # 에이전트는 프로세스 단위로 재사용되므로 요청별 데이터(session_id 등)는
+        # 생성자가 아닌 RunnableConfig의 configurable로 전달받습니다.
         self.system_prompt = system_prompt
         self.role = role
         self.k = k
         self._setup_graph()
-        self.session_id = session_id
 
     def _setup_graph(self):
         workflow = StateGraph(AgentState)
-        
-        workflow.add_node("retrieve_context", self._retrieve_context)
-        workflow.add_node("prepare_messages", self._prepare_messages)
-        workflow.add_node("generate_response", self._generate_response)
-        workflow.add_node("update_state", self._update_state)
+        # 노드별 소요 시간을 stage_seconds_total{stage, agent}와 요청별 측정값에 기록
+        timed_node = functools.partial(traced, agent=AgentType(self.role).value)
+        
+        # 동기/비동기 실행 경로를 모두 지원하도록 RunnableLambda로 등록
+        workflow.add_node(
+            "retrieve_context",
+            RunnableLambda(
+                timed_node("retrieve_context")(self._retrieve_context),
+                afunc=timed_node("retrieve_context")(self._aretrieve_context),
+            ),
+        )
+        workflow.add_node("prepare_messages", timed_node("prepare_messages")(self._prepare_messages))
+        workflow.add_node(
+            "generate_response",
+            RunnableLambda(
+                timed_node("generate_response")(self._generate_response),
+                afunc=timed_node("generate_response")(self._agenerate_response),
+            ),
+        )
+        workflow.add_node("update_state", timed_node("update_state")(self._update_state))
         
         workflow.add_edge("retrieve_context", "prepare_messages")
         workflow.add_edge("prepare_messages", "generate_response")
@@ -43,12 +89,17 @@ class Agent(ABC):
         workflow.set_entry_point("retrieve_context")
         workflow.add_edge("update_state", END)
         
-        self.graph = workflow.compile()
+        # 에이전트 내부 단계는 체크포인트하지 않음 (상위 그래프에서 에이전트 노드 단위로 기록)
+        self.graph = workflow.compile(checkpointer=False)
 
-    def _retrieve_context(self, state: AgentState) -> AgentState:
-        if self.k <= 0:
-            return {**state, "context": ""}
+    def _search_query(self, resume_state: Dict[str, Any], question: Dict[str, Any]) -> str:
+        """세션 코퍼스를 조회할 에이전트별 검색 질의를 반환합니다."""
+        return question['content']
 
+    def _search_params(
+        self, state: AgentState, config: Optional[RunnableConfig] = None
+    ) -> Optional[Dict[str, Any]]:
+        """RAG 검색 파라미터를 구성합니다. 검색하지 않는 경우 None을 반환합니다."""
         resume_state = state["resume_state"]
         current_question_id = resume_state["current_question_id"]
         
@@ -59,31 +110,50 @@ class Agent(ABC):
         )
         current_draft = resume_state["drafts"].get(current_question_id, "")
 
-        # 검색 쿼리 구성
-        if self.role == AgentType.RESUME_WRITER:
-            query = f"{resume_state['organization']} {resume_state['position']} {current_question['category']}"
-        else:
-            # 평가자의 경우 자소서 내용 기반 검증
-            if not current_draft:  # 초안이 없으면 검색 불가
-                return {**state, "context": ""}
-            
-            # RAG 검색 수행
-            search_results = search_info(
-                content=current_draft,
-                role=self.role,
-                query=current_question['content'],
-                k=self.k
-            )
-            
-            # 검색 결과 포맷팅
-            context = self._format_search_results(search_results)
-            return {**state, "context": context}
+        # 평가자의 경우 자소서 내용 기반 검증
+        if not current_draft:  # 초안이 없으면 검색 불가
+            return None
+
+        return {
+            "content": current_draft,
+            "role": self.role,
+            "query": self._search_query(resume_state, current_question),
+            "k": self.k,
+            "session_id": get_session_id(config),
+        }
+
+    def _retrieve_context(self, state: AgentState, config: RunnableConfig) -> AgentState:
+        if self.k <= 0:
+            return {"context": ""}
+
+        params = self._search_params(state, config)
+        if params is None:
+            return {"context": ""}
+
+        # RAG 검색 수행
+        search_results = search_info(**params)
+
+        # 검색 결과 포맷팅
+        context = self._format_search_results(search_results)
+        return {"context": context}
+
+    async def _aretrieve_context(self, state: AgentState, config: RunnableConfig) -> AgentState:
+        if self.k <= 0:
+            return {"context": ""}
+
+        params = self._search_params(state, config)
+        if params is None:
+            return {"context": ""}
+
+        search_results = await asearch_info(**params)
+        context = self._format_search_results(search_results)
+        return {"context": context}
 
     def _format_search_results(self, results: List[Dict[str, Any]]) -> str:
         if not results:
             return ""
             
-        formatted_text = "검증을 위해 수집된 정보:\n\n"
+        formatted_text = f"{self.context_heading}:\n\n"
         for i, result in enumerate(results, 1):
             formatted_text += f"[정보 {i}]\n"
             formatted_text += f"출처: {result['source']}\n"
@@ -93,71 +163,170 @@ class Agent(ABC):
         return formatted_text
 
     def _prepare_messages(self, state: AgentState) -> AgentState:
+        """선언된 이전 단계 출력과 검색 컨텍스트를 토큰 예산 안에서 조립해 LLM 메시지를 구성합니다."""
         resume_state = state["resume_state"]
         context = state["context"]
+        history = resume_state.get("messages", [])
+        
+        full_prompt = self._create_prompt({**resume_state, "context": context})
+        selected = select_history(
+            history,
+            resume_state.get("current_question_id"),
+            self.context_sources,
+            self.context_token_budget,
+            full_prompt,
+        )
         
-        messages = [SystemMessage(content=self.system_prompt)]
+        # 이전 단계 출력을 넣고 남은 예산만큼만 검색 컨텍스트 사용
+        prompt = full_prompt
+        remaining = self.context_token_budget - sum(message_tokens(m) for m in selected)
+        trimmed_context = truncate_to_tokens(context, max(remaining, 0)) if context else context
+        if trimmed_context != context:
+            prompt = self._create_prompt({**resume_state, "context": trimmed_context})
         
-        for message in resume_state.get("messages", []):
+        messages = [SystemMessage(content=self.system_prompt)]
+        for message in selected:
             if message["role"] == "assistant":
                 messages.append(AIMessage(content=message["content"]))
             else:
                 messages.append(
                     HumanMessage(content=f"{message['role']}: {message['content']}")
                 )
-        
-        prompt = self._create_prompt({**resume_state, "context": context})
         messages.append(HumanMessage(content=prompt))
         
-        return {**state, "messages": messages}
+        # 전체 대화를 그대로 전달했을 때와 비교한 프롬프트 토큰 수 기록
+        untrimmed_tokens = (
+            count_tokens(self.system_prompt)
+            + sum(message_tokens(message) for message in history)
+            + count_tokens(full_prompt)
+        )
+        prompt_tokens = sum(count_tokens(message.content) for message in messages)
+        role = AgentType(self.role).value
+        metrics.inc("prompt_tokens_total", prompt_tokens, agent=role)
+        metrics.inc("prompt_tokens_trimmed_total", max(untrimmed_tokens - prompt_tokens, 0), agent=role)
+        
+        return {"messages": messages}
 
     @abstractmethod
     def _create_prompt(self, state: Dict[str, Any]) -> str:
         pass
 
+    def _semantic_cache_key(self, resume_state: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """의미 캐시 키 (정확히 일치해야 하는 구분 키, 임베딩할 가변 텍스트). None이면 사용하지 않습니다."""
+        return None
+
+    def _bind_llm(self, llm: BaseChatModel) -> Runnable:
+        """에이전트별 호출 옵션(응답 형식 등)을 지정할 수 있도록 LLM을 감쌉니다."""
+        return llm
+
+    def _seed_messages(self, messages: List[BaseMessage], reference: str) -> List[BaseMessage]:
+        """유사한 과거 응답을 참고 자료로 덧붙입니다."""
+        return messages + [HumanMessage(
+            content=f"[참고 답변]\n아래는 비슷한 조건에서 작성된 답변입니다. 현재 정보에 맞게 참고만 하세요.\n{reference}"
+        )]
+
     def _generate_response(self, state: AgentState) -> AgentState:
         messages = state["messages"]
-        response = get_llm().invoke(messages)
-        return {**state, "response": response.content}
+        llm = self._bind_llm(get_llm(temperature=llm_temperature()))
+        role = AgentType(self.role).value
+        
+        semantic_cache = get_semantic_cache()
+        key = self._semantic_cache_key(state["resume_state"]) if semantic_cache else None
+        if key is None:
+            return {"response": llm_cache.invoke(role, llm, messages)}
+        
+        match = semantic_cache.lookup(role, *key)
+        if match.found and match.score >= semantic_cache.threshold:
+            semantic_cache.maybe_audit(role, llm, messages, match)
+            return {"response": match.response}
+        if match.found and self.semantic_cache_seed:
+            messages = self._seed_messages(messages, match.response)
+        
+        started_at = time.perf_counter()
+        response = llm_cache.invoke(role, llm, messages)
+        semantic_cache.add(role, *key, match.vector, response, time.perf_counter() - started_at)
+        return {"response": response}
+
+    async def _agenerate_response(self, state: AgentState) -> AgentState:
+        messages = state["messages"]
+        llm = self._bind_llm(get_llm(temperature=llm_temperature()))
+        role = AgentType(self.role).value
+        
+        semantic_cache = get_semantic_cache()
+        key = self._semantic_cache_key(state["resume_state"]) if semantic_cache else None
+        if key is None:
+            return {"response": await llm_cache.ainvoke(role, llm, messages)}
+        
+        match = await semantic_cache.alookup(role, *key)
+        if match.found and match.score >= semantic_cache.threshold:
+            semantic_cache.maybe_audit(role, llm, messages, match)
+            return {"response": match.response}
+        if match.found and self.semantic_cache_seed:
+            messages = self._seed_messages(messages, match.response)
+        
+        started_at = time.perf_counter()
+        response = await llm_cache.ainvoke(role, llm, messages)
+        await semantic_cache.aadd(role, *key, match.vector, response, time.perf_counter() - started_at)
+        return {"response": response}
 
     def _update_state(self, state: AgentState) -> AgentState:
+        """상위 그래프에 반영할 변경분만 계산합니다.
+
+        평가 에이전트는 병렬로 실행되므로 공유 상태를 직접 수정하지 않고,
+        ResumeState의 리듀서가 병합할 수 있는 형태로 반환합니다.
+        """
         resume_state = state["resume_state"]
         response = state["response"]
         current_question_id = resume_state["current_question_id"]
         
-        new_resume_state = resume_state.copy()
-        new_resume_state["messages"].append({
-            "role": self.role,
-            "content": response
-        })
-        new_resume_state["current_step"] = self.role
+        updates = {
+            "messages": [{
+                "role": self.role,
+                "content": response,
+                "question_id": current_question_id,
+            }],
+            "current_step": self.role,
+        }
         
         # 각 에이전트별 상태 업데이트
         if self.role == AgentType.RESUME_WRITER:
-            new_resume_state["drafts"][current_question_id] = response
-        elif self.role == AgentType.CONTENT_ANALYZER:
-            # JSON 응답에서 평가 유형 추출
-            analysis_result = json.loads(response)
-            new_resume_state["evaluation_types"][current_question_id] = analysis_result["evaluation_type"]
+            updates["drafts"] = {current_question_id: response}
         elif self.role == AgentType.TECHNICAL_EVALUATOR:
-            new_resume_state["technical_feedbacks"][current_question_id] = response
+            updates["technical_feedbacks"] = {current_question_id: response}
         elif self.role == AgentType.CULTURE_EVALUATOR:
-            new_resume_state["culture_feedbacks"][current_question_id] = response
+            updates["culture_feedbacks"] = {current_question_id: response}
         elif self.role == AgentType.FINAL_REVIEWER:
-            new_resume_state["final_drafts"][current_question_id] = response
+            updates["final_drafts"] = {current_question_id: response}
+        
+        return {"updates": updates}
+
+    def run(self, state: ResumeState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
+        agent_state = AgentState(
+            resume_state=state,
+            context="",
+            messages=[],
+            response="",
+            updates={}
+        )
         
-        return {**state, "resume_state": new_resume_state}
+        result = self.graph.invoke(agent_state, _agent_config(config, self.role))
+        return result["updates"]
 
-    def run(self, state: ResumeState) -> ResumeState:
+    async def arun(self, state: ResumeState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
         agent_state = AgentState(
             resume_state=state,
             context="",
             messages=[],
-            response=""
+            response="",
+            updates={}
         )
         
-        result = self.graph.invoke(agent_state)
-        return result["resume_state"]
+        result = await self.graph.ainvoke(agent_state, _agent_config(config, self.role))
+        return result["updates"]
+
+    def as_node(self) -> RunnableLambda:
+        """상위 그래프에 등록할 수 있도록 동기/비동기 실행 함수를 묶어 반환합니다."""
+        return RunnableLambda(self.run, afunc=self.arun)
 
 class BaseAgent(ABC):
     """자소서 관련 에이전트들의 기본 추상 클래스"""
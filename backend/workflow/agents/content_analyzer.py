@@ -1,19 +1,70 @@
 from backend.workflow.agents.agent import Agent, AgentState
+from backend.workflow.content_classifier import classify_content
 from backend.workflow.state import AgentType, EvaluationType
-from typing import Dict, Any
+from backend.utils.config import settings
+from backend.utils.metrics import metrics
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from typing import Dict, Any, Optional, Tuple
+import asyncio
+import contextvars
 import json
+import random
+import re
+import threading
+import time
+
+class ContentAnalysis(BaseModel):
+    """내용 분석 응답 스키마"""
+    evaluation_type: EvaluationType = Field(..., description="technical | culture | both")
+    reason: str = Field("", description="평가 유형 선택 이유")
+
+    @field_validator("evaluation_type", mode="before")
+    @classmethod
+    def _normalize_label(cls, value: Any) -> Any:
+        return value.strip().lower() if isinstance(value, str) else value
+
+# ```json ... ``` 코드 블록 또는 본문 중 첫 JSON 객체
+_FENCED_JSON = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+def parse_content_analysis(text: str) -> Tuple[Optional[ContentAnalysis], bool]:
+    """응답을 ContentAnalysis로 변환합니다. (결과, 관대한 추출 사용 여부)를 반환하며 실패하면 결과는 None입니다."""
+    try:
+        return ContentAnalysis.model_validate_json(text), False
+    except ValidationError:
+        pass
+
+    # 마크다운 코드 블록이나 설명 문장에 둘러싸인 JSON 추출
+    for pattern in (_FENCED_JSON, _JSON_OBJECT):
+        match = pattern.search(text or "")
+        if match:
+            try:
+                return ContentAnalysis.model_validate_json(match.group(1) if match.groups() else match.group(0)), True
+            except ValidationError:
+                continue
+    return None, False
 
 class ContentAnalyzer(Agent):
-    def __init__(self, k: int = 2, session_id: str = None):
+    def __init__(self, k: int = 2):
         super().__init__(
             system_prompt="""당신은 자기소개서 내용을 분석하여 어떤 유형의 평가가 필요한지 판단하는 전문가입니다.
             기술적인 내용이 주를 이루면 technical, 문화적/개인적 내용이 주를 이루면 culture,
             둘 다 중요하게 다루어져야 한다면 both로 평가해주세요.""",
             role=AgentType.CONTENT_ANALYZER,
-            k=k,
-            session_id=session_id
+            k=k
         )
 
+    def _semantic_cache_key(self, resume_state: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        # 평가 유형은 문항과 답변 내용으로 결정되므로 둘을 합쳐 유사도로 비교
+        current_id = resume_state["current_question_id"]
+        current_question = next(
+            q for q in resume_state["questions"]
+            if q["question_id"] == current_id
+        )
+        return AgentType.CONTENT_ANALYZER.value, f"{current_question['content']}\n{resume_state['drafts'].get(current_id, '')}"
+
     def _create_prompt(self, state: Dict[str, Any]) -> str:
         current_id = state["current_question_id"]
         current_draft = state["drafts"].get(current_id, "")
@@ -45,23 +96,129 @@ class ContentAnalyzer(Agent):
         {{"evaluation_type": "technical|culture|both", "reason": "평가 유형 선택 이유"}}
         """
 
+    def _classify_locally(self, resume_state: Dict[str, Any]) -> Tuple[str, float]:
+        current_id = resume_state["current_question_id"]
+        current_question = next(
+            q for q in resume_state["questions"]
+            if q["question_id"] == current_id
+        )
+        started_at = time.perf_counter()
+        label, confidence, _ = classify_content(
+            current_question,
+            resume_state["drafts"].get(current_id, ""),
+            resume_state.get("requirements"),
+            resume_state.get("company_values"),
+        )
+        metrics.inc("content_classifier_seconds_total", time.perf_counter() - started_at, path="local")
+        return label, confidence
+
+    def _bind_llm(self, llm: BaseChatModel) -> Runnable:
+        # JSON 모드로 항상 파싱 가능한 JSON 객체만 응답하도록 제한
+        return llm.bind(response_format={"type": "json_object"})
+
+    @staticmethod
+    def _parse_evaluation_type(response: str) -> Optional[str]:
+        analysis, _ = parse_content_analysis(response)
+        return analysis.evaluation_type.value if analysis else None
+
+    def _record_agreement(self, local_label: str, response: str, elapsed: float) -> None:
+        """로컬 분류 결과와 LLM 판단의 일치 여부, LLM 경로의 소요 시간을 기록합니다."""
+        metrics.inc("content_classifier_seconds_total", elapsed, path="llm")
+        metrics.inc("content_classifier_llm_calls_total")
+        llm_label = self._parse_evaluation_type(response)
+        if llm_label is not None:
+            result = "agree" if llm_label == local_label else "disagree"
+            metrics.inc("content_classifier_agreement_total", result=result)
+
+    def _local_response(self, label: str, confidence: float) -> str:
+        metrics.inc("content_classifications_total", path="local", evaluation_type=label)
+        return json.dumps(
+            {"evaluation_type": label, "reason": f"로컬 분류 (신뢰도 {confidence:.2f})"},
+            ensure_ascii=False,
+        )
+
+    def _generate_response(self, state: AgentState) -> AgentState:
+        if settings.CONTENT_CLASSIFIER != "local":
+            return super()._generate_response(state)
+
+        label, confidence = self._classify_locally(state["resume_state"])
+        if confidence >= settings.CONTENT_CLASSIFIER_THRESHOLD:
+            if random.random() < settings.CONTENT_CLASSIFIER_SHADOW_RATE:
+                # 확정한 결과도 일부는 백그라운드 스레드에서 LLM과 비교 (새 스레드는 빈 컨텍스트로 시작)
+                threading.Thread(target=self._shadow_compare_sync, args=(state, label), daemon=True).start()
+            return {"response": self._local_response(label, confidence)}
+
+        # 신뢰도가 낮으면 LLM으로 판단
+        metrics.inc("content_classifications_total", path="escalated")
+        started_at = time.perf_counter()
+        result = super()._generate_response(state)
+        self._record_agreement(label, result["response"], time.perf_counter() - started_at)
+        return result
+
+    async def _agenerate_response(self, state: AgentState) -> AgentState:
+        if settings.CONTENT_CLASSIFIER != "local":
+            return await super()._agenerate_response(state)
+
+        label, confidence = self._classify_locally(state["resume_state"])
+        if confidence >= settings.CONTENT_CLASSIFIER_THRESHOLD:
+            if random.random() < settings.CONTENT_CLASSIFIER_SHADOW_RATE:
+                # 확정한 결과도 일부는 백그라운드에서 LLM과 비교 (요청의 스트리밍 이벤트와 분리)
+                asyncio.create_task(self._shadow_compare(state, label), context=contextvars.Context())
+            return {"response": self._local_response(label, confidence)}
+
+        metrics.inc("content_classifications_total", path="escalated")
+        started_at = time.perf_counter()
+        result = await super()._agenerate_response(state)
+        self._record_agreement(label, result["response"], time.perf_counter() - started_at)
+        return result
+
+    def _shadow_compare_sync(self, state: AgentState, local_label: str) -> None:
+        try:
+            started_at = time.perf_counter()
+            result = super()._generate_response(state)
+            self._record_agreement(local_label, result["response"], time.perf_counter() - started_at)
+        except Exception as e:
+            print(f"평가 유형 비교 중 오류 발생: {str(e)}")
+
+    async def _shadow_compare(self, state: AgentState, local_label: str) -> None:
+        try:
+            started_at = time.perf_counter()
+            result = await super()._agenerate_response(state)
+            self._record_agreement(local_label, result["response"], time.perf_counter() - started_at)
+        except Exception as e:
+            print(f"평가 유형 비교 중 오류 발생: {str(e)}")
+
     def _update_state(self, state: AgentState) -> AgentState:
         resume_state = state["resume_state"]
         response = state["response"]
         current_id = resume_state["current_question_id"]
         
-        try:
-            analysis_result = json.loads(response)
-            evaluation_type = analysis_result["evaluation_type"]
-        except:
-            evaluation_type = "both"  # 파싱 실패시 기본값
+        analysis, tolerant = parse_content_analysis(response)
+        if analysis is not None:
+            evaluation_type = analysis.evaluation_type.value
+            if tolerant:
+                metrics.inc("content_analysis_tolerant_parses_total")
+                avoided_reason = "tolerant_parse"
+        else:
+            # 파싱 실패 시 가장 비싼 both 대신 로컬 분류 결과 사용
+            metrics.inc("content_analysis_parse_failures_total")
+            print(f"내용 분석 응답 파싱 실패, 로컬 분류 결과를 사용합니다: {response[:200]}")
+            evaluation_type, _ = self._classify_locally(resume_state)
+            avoided_reason = "local_fallback"
+        metrics.inc("content_analysis_responses_total")
+        
+        # 예전에는 파싱 실패 시 both로 처리되어 두 평가자를 모두 실행했음
+        if (tolerant or analysis is None) and evaluation_type != EvaluationType.BOTH:
+            metrics.inc("content_analysis_both_avoided_total", reason=avoided_reason)
             
-        new_resume_state = resume_state.copy()
-        new_resume_state["evaluation_types"][current_id] = evaluation_type
-        new_resume_state["current_step"] = self.role
-        new_resume_state["messages"].append({
-            "role": self.role,
-            "content": response
-        })
+        updates = {
+            "evaluation_types": {current_id: evaluation_type},
+            "current_step": self.role,
+            "messages": [{
+                "role": self.role,
+                "content": response,
+                "question_id": current_id,
+            }],
+        }
         
-        return {**state, "resume_state": new_resume_state} 
\ No newline at end of file
+        return {"updates": updates}
@@ -3,14 +3,19 @@ from backend.workflow.state import AgentType
 from typing import Dict, Any
 
 class TechnicalEvaluator(Agent):
-    def __init__(self, k: int = 2, session_id: str = None):
+    # 초안은 프롬프트에 포함되므로 이전 단계 중 내용 분석 결과(평가 유형 선택 이유)만 참고
+    context_sources = (AgentType.CONTENT_ANALYZER,)
+
+    def __init__(self, k: int = 2):
         super().__init__(
             system_prompt="""당신은 해당 직무 분야의 전문가(팀장)입니다.
             지원자의 자기소개서를 기술적 측면에서 평가하고 구체적인 피드백을 제공해주세요.""",
             role=AgentType.TECHNICAL_EVALUATOR,
-            k=k,
-            session_id=session_id,
+            k=k
         )
+
+    def _search_query(self, resume_state: Dict[str, Any], question: Dict[str, Any]) -> str:
+        return f"{question['content']} {resume_state['position']} {resume_state['requirements']}"
     
     def _create_prompt(self, state: Dict[str, Any]) -> str:
         current_question = next(
@@ -50,14 +55,19 @@ class TechnicalEvaluator(Agent):
         """
 
 class CultureEvaluator(Agent):
-    def __init__(self, k: int = 2, session_id: str = None):
+    # 초안은 프롬프트에 포함되므로 이전 단계 중 내용 분석 결과(평가 유형 선택 이유)만 참고
+    context_sources = (AgentType.CONTENT_ANALYZER,)
+
+    def __init__(self, k: int = 2):
         super().__init__(
             system_prompt="""당신은 HR 팀장입니다.
             지원자의 자기소개서를 조직문화 적합성과 인성 측면에서 평가하고 구체적인 피드백을 제공해주세요.""",
             role=AgentType.CULTURE_EVALUATOR,
-            k=k,
-            session_id=session_id,
+            k=k
         )
+
+    def _search_query(self, resume_state: Dict[str, Any], question: Dict[str, Any]) -> str:
+        return f"{question['content']} {resume_state['organization']} {resume_state.get('company_values') or ''}".strip()
     
     def _create_prompt(self, state: Dict[str, Any]) -> str:
         current_question = next(
@@ -97,13 +107,15 @@ class CultureEvaluator(Agent):
         """
 
 class FinalReviewer(Agent):
-    def __init__(self, k: int = 2, session_id: str = None):
+    # 초안과 두 평가 피드백은 프롬프트 본문에 포함되므로 이전 대화는 다시 전달하지 않음
+    context_sources = ()
+
+    def __init__(self, k: int = 2):
         super().__init__(
             system_prompt="""당신은 전문적인 자기소개서 작성 도우미입니다.
             받은 피드백을 바탕으로 자기소개서를 개선하여 최종본을 작성해주세요.""",
             role=AgentType.FINAL_REVIEWER,
-            k=k,
-            session_id=session_id,
+            k=k
         )
     
     def _create_prompt(self, state: Dict[str, Any]) -> str:
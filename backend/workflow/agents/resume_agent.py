@@ -1,18 +1,83 @@
 from backend.workflow.agents.agent import Agent, AgentState
 from backend.workflow.state import AgentType
-from typing import Dict, Any
+from backend.rag.vector_store import search_role_info, asearch_role_info
+from langchain_core.runnables import RunnableConfig
+from typing import Dict, Any, Optional, Tuple
+import hashlib
+import json
 
 class ResumeWritingAgent(Agent):
-    def __init__(self, k: int = 2, session_id: str = None):
+    # 의미 캐시 유사도가 재사용 기준에 못 미치면 과거 초안을 참고 자료로 사용
+    semantic_cache_seed = True
+    context_heading = "회사/직무 관련 참고 정보"
+
+    def __init__(self, k: int = 2):
         super().__init__(
             system_prompt="""당신은 전문적인 자기소개서 작성 도우미입니다. 
             주어진 질문의 의도를 정확히 파악하고, 글자수 제한을 준수하면서 
             지원자의 경험과 회사의 요구사항을 잘 매칭시켜 설득력 있는 자기소개서를 작성해주세요.""",
             role=AgentType.RESUME_WRITER,
-            k=k,
-            session_id=session_id,
+            k=k
         )
     
+    def _role_query(self, resume_state: Dict[str, Any]) -> str:
+        current_question = next(
+            q for q in resume_state['questions']
+            if q['question_id'] == resume_state['current_question_id']
+        )
+        return f"{resume_state['organization']} {resume_state['position']} {current_question['category']} {current_question['content']}"
+
+    def _retrieve_context(self, state: AgentState, config: RunnableConfig) -> AgentState:
+        # 초안이 없는 단계이므로 세션 코퍼스 대신 (회사, 직무)별 공유 코퍼스에서 검색
+        if self.k <= 0:
+            return {"context": ""}
+
+        resume_state = state["resume_state"]
+        results = search_role_info(
+            resume_state['organization'],
+            resume_state['position'],
+            self._role_query(resume_state),
+            k=self.k,
+        )
+        return {"context": self._format_search_results(results)}
+
+    async def _aretrieve_context(self, state: AgentState, config: RunnableConfig) -> AgentState:
+        if self.k <= 0:
+            return {"context": ""}
+
+        resume_state = state["resume_state"]
+        results = await asearch_role_info(
+            resume_state['organization'],
+            resume_state['position'],
+            self._role_query(resume_state),
+            k=self.k,
+        )
+        return {"context": self._format_search_results(results)}
+
+    def _semantic_cache_key(self, resume_state: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        # 다른 지원자의 초안이 재사용되지 않도록 문항과 지원자 프로필은 정확히 일치해야 하고,
+        # 회사/직무 정보만 유사도로 비교
+        current_question = next(
+            q for q in resume_state['questions']
+            if q['question_id'] == resume_state['current_question_id']
+        )
+        exact = json.dumps(
+            {
+                "question": {k: current_question.get(k) for k in ("content", "max_length", "min_length", "category")},
+                "user_profile": resume_state['user_profile'],
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        variable = "\n".join([
+            resume_state['organization'],
+            resume_state['position'],
+            resume_state['requirements'],
+            resume_state.get('description') or '',
+            resume_state.get('company_values') or '',
+        ])
+        return hashlib.sha256(exact.encode("utf-8")).hexdigest(), variable
+
     def _create_prompt(self, state: Dict[str, Any]) -> str:
         current_question = next(
             q for q in state['questions'] 
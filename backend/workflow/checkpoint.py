@@ -0,0 +1,303 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, List, Optional, Sequence, Set, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata, WRITES_IDX_MAP
+from langgraph.checkpoint.memory import InMemorySaver
+
+from backend.utils import db
+from backend.utils.config import settings
+from backend.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 한 트랜잭션으로 묶어 저장할 최대 작업 수
+_WRITE_BATCH = 256
+
+# (SQL, 파라미터 목록) 또는 종료 신호(None)
+_Operation = Optional[Tuple[str, List[Tuple[Any, ...]]]]
+
+_INSERT_CHECKPOINT = """INSERT OR REPLACE INTO graph_checkpoints
+    (thread_id, checkpoint_ns, checkpoint_id, parent_id, type, checkpoint, metadata_type, metadata, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+_INSERT_BLOB = """INSERT OR REPLACE INTO graph_checkpoint_blobs
+    (thread_id, checkpoint_ns, channel, version, type, blob)
+    VALUES (?, ?, ?, ?, ?, ?)"""
+_INSERT_WRITE = """INSERT OR REPLACE INTO graph_checkpoint_writes
+    (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value, task_path)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+_TABLES = ("graph_checkpoints", "graph_checkpoint_blobs", "graph_checkpoint_writes")
+
+
+class SQLiteCheckpointer(InMemorySaver):
+    """실행 중인 세션은 메모리에서 읽고, 체크포인트는 DB_PATH(SQLite)에 모아서 기록하는 체크포인터
+
+    thread_id는 요청의 session_id를 사용합니다. put/put_writes는 메모리에 반영한 뒤
+    저장 작업을 큐에 넣기만 하므로 노드 실행 경로에서 SQLite를 기다리지 않고,
+    백그라운드 스레드가 flush_interval 동안 쌓인 작업을 한 트랜잭션으로 기록합니다.
+    프로세스가 재시작된 뒤 같은 session_id로 재시도하면 restore()로 디스크의 체크포인트를
+    메모리로 불러와 마지막으로 완료된 노드 다음부터 이어서 실행합니다.
+    """
+
+    def __init__(self, path: Optional[str] = None, flush_interval: float = 0.05, ttl: float = 60 * 60 * 24):
+        super().__init__()
+        self.path = path
+        self.flush_interval = flush_interval
+        self.ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[_Operation]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        # 실행 중인 세션 (storage는 defaultdict라 조회만 해도 키가 생기므로 따로 관리)
+        self._active: Set[str] = set()
+        self._active_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        # 임포트 시점에 DB 파일이 생기지 않도록 처음 사용할 때 연결
+        if self._conn is None:
+            conn = db.connect(self.path)
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS graph_checkpoints (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL,
+                    checkpoint_id TEXT NOT NULL,
+                    parent_id TEXT,
+                    type TEXT NOT NULL,
+                    checkpoint BLOB NOT NULL,
+                    metadata_type TEXT NOT NULL,
+                    metadata BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+                ) WITHOUT ROWID"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS graph_checkpoint_blobs (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL,
+                    channel TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    blob BLOB NOT NULL,
+                    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+                ) WITHOUT ROWID"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS graph_checkpoint_writes (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL,
+                    checkpoint_id TEXT NOT NULL,
+                    task_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    channel TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    task_path TEXT NOT NULL,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+                ) WITHOUT ROWID"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_graph_checkpoints_created_at ON graph_checkpoints (created_at)")
+            self._conn = conn
+            self._prune(conn)
+        return self._conn
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """ttl보다 오래된 세션(재시도되지 않은 실패 실행)의 체크포인트를 삭제합니다."""
+        expired = conn.execute(
+            "SELECT DISTINCT thread_id FROM graph_checkpoints WHERE created_at < ?",
+            (time.time() - self.ttl,),
+        ).fetchall()
+        for (thread_id,) in expired:
+            for table in _TABLES:
+                conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+        if expired:
+            metrics.inc("checkpoint_threads_pruned_total", len(expired))
+
+    # 백그라운드 기록
+
+    def _enqueue(self, sql: str, rows: List[Tuple[Any, ...]]) -> None:
+        if not rows:
+            return
+        if self._writer is None or not self._writer.is_alive():
+            with self._lock:
+                if self._writer is None or not self._writer.is_alive():
+                    self._writer = threading.Thread(target=self._write_loop, name="checkpoint-writer", daemon=True)
+                    self._writer.start()
+        self._queue.put((sql, rows))
+
+    def _write_loop(self) -> None:
+        while True:
+            operation = self._queue.get()
+            if operation is None:
+                self._queue.task_done()
+                return
+            batch = [operation]
+            # flush_interval 동안 들어온 작업을 모아 한 번에 커밋
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < _WRITE_BATCH:
+                try:
+                    operation = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if operation is None:
+                    stop = True
+                    break
+                batch.append(operation)
+            self._write(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: List[Tuple[str, List[Tuple[Any, ...]]]]) -> None:
+        started_at = time.perf_counter()
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute("BEGIN")
+                try:
+                    for sql, rows in batch:
+                        conn.executemany(sql, rows)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            metrics.inc("checkpoint_flushes_total", result="ok")
+            metrics.inc("checkpoint_flush_operations_total", len(batch))
+            metrics.inc("checkpoint_flush_seconds_total", time.perf_counter() - started_at)
+        except Exception as e:
+            metrics.inc("checkpoint_flushes_total", result="error")
+            logger.error(f"Failed to flush {len(batch)} checkpoint operations: {str(e)}", exc_info=True)
+
+    def flush(self) -> None:
+        """큐에 쌓인 저장 작업이 모두 기록될 때까지 기다립니다."""
+        self._queue.join()
+
+    def close(self, timeout: float = 10.0) -> None:
+        """대기 중인 저장 작업을 모두 기록하고 백그라운드 스레드를 종료합니다. (애플리케이션 종료 시 호출)"""
+        writer = self._writer
+        if writer is None or not writer.is_alive():
+            return
+        self._queue.put(None)
+        writer.join(timeout)
+
+    # BaseCheckpointSaver
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        # 직렬화는 InMemorySaver가 한 번만 수행하고 같은 바이트를 디스크에 기록
+        blob_rows = [
+            (thread_id, checkpoint_ns, channel, str(version), *self.blobs[(thread_id, checkpoint_ns, channel, version)])
+            for channel, version in new_versions.items()
+        ]
+        (checkpoint_type, data), (metadata_type, metadata_data), parent_id = (
+            self.storage[thread_id][checkpoint_ns][checkpoint["id"]]
+        )
+        self._enqueue(_INSERT_BLOB, blob_rows)
+        self._enqueue(_INSERT_CHECKPOINT, [(
+            thread_id, checkpoint_ns, checkpoint["id"], parent_id,
+            checkpoint_type, data, metadata_type, metadata_data, time.time(),
+        )])
+        metrics.inc("checkpoint_puts_total")
+        return next_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        super().put_writes(config, writes, task_id, task_path)
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        stored = self.writes[(thread_id, checkpoint_ns, checkpoint_id)]
+        rows = []
+        for idx, (channel, _) in enumerate(writes):
+            idx = WRITES_IDX_MAP.get(channel, idx)
+            _, _, (value_type, value), _ = stored[(task_id, idx)]
+            rows.append((thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, value_type, value, task_path))
+        self._enqueue(_INSERT_WRITE, rows)
+
+    # 세션 관리
+
+    def start(self, thread_id: str) -> None:
+        """세션을 실행 중으로 표시합니다. (release/delete_thread로 해제)"""
+        with self._active_lock:
+            self._active.add(thread_id)
+
+    def is_active(self, thread_id: str) -> bool:
+        """세션이 실행 중인지 확인합니다."""
+        with self._active_lock:
+            return thread_id in self._active
+
+    def restore(self, thread_id: str) -> bool:
+        """디스크에 저장된 세션의 체크포인트를 메모리로 불러옵니다. 체크포인트가 있으면 True를 반환합니다."""
+        if self.storage.get(thread_id):
+            return True
+        self.flush()
+        with self._lock:
+            conn = self._connection()
+            checkpoints = conn.execute(
+                """SELECT checkpoint_ns, checkpoint_id, parent_id, type, checkpoint, metadata_type, metadata
+                    FROM graph_checkpoints WHERE thread_id = ?""",
+                (thread_id,),
+            ).fetchall()
+            if not checkpoints:
+                return False
+            blobs = conn.execute(
+                "SELECT checkpoint_ns, channel, version, type, blob FROM graph_checkpoint_blobs WHERE thread_id = ?",
+                (thread_id,),
+            ).fetchall()
+            writes = conn.execute(
+                """SELECT checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value, task_path
+                    FROM graph_checkpoint_writes WHERE thread_id = ?""",
+                (thread_id,),
+            ).fetchall()
+
+        for checkpoint_ns, checkpoint_id, parent_id, checkpoint_type, data, metadata_type, metadata_data in checkpoints:
+            self.storage[thread_id][checkpoint_ns][checkpoint_id] = (
+                (checkpoint_type, data), (metadata_type, metadata_data), parent_id,
+            )
+        for checkpoint_ns, channel, version, blob_type, blob in blobs:
+            self.blobs[(thread_id, checkpoint_ns, channel, version)] = (blob_type, blob)
+        for checkpoint_ns, checkpoint_id, task_id, idx, channel, value_type, value, task_path in writes:
+            self.writes[(thread_id, checkpoint_ns, checkpoint_id)][(task_id, idx)] = (
+                task_id, channel, (value_type, value), task_path,
+            )
+        metrics.inc("checkpoint_restores_total")
+        return True
+
+    def release(self, thread_id: str) -> None:
+        """세션의 체크포인트를 메모리에서만 제거합니다. (실패한 실행은 디스크에 남아 재시도 시 이어서 실행)"""
+        super().delete_thread(thread_id)
+        with self._active_lock:
+            self._active.discard(thread_id)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """세션의 체크포인트를 메모리와 디스크에서 모두 삭제합니다. (완료된 실행)"""
+        super().delete_thread(thread_id)
+        with self._active_lock:
+            self._active.discard(thread_id)
+        for table in _TABLES:
+            self._enqueue(f"DELETE FROM {table} WHERE thread_id = ?", [(thread_id,)])
+
+
+# 체크포인터 인스턴스 생성
+checkpointer = SQLiteCheckpointer(
+    flush_interval=settings.CHECKPOINT_FLUSH_INTERVAL,
+    ttl=settings.CHECKPOINT_TTL,
+)
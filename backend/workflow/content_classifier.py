@@ -0,0 +1,119 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.rag.keyword_extractor import tokenize
+from backend.workflow.state import EvaluationType
+
+# 기술 평가가 필요함을 나타내는 어휘
+_TECHNICAL_TERMS = {
+    "개발", "설계", "구현", "성능", "최적화", "아키텍처", "서버", "데이터", "배포", "테스트", "시스템",
+    "알고리즘", "인프라", "프레임워크", "트래픽", "장애", "자동화", "코드", "쿼리", "캐시", "모델",
+    "분석", "기술", "응답", "처리", "모니터링", "보안", "네트워크", "클라우드", "리팩토링", "라이브러리",
+    "인덱스", "병목", "지연", "동시성", "확장", "컨테이너", "파이프라인", "모듈", "버그", "디버깅",
+    "백엔드", "프론트엔드", "데이터베이스",
+    "api", "server", "backend", "frontend", "database", "sql", "nosql", "postgresql", "mysql", "mongodb",
+    "cache", "redis", "kafka", "docker", "kubernetes", "k8s", "aws", "gcp", "azure", "devops", "mlops",
+    "python", "java", "kotlin", "javascript", "typescript", "django", "fastapi", "linux", "git",
+    "algorithm", "architecture", "latency", "throughput", "pytorch", "tensorflow", "spark", "gpu", "cpu",
+    "tps", "qps", "msa", "grpc", "pipeline", "infra",
+}
+
+# 조직문화 평가가 필요함을 나타내는 어휘
+_CULTURE_TERMS = {
+    "협업", "소통", "커뮤니케이션", "가치", "문화", "성장", "도전", "책임", "팀원", "팀워크", "팀장", "리더",
+    "신뢰", "열정", "고객", "배려", "주도", "피드백", "혁신", "갈등", "동료", "공유", "존중", "봉사", "목표",
+    "노력", "배움", "태도", "공감", "설득", "역할", "조율", "의견", "동아리", "실패", "극복", "포기", "인내",
+    "비전", "신념", "좌우명", "가족", "포부", "진심",
+    "teamwork", "culture", "communication", "collaboration", "leadership", "values", "vision", "mission",
+    "passion", "trust", "feedback", "customer", "ownership", "respect", "empathy",
+}
+
+# 어휘 뒤에 붙어도 같은 단어로 보는 파생 접미사 (조사/어미는 tokenize에서 이미 제거)
+_DERIVATIONAL_SUFFIXES = ("적", "자", "가", "력", "성", "화", "한", "된", "할", "하기", "들")
+
+# 문항 유형/내용에서 평가 관점을 추정하는 단서
+# ("기술해주세요"처럼 '서술하다'라는 뜻의 기술은 제외)
+_TECHNICAL_QUESTION_HINTS = re.compile(r"직무|기술(?![해하])|역량|프로젝트|전문성|문제 해결")
+_CULTURE_QUESTION_HINTS = re.compile(r"성장|지원 ?동기|가치관|협업|갈등|포부|성격|장단점|인재상")
+
+_REQUIREMENT_WEIGHT = 1.5  # 요구사항/회사 가치에 등장한 어휘
+_QUESTION_WEIGHT = 2.0  # 문항 단서
+_MIN_EVIDENCE = 6.0  # 이보다 근거가 적으면 신뢰도를 비례해서 낮춤
+_MARGIN = 0.3  # 기술 비중이 0.5 ± _MARGIN을 넘으면 한쪽으로 판단
+
+
+def _terms(text: Optional[str]) -> List[str]:
+    return [token for sentence in tokenize(text or "") for token in sentence if token]
+
+
+def _matches(token: str, lexicon: Iterable[str]) -> bool:
+    """어휘 단위로 비교합니다. 영문은 소문자 완전 일치, 한글은 완전 일치 또는 어휘 + 파생 접미사일 때만 일치합니다.
+
+    (접두어 일치는 짧은 어휘가 관계없는 단어의 앞부분에 걸리는 오탐이 많아 사용하지 않음)
+    """
+    if re.match(r"[A-Za-z]", token):
+        return token.lower() in lexicon
+    if token in lexicon:
+        return True
+    return any(
+        token[:-len(suffix)] in lexicon
+        for suffix in _DERIVATIONAL_SUFFIXES
+        if token.endswith(suffix) and len(token) > len(suffix)
+    )
+
+
+def _score(
+    tokens: List[str],
+    requirement_terms: set,
+    value_terms: set,
+) -> Tuple[float, float]:
+    technical = culture = 0.0
+    for token in tokens:
+        if token in requirement_terms:
+            technical += _REQUIREMENT_WEIGHT
+        elif _matches(token, _TECHNICAL_TERMS):
+            technical += 1.0
+
+        if token in value_terms:
+            culture += _REQUIREMENT_WEIGHT
+        elif _matches(token, _CULTURE_TERMS):
+            culture += 1.0
+    return technical, culture
+
+
+def classify_content(
+    question: Dict[str, Any],
+    draft: str,
+    requirements: Optional[str],
+    company_values: Optional[str],
+) -> Tuple[str, float, Dict[str, float]]:
+    """LLM 없이 답변의 평가 유형(technical/culture/both)과 신뢰도(0~1)를 추정합니다.
+
+    답변을 요구사항/회사 가치 어휘와 기술·조직문화 어휘집에 대조해 두 관점의 근거 점수를 구하고,
+    기술 비중이 한쪽으로 치우치면 해당 유형, 비슷하면 both로 판단합니다.
+    근거가 적을수록 신뢰도가 낮아지므로 호출 측은 신뢰도가 낮을 때 LLM으로 넘깁니다.
+    """
+    requirement_terms = {t for t in _terms(requirements) if len(t) >= 2}
+    value_terms = {t for t in _terms(company_values) if len(t) >= 2}
+    technical, culture = _score(_terms(draft), requirement_terms, value_terms)
+
+    question_text = f"{question.get('category') or ''} {question.get('content') or ''}"
+    if _TECHNICAL_QUESTION_HINTS.search(question_text):
+        technical += _QUESTION_WEIGHT
+    if _CULTURE_QUESTION_HINTS.search(question_text):
+        culture += _QUESTION_WEIGHT
+
+    evidence = technical + culture
+    scores = {"technical": technical, "culture": culture}
+    if evidence == 0:
+        return EvaluationType.BOTH.value, 0.0, scores
+
+    share = technical / evidence
+    memberships = {
+        EvaluationType.TECHNICAL.value: min(max((share - 0.5) / _MARGIN, 0.0), 1.0),
+        EvaluationType.CULTURE.value: min(max((0.5 - share) / _MARGIN, 0.0), 1.0),
+        EvaluationType.BOTH.value: max(1.0 - abs(share - 0.5) / _MARGIN, 0.0),
+    }
+    label = max(memberships, key=memberships.get)
+    confidence = memberships[label] * min(evidence / _MIN_EVIDENCE, 1.0)
+    return label, round(confidence, 4), scores
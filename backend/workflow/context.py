@@ -0,0 +1,48 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+from backend.utils.tokens import count_tokens, truncate_to_tokens
+
+# 남은 예산이 이보다 적으면 메시지를 잘라 넣지 않고 제외
+_MIN_PARTIAL_TOKENS = 64
+
+
+def message_tokens(message: Dict[str, Any]) -> int:
+    return count_tokens(f"{message['role']}: {message['content']}")
+
+
+def select_history(
+    messages: Sequence[Dict[str, Any]],
+    question_id: Optional[int],
+    sources: Sequence[str],
+    budget: int,
+    prompt: str = "",
+) -> List[Dict[str, Any]]:
+    """에이전트가 선언한 이전 단계 출력 중 예산 안에 들어가는 메시지만 골라냅니다.
+
+    - 현재 문항(question_id)의 메시지 중 역할이 sources에 포함된 것만 사용
+    - 본문이 이미 프롬프트에 포함된 메시지는 중복이므로 제외
+    - 최신 메시지부터 예산을 채우고, 남은 예산이 부족하면 잘라 넣거나 제외
+    """
+    candidates = [
+        message for message in messages
+        if message["role"] in sources
+        and message.get("question_id", question_id) == question_id
+        and message["content"] not in prompt
+    ]
+
+    selected: List[Dict[str, Any]] = []
+    remaining = budget
+    for message in reversed(candidates):
+        tokens = message_tokens(message)
+        if tokens <= remaining:
+            selected.append(message)
+            remaining -= tokens
+        elif remaining >= _MIN_PARTIAL_TOKENS:
+            overhead = tokens - count_tokens(message["content"])
+            selected.append({
+                **message,
+                "content": truncate_to_tokens(message["content"], remaining - overhead),
+            })
+            remaining = 0
+    selected.reverse()
+    return selected
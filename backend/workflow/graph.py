@@ -1,44 +1,70 @@
-from typing import Optional
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.runnables.config import merge_configs
 from backend.workflow.agents.resume_agent import ResumeWritingAgent
 from backend.workflow.agents.evaluation_agents import TechnicalEvaluator, CultureEvaluator, FinalReviewer
 from backend.workflow.state import ResumeState, AgentType
-from langgraph.graph import StateGraph, END
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.graph import StateGraph, START, END
+from langgraph.graph.state import CompiledStateGraph
+from langgraph.types import Send
 from backend.workflow.agents.content_analyzer import ContentAnalyzer
+from backend.utils.config import settings
+from backend.utils.metrics import metrics
+from backend.utils.tracing import trace_callbacks
+from backend.workflow.checkpoint import checkpointer
 
-def create_resume_graph(enable_rag: bool = True, session_id: str = None) -> StateGraph:
+# 문항별 서브그래프를 실행하는 최상위 노드
+QUESTION_PROCESSOR = "QUESTION_PROCESSOR"
+
+# 문항별로 결과가 쌓이는 상태 키
+PER_QUESTION_KEYS = (
+    "drafts",
+    "evaluation_types",
+    "technical_feedbacks",
+    "culture_feedbacks",
+    "final_drafts",
+)
+
+# (enable_rag, k) 별로 컴파일된 그래프를 프로세스 단위로 보관
+_graph_registry: Dict[Tuple[bool, int], CompiledStateGraph] = {}
+_registry_lock = threading.Lock()
+
+def _resolve_k(enable_rag: bool, k: Optional[int]) -> int:
+    if k is not None:
+        return k
+    return 2 if enable_rag else 0
+
+def create_question_graph(k_value: int) -> CompiledStateGraph:
+    """한 문항(current_question_id)에 대한 작성-분석-평가-검토 서브그래프를 생성합니다."""
     workflow = StateGraph(ResumeState)
     
     # 에이전트 인스턴스 생성
-    k_value = 2 if enable_rag else 0
-    resume_writer = ResumeWritingAgent(k=k_value, session_id=session_id)
-    content_analyzer = ContentAnalyzer(k=k_value, session_id=session_id)
-    tech_evaluator = TechnicalEvaluator(k=k_value, session_id=session_id)
-    culture_evaluator = CultureEvaluator(k=k_value, session_id=session_id)
-    final_reviewer = FinalReviewer(k=k_value, session_id=session_id)
+    resume_writer = ResumeWritingAgent(k=k_value)
+    content_analyzer = ContentAnalyzer(k=k_value)
+    tech_evaluator = TechnicalEvaluator(k=k_value)
+    culture_evaluator = CultureEvaluator(k=k_value)
+    final_reviewer = FinalReviewer(k=k_value)
     
     # 노드 추가
-    workflow.add_node(AgentType.RESUME_WRITER, resume_writer.run)
-    workflow.add_node(AgentType.CONTENT_ANALYZER, content_analyzer.run)
-    workflow.add_node(AgentType.TECHNICAL_EVALUATOR, tech_evaluator.run)
-    workflow.add_node(AgentType.CULTURE_EVALUATOR, culture_evaluator.run)
-    workflow.add_node(AgentType.FINAL_REVIEWER, final_reviewer.run)
+    workflow.add_node(AgentType.RESUME_WRITER, resume_writer.as_node())
+    workflow.add_node(AgentType.CONTENT_ANALYZER, content_analyzer.as_node())
+    workflow.add_node(AgentType.TECHNICAL_EVALUATOR, tech_evaluator.as_node())
+    workflow.add_node(AgentType.CULTURE_EVALUATOR, culture_evaluator.as_node())
+    workflow.add_node(AgentType.FINAL_REVIEWER, final_reviewer.as_node())
     
-    # 분석 결과에 따른 라우팅
+    # 분석 결과에 따른 라우팅 (both인 경우 두 평가자를 동시에 실행)
     def route_after_analysis(state: ResumeState):
         evaluation_type = state["evaluation_types"].get(state["current_question_id"])
         
         if evaluation_type == "both":
-            return AgentType.TECHNICAL_EVALUATOR
+            return [AgentType.TECHNICAL_EVALUATOR, AgentType.CULTURE_EVALUATOR]
         elif evaluation_type == "technical":
             return AgentType.TECHNICAL_EVALUATOR
         else:  # "culture"
             return AgentType.CULTURE_EVALUATOR
-            
-    def route_after_tech(state: ResumeState):
-        evaluation_type = state["evaluation_types"].get(state["current_question_id"])
-        if evaluation_type == "both":
-            return AgentType.CULTURE_EVALUATOR
-        return AgentType.FINAL_REVIEWER
     
     # 워크플로우 엣지 설정
     # 초안 작성 -> 컨텐츠 분석
@@ -51,14 +77,8 @@ def create_resume_graph(enable_rag: bool = True, session_id: str = None) -> Stat
         [AgentType.TECHNICAL_EVALUATOR, AgentType.CULTURE_EVALUATOR]
     )
     
-    # 기술 평가 후 문화 평가 또는 최종 검토로
-    workflow.add_conditional_edges(
-        AgentType.TECHNICAL_EVALUATOR,
-        route_after_tech,
-        [AgentType.CULTURE_EVALUATOR, AgentType.FINAL_REVIEWER]
-    )
-    
-    # 문화 평가 -> 최종 검토
+    # 평가 -> 최종 검토 (병렬 실행 시 두 평가가 같은 스텝에 끝나므로 한 번만 실행됨)
+    workflow.add_edge(AgentType.TECHNICAL_EVALUATOR, AgentType.FINAL_REVIEWER)
     workflow.add_edge(AgentType.CULTURE_EVALUATOR, AgentType.FINAL_REVIEWER)
     
     # 최종 검토 -> 종료
@@ -67,8 +87,178 @@ def create_resume_graph(enable_rag: bool = True, session_id: str = None) -> Stat
     # 시작점 설정
     workflow.set_entry_point(AgentType.RESUME_WRITER)
     
+    # 체크포인터는 상위 그래프의 것을 이어받아 문항별로 완료된 에이전트 노드까지 기록
     return workflow.compile()
 
+def _question_result(result: Dict[str, Any], question_id: int) -> Dict[str, Any]:
+    """서브그래프 결과에서 해당 문항의 변경분만 추려 상위 그래프에 반환합니다.
+
+    current_step(마지막으로 실행된 에이전트)도 함께 반환해 take_last로 합쳐지도록 합니다.
+    """
+    updates: Dict[str, Any] = {"messages": result.get("messages", [])}
+    if result.get("current_step"):
+        updates["current_step"] = result["current_step"]
+    for key in PER_QUESTION_KEYS:
+        if question_id in result.get(key, {}):
+            updates[key] = {question_id: result[key][question_id]}
+    return updates
+
+def _question_config(config: RunnableConfig, question_id: int) -> RunnableConfig:
+    """스트리밍 이벤트를 문항별로 구분할 수 있도록 metadata에 문항 ID를 추가합니다."""
+    return merge_configs(config, {"metadata": {"question_id": question_id}})
+
+def fan_out_questions(state: ResumeState) -> List[Send]:
+    """문항마다 독립된 서브그래프 실행을 생성합니다."""
+    return [
+        Send(QUESTION_PROCESSOR, {
+            **state,
+            "current_question_id": question["question_id"],
+            "messages": [],
+        })
+        for question in state["questions"]
+    ]
+
+def create_resume_graph(
+    enable_rag: bool = True,
+    k: Optional[int] = None,
+    checkpointer: Optional[BaseCheckpointSaver] = None,
+) -> CompiledStateGraph:
+    """자소서 워크플로우 그래프를 새로 생성하고 컴파일합니다.
+
+    모든 문항을 문항별 서브그래프로 동시에 처리하며, 동시 실행 문항 수는
+    max_concurrency(기본값 settings.MAX_CONCURRENT_QUESTIONS)로 제한합니다.
+    요청 처리 경로에서는 캐시된 그래프를 반환하는 get_resume_graph를 사용하세요.
+    session_id 등 요청별 데이터는 실행 시 config["configurable"]로 전달합니다.
+    checkpointer를 지정하면 session_id(thread_id)별로 완료된 노드를 기록합니다.
+    """
+    question_graph = create_question_graph(_resolve_k(enable_rag, k))
+
+    def process_question(state: ResumeState, config: RunnableConfig) -> Dict[str, Any]:
+        result = question_graph.invoke(state, _question_config(config, state["current_question_id"]))
+        return _question_result(result, state["current_question_id"])
+
+    async def aprocess_question(state: ResumeState, config: RunnableConfig) -> Dict[str, Any]:
+        result = await question_graph.ainvoke(state, _question_config(config, state["current_question_id"]))
+        return _question_result(result, state["current_question_id"])
+
+    workflow = StateGraph(ResumeState)
+    workflow.add_node(
+        QUESTION_PROCESSOR,
+        RunnableLambda(process_question, afunc=aprocess_question),
+    )
+    workflow.add_conditional_edges(START, fan_out_questions, [QUESTION_PROCESSOR])
+    workflow.add_edge(QUESTION_PROCESSOR, END)
+
+    return workflow.compile(checkpointer=checkpointer).with_config(
+        max_concurrency=settings.MAX_CONCURRENT_QUESTIONS
+    )
+
+def get_resume_graph(enable_rag: bool = True, k: Optional[int] = None) -> CompiledStateGraph:
+    """(enable_rag, k) 조합별로 한 번만 컴파일된 그래프를 반환합니다. (SQLite 체크포인터 사용)"""
+    key = (enable_rag, _resolve_k(enable_rag, k))
+    graph = _graph_registry.get(key)
+    if graph is not None:
+        return graph
+
+    with _registry_lock:
+        graph = _graph_registry.get(key)
+        if graph is None:
+            graph = create_resume_graph(*key, checkpointer=checkpointer if settings.CHECKPOINT_ENABLED else None)
+            _graph_registry[key] = graph
+    return graph
+
+def request_config(session_id: str) -> RunnableConfig:
+    """요청별 실행 config를 만듭니다. (세션 ID, 설정된 경우 Langfuse 트레이싱 콜백)
+
+    체크포인트도 session_id를 thread_id로 사용해 기록합니다.
+    """
+    return {
+        "configurable": {"session_id": session_id, "thread_id": session_id},
+        "callbacks": trace_callbacks(session_id),
+    }
+
+def is_running(session_id: str) -> bool:
+    """같은 session_id로 실행 중인 그래프가 있는지 확인합니다."""
+    return settings.CHECKPOINT_ENABLED and checkpointer.is_active(session_id)
+
+async def prepare_input(session_id: str, initial_state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """그래프 입력을 반환합니다.
+
+    이전에 실패한 같은 session_id의 체크포인트가 있으면 None을 반환해
+    마지막으로 완료된 노드 다음부터 이어서 실행하고, 없으면 초기 상태를 그대로 반환합니다.
+    세션은 finish_run까지 실행 중(is_running)으로 표시됩니다.
+    """
+    if not settings.CHECKPOINT_ENABLED:
+        return initial_state
+    checkpointer.start(session_id)
+    if await asyncio.to_thread(checkpointer.restore, session_id):
+        metrics.inc("graph_runs_resumed_total")
+        return None
+    return initial_state
+
+def finish_run(session_id: str, completed: bool) -> None:
+    """실행이 끝난 세션의 체크포인트를 정리합니다.
+
+    완료된 실행은 체크포인트를 삭제하고, 실패한 실행은 같은 session_id로 재시도할 수 있도록
+    디스크에만 남기고 메모리에서 제거합니다.
+    """
+    if not settings.CHECKPOINT_ENABLED:
+        return
+    if completed:
+        checkpointer.delete_thread(session_id)
+    else:
+        checkpointer.release(session_id)
+
+# 진행 상황 이벤트로 보고하는 에이전트 노드
+_AGENT_NODES = {agent.value for agent in AgentType}
+
+async def astream_progress(
+    graph: CompiledStateGraph,
+    initial_state: Dict[str, Any],
+    config: RunnableConfig,
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """그래프 실행 이벤트를 (이벤트명, 데이터) 형태의 진행 상황으로 변환합니다.
+
+    - node_start / node_end: 문항별 에이전트 노드 시작/종료 (node_end에는 해당 노드의 변경분 포함)
+    - token: 에이전트 LLM 응답 토큰 (검색어 개선 등 내부 LLM 호출은 제외)
+    - result: 최종 상태 (마지막에 한 번)
+    """
+    final_state: Dict[str, Any] = {}
+    async for event in graph.astream_events(initial_state, config, version="v2"):
+        kind = event["event"]
+        metadata = event.get("metadata", {})
+        question_id = metadata.get("question_id")
+
+        if kind in ("on_chain_start", "on_chain_end") and event["name"] in _AGENT_NODES:
+            node = AgentType(event["name"]).value
+            if kind == "on_chain_start":
+                yield "node_start", {"node": node, "question_id": question_id}
+            else:
+                yield "node_end", {
+                    "node": node,
+                    "question_id": question_id,
+                    "output": event["data"].get("output") or {},
+                }
+
+        elif kind == "on_chat_model_stream" and metadata.get("langgraph_node") == "generate_response":
+            token = event["data"]["chunk"].content
+            if token:
+                yield "token", {
+                    "node": metadata.get("agent"),
+                    "question_id": question_id,
+                    "token": token,
+                }
+
+        # 최상위 그래프 종료 이벤트에 최종 상태가 담김
+        elif kind == "on_chain_end" and not event.get("parent_ids"):
+            final_state = event["data"].get("output") or {}
+
+    yield "result", final_state
+
+def warm_graph_registry() -> None:
+    """서버 시작 시 기본 그래프를 미리 컴파일해 첫 요청의 지연을 없앱니다."""
+    get_resume_graph(enable_rag=True)
+
 if __name__ == "__main__":
     graph = create_resume_graph(True)
     graph_image = graph.get_graph().draw_mermaid_png()
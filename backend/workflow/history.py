@@ -0,0 +1,301 @@
+import base64
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.utils import db
+from backend.utils.config import settings
+from backend.utils.metrics import metrics
+from backend.workflow.graph import PER_QUESTION_KEYS
+
+logger = logging.getLogger(__name__)
+
+# 상세 조회에서 선택할 수 있는 섹션 (messages는 문항 구분 없이 하나로 저장)
+SECTIONS = PER_QUESTION_KEYS + ("messages",)
+DEFAULT_SECTIONS = PER_QUESTION_KEYS
+
+# 목록 조회 시 한 번에 반환하는 최대 행 수
+MAX_PAGE_SIZE = 100
+
+# 한 트랜잭션으로 묶어 저장할 최대 실행 수
+_WRITE_BATCH = 32
+
+
+def encode_cursor(created_at: float, history_id: int) -> str:
+    """(created_at, id)를 다음 페이지 조회용 불투명 커서로 만듭니다."""
+    raw = json.dumps([created_at, history_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """커서를 (created_at, id)로 되돌립니다. 형식이 잘못되면 ValueError를 발생시킵니다."""
+    try:
+        created_at, history_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(created_at), int(history_id)
+    except Exception as e:
+        raise ValueError(f"잘못된 커서: {cursor}") from e
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).isoformat(timespec="seconds")
+
+
+class HistoryStore:
+    """완료된 자소서 생성 결과를 SQLite(DB_PATH)에 보관하는 저장소
+
+    - resume_histories: 목록에 필요한 요약 정보와 요청 내용 (created_at, organization 인덱스)
+    - resume_history_sections: 섹션(drafts, final_drafts 등)별 문항 결과를 행 단위로 저장해
+      상세 조회 시 필요한 섹션만 읽습니다.
+
+    저장은 요청 처리 경로를 막지 않도록 submit()으로 큐에 넣고 백그라운드 스레드가 모아서 기록합니다.
+    """
+
+    def __init__(self, path: Optional[str] = None, queue_size: int = 256):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Tuple[str, Dict[str, Any], Dict[str, Any], float]]]" = queue.Queue(queue_size)
+        self._writer: Optional[threading.Thread] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # 임포트 시점에 DB 파일이 생기지 않도록 처음 사용할 때 연결
+        if self._conn is None:
+            conn = db.connect(self.path)
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS resume_histories (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT NOT NULL UNIQUE,
+                    organization TEXT NOT NULL,
+                    position TEXT NOT NULL,
+                    question_count INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    request TEXT NOT NULL
+                )"""
+            )
+            # 인덱스에 rowid(id)가 포함되므로 (created_at, id) 키셋 정렬을 그대로 지원
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_resume_histories_created_at ON resume_histories (created_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_resume_histories_organization "
+                "ON resume_histories (organization, created_at)"
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS resume_history_sections (
+                    history_id INTEGER NOT NULL,
+                    section TEXT NOT NULL,
+                    question_id INTEGER NOT NULL,
+                    content TEXT NOT NULL,
+                    PRIMARY KEY (history_id, section, question_id)
+                ) WITHOUT ROWID"""
+            )
+            self._conn = conn
+        return self._conn
+
+    # 저장
+
+    def submit(self, session_id: str, initial_state: Dict[str, Any], final_state: Dict[str, Any]) -> None:
+        """완료된 실행 결과를 저장 대기열에 넣습니다. 대기열이 가득 차면 기록하지 않고 버립니다."""
+        if not settings.HISTORY_ENABLED:
+            return
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait((session_id, initial_state, final_state, time.time()))
+        except queue.Full:
+            metrics.inc("history_writes_total", result="dropped")
+            logger.warning(f"History queue is full, dropping result (session_id={session_id})")
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            # 대기 중인 결과를 한 트랜잭션으로 묶어 저장
+            while len(batch) < _WRITE_BATCH:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._write(batch)
+                    return
+                batch.append(item)
+            self._write(batch)
+
+    def _write(self, batch: List[Tuple[str, Dict[str, Any], Dict[str, Any], float]]) -> None:
+        started_at = time.perf_counter()
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute("BEGIN")
+                try:
+                    for session_id, initial_state, final_state, created_at in batch:
+                        self._insert(conn, session_id, initial_state, final_state, created_at)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            metrics.inc("history_writes_total", len(batch), result="ok")
+            metrics.inc("history_write_seconds_total", time.perf_counter() - started_at)
+        except Exception as e:
+            metrics.inc("history_writes_total", len(batch), result="error")
+            logger.error(f"Failed to save {len(batch)} history rows: {str(e)}", exc_info=True)
+
+    @staticmethod
+    def _insert(
+        conn: sqlite3.Connection,
+        session_id: str,
+        initial_state: Dict[str, Any],
+        final_state: Dict[str, Any],
+        created_at: float,
+    ) -> None:
+        request = {
+            key: initial_state.get(key)
+            for key in ("requirements", "description", "company_values", "user_profile", "questions")
+        }
+        cursor = conn.execute(
+            """INSERT OR IGNORE INTO resume_histories
+                (session_id, organization, position, question_count, created_at, request)
+                VALUES (?, ?, ?, ?, ?, ?)""",
+            (
+                session_id,
+                initial_state.get("organization", ""),
+                initial_state.get("position", ""),
+                len(initial_state.get("questions", [])),
+                created_at,
+                json.dumps(request, ensure_ascii=False),
+            ),
+        )
+        if cursor.rowcount == 0:  # 이미 저장된 세션
+            return
+        history_id = cursor.lastrowid
+        rows = [
+            (history_id, section, int(question_id), content)
+            for section in PER_QUESTION_KEYS
+            for question_id, content in (final_state.get(section) or {}).items()
+        ]
+        rows.append((history_id, "messages", 0, json.dumps(final_state.get("messages", []), ensure_ascii=False)))
+        conn.executemany(
+            "INSERT INTO resume_history_sections (history_id, section, question_id, content) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+
+    def close(self, timeout: float = 10.0) -> None:
+        """대기 중인 결과를 모두 기록하고 백그라운드 스레드를 종료합니다. (애플리케이션 종료 시 호출)"""
+        writer = self._writer
+        if writer is None or not writer.is_alive():
+            return
+        self._queue.put(None)
+        writer.join(timeout)
+
+    # 조회
+
+    def list(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        organization: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """최신순 목록을 반환합니다. next_cursor를 다음 호출의 cursor로 넘기면 이어서 조회합니다."""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        conditions, params = [], []
+        if organization:
+            conditions.append("organization = ?")
+            params.append(organization)
+        if cursor:
+            conditions.append("(created_at, id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            rows = self._connection().execute(
+                f"""SELECT id, session_id, organization, position, question_count, created_at
+                    FROM resume_histories {where}
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT ?""",
+                (*params, limit + 1),
+            ).fetchall()
+
+        items = [
+            {
+                "id": history_id,
+                "session_id": session_id,
+                "organization": org,
+                "position": position,
+                "question_count": question_count,
+                "created_at": _isoformat(created_at),
+            }
+            for history_id, session_id, org, position, question_count, created_at in rows[:limit]
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor(last[5], last[0])
+        return {"items": items, "next_cursor": next_cursor}
+
+    def get(self, history_id: int, sections: Iterable[str] = DEFAULT_SECTIONS) -> Optional[Dict[str, Any]]:
+        """기본 정보와 요청한 섹션만 읽어 반환합니다. 없으면 None을 반환합니다."""
+        sections = [section for section in dict.fromkeys(sections) if section in SECTIONS]
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                """SELECT session_id, organization, position, created_at, request
+                    FROM resume_histories WHERE id = ?""",
+                (history_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            section_rows = conn.execute(
+                f"""SELECT section, question_id, content FROM resume_history_sections
+                    WHERE history_id = ? AND section IN ({','.join('?' * len(sections))})""",
+                (history_id, *sections),
+            ).fetchall() if sections else []
+
+        session_id, organization, position, created_at, request = row
+        detail: Dict[str, Any] = {
+            "id": history_id,
+            "session_id": session_id,
+            "organization": organization,
+            "position": position,
+            "created_at": _isoformat(created_at),
+            **json.loads(request),
+            **{section: {} for section in sections},
+        }
+        for section, question_id, content in section_rows:
+            if section == "messages":
+                detail["messages"] = json.loads(content)
+            else:
+                detail[section][str(question_id)] = content
+        return detail
+
+    def delete(self, history_id: int) -> bool:
+        """히스토리를 삭제하고 삭제 여부를 반환합니다."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN")
+            try:
+                conn.execute("DELETE FROM resume_history_sections WHERE history_id = ?", (history_id,))
+                deleted = conn.execute("DELETE FROM resume_histories WHERE id = ?", (history_id,)).rowcount
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return deleted > 0
+
+
+# 히스토리 저장소 인스턴스 생성
+history_store = HistoryStore(queue_size=settings.HISTORY_QUEUE_SIZE)
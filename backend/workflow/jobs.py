@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import time
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from backend.rag.session_store import end_session
+from backend.utils.config import settings
+from backend.utils.metrics import metrics
+from backend.utils.tracing import start_trace
+from backend.workflow.graph import (
+    PER_QUESTION_KEYS,
+    astream_progress,
+    finish_run,
+    get_resume_graph,
+    prepare_input,
+    request_config,
+)
+from backend.workflow.history import history_store
+from backend.workflow.state import AgentType, merge_dicts
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class Job:
+    """백그라운드로 실행되는 자소서 생성 작업과 진행 상황"""
+
+    def __init__(self, session_id: str, initial_state: Dict[str, Any]):
+        self.session_id = session_id
+        self.initial_state = initial_state
+        self.status = JobStatus.QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # 문항별로 현재 실행 중인 노드 (평가 단계는 두 노드가 동시에 실행될 수 있음)
+        self.current_nodes: Dict[int, List[str]] = {}
+        self.completed_questions: List[int] = []
+        # 지금까지 완료된 노드의 문항별 결과 (drafts, final_drafts 등)
+        self.outputs: Dict[str, Dict[Any, Any]] = {key: {} for key in PER_QUESTION_KEYS}
+        self.messages: List[Dict[str, Any]] = []
+        self.error: Optional[str] = None
+        # 단계별 소요 시간, LLM 토큰/비용 (작업 종료 시 기록)
+        self.metrics: Optional[Dict[str, Any]] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.COMPLETED, JobStatus.FAILED)
+
+    def on_node_start(self, node: str, question_id: int) -> None:
+        self.current_nodes.setdefault(question_id, []).append(node)
+
+    def on_node_end(self, node: str, question_id: int, output: Dict[str, Any]) -> None:
+        running = self.current_nodes.get(question_id, [])
+        if node in running:
+            running.remove(node)
+        if not running:
+            self.current_nodes.pop(question_id, None)
+
+        for key in PER_QUESTION_KEYS:
+            if key in output:
+                self.outputs[key] = merge_dicts(self.outputs[key], output[key])
+        self.messages.extend(output.get("messages", []))
+
+        if node == AgentType.FINAL_REVIEWER:
+            self.completed_questions.append(question_id)
+
+    def on_result(self, final_state: Dict[str, Any]) -> None:
+        for key in PER_QUESTION_KEYS:
+            self.outputs[key] = final_state.get(key, {})
+        self.messages = final_state.get("messages", [])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """/status 응답 형식으로 변환합니다."""
+        finished_or_now = self.finished_at or time.time()
+        return {
+            "session_id": self.session_id,
+            "status": self.status.value,
+            "current_nodes": {str(qid): nodes for qid, nodes in self.current_nodes.items()},
+            "completed_questions": list(self.completed_questions),
+            "total_questions": len(self.initial_state.get("questions", [])),
+            **self.outputs,
+            "messages": self.messages,
+            "error": self.error,
+            "metrics": self.metrics,
+            "queued_seconds": (self.started_at or finished_or_now) - self.created_at,
+            "elapsed_seconds": finished_or_now - self.started_at if self.started_at else 0.0,
+        }
+
+
+class JobQueue:
+    """제한된 크기의 대기열과 워커 풀로 자소서 생성 그래프를 백그라운드에서 실행합니다.
+
+    대기열이 가득 차면 submit이 asyncio.QueueFull을 발생시키므로 호출 측에서 429로 응답합니다.
+    완료된 작업은 result_ttl초 동안 보관되어 /status로 조회할 수 있습니다.
+    """
+
+    def __init__(self, workers: int, max_size: int, result_ttl: float):
+        self.workers = max(workers, 1)
+        self.max_size = max_size
+        self.result_ttl = result_ttl
+        self._jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """이벤트 루프 위에서 워커들을 시작합니다. (서버 시작 시 호출)"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """실행 중인 워커를 취소합니다. (서버 종료 시 호출)"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def submit(self, session_id: str, initial_state: Dict[str, Any]) -> Job:
+        if self._queue is None:
+            raise RuntimeError("작업 큐가 시작되지 않았습니다.")
+        self._prune()
+
+        job = Job(session_id, initial_state)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            metrics.inc("jobs_rejected_total")
+            raise
+        self._jobs[session_id] = job
+        metrics.inc("jobs_submitted_total")
+        return job
+
+    def get(self, session_id: str) -> Optional[Job]:
+        return self._jobs.get(session_id)
+
+    def queue_size(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _prune(self) -> None:
+        deadline = time.time() - self.result_ttl
+        expired = [
+            sid for sid, job in self._jobs.items()
+            if job.finished and job.finished_at < deadline
+        ]
+        for session_id in expired:
+            del self._jobs[session_id]
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        config = request_config(job.session_id)
+        logger.info(f"Job started (session_id={job.session_id})")
+
+        with start_trace() as trace:
+            try:
+                await self._execute(job, config)
+            finally:
+                job.metrics = trace.to_dict()
+
+    async def _execute(self, job: Job, config: Dict[str, Any]) -> None:
+        try:
+            # 같은 session_id로 재시도한 작업이면 체크포인트에서 이어서 실행
+            graph_input = await prepare_input(job.session_id, job.initial_state)
+            async for name, data in astream_progress(get_resume_graph(), graph_input, config):
+                if name == "node_start":
+                    job.on_node_start(data["node"], data["question_id"])
+                elif name == "node_end":
+                    job.on_node_end(data["node"], data["question_id"], data["output"])
+                elif name == "result":
+                    job.on_result(data)
+                    history_store.submit(job.session_id, job.initial_state, data)
+            job.status = JobStatus.COMPLETED
+            metrics.inc("jobs_completed_total")
+        except asyncio.CancelledError:
+            job.status = JobStatus.FAILED
+            job.error = "서버 종료로 작업이 취소되었습니다."
+            raise
+        except Exception as e:
+            logger.error(f"Job failed (session_id={job.session_id}): {str(e)}", exc_info=True)
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+            metrics.inc("jobs_failed_total")
+        finally:
+            job.finished_at = time.time()
+            job.current_nodes.clear()
+            # 세션 검색 코퍼스 해제, 실패한 경우 재시도를 위해 체크포인트 보관
+            end_session(job.session_id)
+            finish_run(job.session_id, job.status == JobStatus.COMPLETED)
+            logger.info(
+                f"Job {job.status.value} in {job.finished_at - job.started_at:.1f}s "
+                f"(session_id={job.session_id})"
+            )
+
+
+# 작업 큐 인스턴스 생성
+job_queue = JobQueue(
+    workers=settings.JOB_WORKERS,
+    max_size=settings.JOB_QUEUE_SIZE,
+    result_ttl=settings.JOB_RESULT_TTL,
+)
@@ -1,4 +1,5 @@
-from typing import Dict, List, Optional, Any
+import operator
+from typing import Annotated, Dict, List, Optional, Any
 from typing_extensions import TypedDict
 from enum import Enum
 
@@ -36,7 +37,20 @@ class ResumeQuestion(TypedDict):
     min_length: Optional[int]  # 최소 글자수
     category: Optional[str]  # 질문 카테고리 (직무역량, 성장과정, 지원동기 등)
 
+def merge_dicts(left: Dict[Any, Any], right: Dict[Any, Any]) -> Dict[Any, Any]:
+    """병렬 브랜치가 같은 키(문항별 dict)에 쓴 결과를 병합하는 리듀서"""
+    return {**(left or {}), **(right or {})}
+
+def take_last(left: Any, right: Any) -> Any:
+    """같은 스텝에 여러 값이 들어와도 마지막 값을 사용하는 리듀서"""
+    return right
+
 class ResumeState(TypedDict):
+    """자소서 워크플로우 상태
+
+    노드는 상태를 복사하거나 직접 수정하지 않고 변경분(delta)만 반환하며,
+    Annotated 리듀서가 문항별 dict와 messages에 변경분을 병합합니다.
+    """
     organization: str
     position: str
     requirements: str
@@ -45,42 +59,11 @@ class ResumeState(TypedDict):
     user_profile: Dict[str, str]
     questions: List[Dict[str, Any]]
     current_question_id: int
-    messages: List[Dict[str, str]]
-    drafts: Dict[int, str]
-    evaluation_types: Dict[int, str]  # ContentAnalyzer의 결과를 저장
-    technical_feedbacks: Dict[int, str]
-    culture_feedbacks: Dict[int, str]
-    final_drafts: Dict[int, str]
-    current_step: str
-
-    def __init__(
-        self,
-        organization: str,
-        position: str,
-        requirements: str,
-        description: str,
-        company_values: Optional[str],
-        user_profile: Dict[str, str],
-        questions: List[Dict[str, Any]]
-    ):
-        self.state = {
-            "organization": organization,
-            "position": position,
-            "requirements": requirements,
-            "description": description,
-            "company_values": company_values,
-            "user_profile": user_profile,
-            "messages": [],
-            "current_step": "START",
-            "questions": questions,
-            "current_question_id": questions[0]["question_id"] if questions else None,
-            "drafts": {},
-            "evaluation_types": {},
-            "technical_feedbacks": {},
-            "culture_feedbacks": {},
-            "final_drafts": {},
-            "docs": {}
-        }
-    
-    def update(self, updates: Dict[str, Any]) -> None:
-        self.state.update(updates) 
\ No newline at end of file
+    # 문항/평가 브랜치가 병렬로 실행되므로 리듀서로 각 브랜치의 결과를 병합
+    messages: Annotated[List[Dict[str, str]], operator.add]
+    drafts: Annotated[Dict[int, str], merge_dicts]
+    evaluation_types: Annotated[Dict[int, str], merge_dicts]  # ContentAnalyzer의 결과를 저장
+    technical_feedbacks: Annotated[Dict[int, str], merge_dicts]
+    culture_feedbacks: Annotated[Dict[int, str], merge_dicts]
+    final_drafts: Annotated[Dict[int, str], merge_dicts]
+    current_step: Annotated[str, take_last]
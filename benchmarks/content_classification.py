@@ -0,0 +1,121 @@
+"""로컬 평가 유형 분류기와 LLM(ContentAnalyzer) 판단 비교 벤치마크 (오프라인)
+
+fixtures/content_classification.json의 기준 라벨과 로컬 분류 결과의 일치율, 신뢰도 기준에 따른
+LLM 위임 비율과 지연 시간을 비교합니다. --record를 주면 실제 LLM을 호출해 기준 라벨을 갱신합니다.
+어휘집/기준값을 바꾼 뒤에는 조정에 쓰지 않은 --fixture holdout(content_classification_holdout.json)으로 검증합니다.
+
+    python -m benchmarks.content_classification
+    python -m benchmarks.content_classification --fixture holdout
+    python -m benchmarks.content_classification --threshold 0.7
+    python -m benchmarks.content_classification --record   # OPENAI_API_KEY 필요
+"""
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from langchain.schema import HumanMessage, SystemMessage
+
+from backend.utils.config import get_llm, settings
+from backend.workflow.agents.content_analyzer import ContentAnalyzer
+from backend.workflow.content_classifier import classify_content
+from benchmarks.keyword_extraction import percentile
+
+FIXTURE_PATHS = {
+    "default": Path(__file__).parent / "fixtures" / "content_classification.json",
+    "holdout": Path(__file__).parent / "fixtures" / "content_classification_holdout.json",
+}
+
+
+def _analyzer_state(sample: dict) -> dict:
+    return {
+        "organization": "",
+        "position": "",
+        "requirements": sample["requirements"],
+        "questions": [{"question_id": 1, **sample["question"]}],
+        "current_question_id": 1,
+        "drafts": {1: sample["draft"]},
+    }
+
+
+def record(samples: list) -> None:
+    """실제 LLM을 호출해 기준 라벨과 지연 시간을 기록합니다."""
+    analyzer = ContentAnalyzer(k=0)
+    for sample in samples:
+        messages = [
+            SystemMessage(content=analyzer.system_prompt),
+            HumanMessage(content=analyzer._create_prompt(_analyzer_state(sample))),
+        ]
+        start = time.perf_counter()
+        response = analyzer._bind_llm(get_llm()).invoke(messages)
+        sample["llm_latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        label = ContentAnalyzer._parse_evaluation_type(response.content)
+        if label is not None:
+            sample["label"] = label
+            sample["source"] = "llm"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixture", choices=sorted(FIXTURE_PATHS), default="default",
+                        help="holdout: 어휘집 조정에 사용하지 않은 검증용 예시")
+    parser.add_argument("--record", action="store_true", help="실제 LLM 응답으로 fixture 갱신")
+    parser.add_argument("--threshold", type=float, default=settings.CONTENT_CLASSIFIER_THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=50, help="로컬 분류 반복 횟수")
+    args = parser.parse_args()
+
+    fixture_path = FIXTURE_PATHS[args.fixture]
+    fixture = json.loads(fixture_path.read_text(encoding="utf-8"))
+    samples = fixture["samples"]
+
+    if args.record:
+        record(samples)
+        fixture_path.write_text(json.dumps(fixture, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+    local_latencies = []
+    rows = []
+    for sample in samples:
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            label, confidence, scores = classify_content(
+                sample["question"], sample["draft"], sample["requirements"], sample["company_values"]
+            )
+            local_latencies.append((time.perf_counter() - start) * 1000)
+        rows.append({
+            "expected": sample["label"],
+            "local": label,
+            "confidence": confidence,
+            "escalated": confidence < args.threshold,
+            "scores": scores,
+        })
+
+    confident = [r for r in rows if not r["escalated"]]
+    # 위임된 문항은 LLM 판단(기준 라벨)을 따른다고 보고 최종 정확도 계산
+    final_correct = sum(1 for r in rows if r["escalated"] or r["local"] == r["expected"])
+    llm_latencies = [s["llm_latency_ms"] for s in samples if s.get("llm_latency_ms") is not None]
+    print(json.dumps({
+        "fixture": args.fixture,
+        "threshold": args.threshold,
+        "samples": rows,
+        "local_agreement": round(sum(r["local"] == r["expected"] for r in rows) / len(rows), 3),
+        "confident_agreement": round(
+            sum(r["local"] == r["expected"] for r in confident) / len(confident), 3
+        ) if confident else None,
+        "escalation_rate": round(1 - len(confident) / len(rows), 3),
+        "final_accuracy": round(final_correct / len(rows), 3),
+        "local_latency_ms": {
+            "p50": round(percentile(local_latencies, 0.5), 3),
+            "p95": round(percentile(local_latencies, 0.95), 3),
+        },
+        "llm_latency_ms": {
+            "p50": round(percentile(llm_latencies, 0.5), 1),
+            "p95": round(percentile(llm_latencies, 0.95), 1),
+        } if llm_latencies else None,
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
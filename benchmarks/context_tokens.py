@@ -0,0 +1,117 @@
+"""컨텍스트 조립 전후의 에이전트별 프롬프트 토큰 수 비교 (오프라인)
+
+fixtures/context_state.json의 문항 상태로 각 에이전트의 _prepare_messages를 실행해
+이전 대화를 모두 다시 보내던 방식(before)과 선언된 출력/토큰 예산만 사용하는 방식(after)을 비교합니다.
+--questions N을 주면 앞선 N-1개 문항의 대화가 같은 상태에 쌓여 있던 순차 실행 구조를 재현합니다.
+
+    python -m benchmarks.context_tokens
+    python -m benchmarks.context_tokens --questions 3
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from backend.workflow.agents.content_analyzer import ContentAnalyzer
+from backend.workflow.agents.evaluation_agents import CultureEvaluator, FinalReviewer, TechnicalEvaluator
+from backend.workflow.agents.resume_agent import ResumeWritingAgent
+from backend.utils.tokens import count_tokens, tokenizer_name
+from backend.workflow.context import message_tokens
+from backend.workflow.state import AgentType
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "context_state.json"
+
+# 실행 순서대로 (에이전트, 검색 컨텍스트 사용 여부)
+PIPELINE = [
+    (ResumeWritingAgent, False),
+    (ContentAnalyzer, False),
+    (TechnicalEvaluator, True),
+    (CultureEvaluator, True),
+    (FinalReviewer, False),
+]
+
+
+def build_history(outputs: dict, roles: list, questions: int, question_id: int) -> list:
+    """현재 문항의 이전 출력과, 앞선 문항들의 전체 출력으로 messages를 구성합니다."""
+    history = []
+    for previous_id in range(question_id - questions + 1, question_id):
+        history += [
+            {"role": role, "content": content, "question_id": previous_id}
+            for role, content in outputs.items()
+        ]
+    history += [
+        {"role": role, "content": outputs[role], "question_id": question_id}
+        for role in roles
+    ]
+    return history
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=1, help="같은 상태를 공유하는 문항 수")
+    args = parser.parse_args()
+
+    fixture = json.loads(FIXTURE_PATH.read_text(encoding="utf-8"))
+    state = fixture["state"]
+    outputs = fixture["outputs"]
+    question_id = state["current_question_id"]
+
+    resume_state = {
+        **state,
+        "drafts": {question_id: outputs[AgentType.RESUME_WRITER]},
+        "evaluation_types": {question_id: "both"},
+        "technical_feedbacks": {question_id: outputs[AgentType.TECHNICAL_EVALUATOR]},
+        "culture_feedbacks": {question_id: outputs[AgentType.CULTURE_EVALUATOR]},
+        "final_drafts": {},
+    }
+
+    rows = []
+    completed = []
+    for agent_class, uses_context in PIPELINE:
+        agent = agent_class(k=0)
+        role = AgentType(agent.role).value
+        history = build_history(outputs, completed, args.questions, question_id)
+        context = fixture["context"] if uses_context else ""
+
+        result = agent._prepare_messages({
+            "resume_state": {**resume_state, "messages": history},
+            "context": context,
+            "messages": [],
+            "response": "",
+            "updates": {},
+        })
+        after = sum(count_tokens(message.content) for message in result["messages"])
+        before = (
+            count_tokens(agent.system_prompt)
+            + sum(message_tokens(message) for message in history)
+            + count_tokens(agent._create_prompt({**resume_state, "context": context}))
+        )
+        rows.append({
+            "agent": role,
+            "before": before,
+            "after": after,
+            "reduction": round(1 - after / before, 3),
+        })
+        if role in outputs:
+            completed.append(role)
+
+    total_before = sum(row["before"] for row in rows)
+    total_after = sum(row["after"] for row in rows)
+    print(f"tokenizer: {tokenizer_name()}, questions: {args.questions}")
+    print(f"{'agent':<22}{'before':>8}{'after':>8}{'reduction':>11}")
+    for row in rows:
+        print(f"{row['agent']:<22}{row['before']:>8}{row['after']:>8}{row['reduction']:>10.1%}")
+    print(f"{'total':<22}{total_before:>8}{total_after:>8}{1 - total_after / total_before:>10.1%}")
+    print(json.dumps({
+        "tokenizer": tokenizer_name(),
+        "questions": args.questions,
+        "agents": rows,
+        "total_before": total_before,
+        "total_after": total_after,
+    }, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""임베딩 배치 window 크기별 지연 시간/처리량 비교 벤치마크 (오프라인)
+
+동시에 여러 세션이 검색 결과를 임베딩하는 상황을 가정해 callers개 작업이 각각 texts-per-call개의
+검색 결과 본문(fixtures/search_results.json)을 calls번 임베딩하고, EmbeddingBatcher를 window 값별로
+실행한 결과와 배치 없이 호출마다 바로 요청한 결과(direct, 같은 동시 요청 수 제한)를 비교합니다.
+가짜 임베딩은 요청당 고정 지연(--request-latency)과 텍스트당 지연(--text-latency)을 가집니다.
+
+    python -m benchmarks.embedding_batching
+    python -m benchmarks.embedding_batching --windows 0,0.005,0.02 --callers 16 --max-batch-tokens 4000
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from backend.rag.embedding_batcher import EmbeddingBatcher
+from benchmarks.fakes import SEARCH_FIXTURE_PATH, HashEmbeddings
+from benchmarks.keyword_extraction import percentile
+
+
+def load_texts() -> list:
+    fixture = json.loads(Path(SEARCH_FIXTURE_PATH).read_text(encoding="utf-8"))
+    results = fixture["pool"] + [r for recorded in fixture["recorded"].values() for r in recorded]
+    return [result["body"] for result in results if result.get("body")]
+
+
+async def run(embed, texts: list, callers: int, calls: int, texts_per_call: int) -> dict:
+    """callers개 작업이 동시에 embed를 calls번씩 호출하고 호출 지연 시간과 처리량을 집계합니다."""
+    latencies = []
+
+    async def caller(offset: int) -> None:
+        for call in range(calls):
+            start = (offset * calls + call) * texts_per_call
+            batch = [texts[(start + i) % len(texts)] for i in range(texts_per_call)]
+            started_at = time.perf_counter()
+            await embed(batch)
+            latencies.append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(caller(i) for i in range(callers)))
+    elapsed = time.perf_counter() - started_at
+    total_texts = callers * calls * texts_per_call
+    return {
+        "call_latency_ms": {
+            "p50": round(percentile(latencies, 0.5) * 1000, 1),
+            "p95": round(percentile(latencies, 0.95) * 1000, 1),
+        },
+        "texts_per_second": round(total_texts / elapsed, 1),
+        "wall_s": round(elapsed, 3),
+    }
+
+
+async def run_direct(embeddings, concurrency: int, *workload) -> dict:
+    """배치 없이 호출마다 concurrency개까지 동시에 임베딩을 요청합니다."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def embed(batch: list) -> list:
+        async with semaphore:
+            return await embeddings.aembed_documents(batch)
+
+    return await run(embed, *workload)
+
+
+def _float_list(value: str) -> list:
+    return [float(v) for v in value.split(",") if v]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--windows", type=_float_list, default=[0.0, 0.005, 0.01, 0.02, 0.05],
+                        help="비교할 배치 window 목록(초, 쉼표 구분)")
+    parser.add_argument("--callers", type=int, default=12, help="동시 호출 작업 수")
+    parser.add_argument("--calls", type=int, default=5, help="작업별 호출 수")
+    parser.add_argument("--texts-per-call", type=int, default=10)
+    parser.add_argument("--request-latency", type=float, default=0.05, help="임베딩 요청당 고정 지연(초)")
+    parser.add_argument("--text-latency", type=float, default=0.0005, help="텍스트당 추가 지연(초)")
+    parser.add_argument("--max-batch-tokens", type=int, default=100_000)
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 요청할 최대 배치 수")
+    args = parser.parse_args()
+
+    texts = load_texts()
+    embeddings = HashEmbeddings(latency=args.request_latency, per_text_latency=args.text_latency)
+    workload = (texts, args.callers, args.calls, args.texts_per_call)
+
+    embeddings.calls = 0
+    scenarios = [{
+        "mode": "direct",
+        **asyncio.run(run_direct(embeddings, args.concurrency, *workload)),
+        "embedding_requests": embeddings.calls,
+    }]
+    for window in args.windows:
+        embeddings.calls = 0
+        batcher = EmbeddingBatcher(
+            lambda: embeddings,
+            window=window,
+            max_batch_tokens=args.max_batch_tokens,
+            max_concurrency=args.concurrency,
+        )
+        result = asyncio.run(run(batcher.aembed, *workload))
+        scenarios.append({
+            "mode": "batched",
+            "window_s": window,
+            **result,
+            "embedding_requests": embeddings.calls,
+            "batches": batcher.stats(),
+        })
+
+    print(json.dumps({
+        "config": {
+            "callers": args.callers,
+            "calls": args.calls,
+            "texts_per_call": args.texts_per_call,
+            "request_latency_s": args.request_latency,
+            "text_latency_s": args.text_latency,
+            "max_batch_tokens": args.max_batch_tokens,
+            "concurrency": args.concurrency,
+        },
+        "scenarios": scenarios,
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""오프라인 벤치마크용 LLM/임베딩/웹 검색 대체 구현
+
+install()을 호출하면 get_llm, get_embeddings, 웹 검색 클라이언트가 모두 아래 구현으로 교체되어
+API 키나 네트워크 없이 전체 파이프라인을 실행할 수 있습니다.
+"""
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from backend.rag.search_service import set_search_client
+from backend.utils.config import override_clients
+from backend.utils.tokens import count_tokens
+
+SEARCH_FIXTURE_PATH = Path(__file__).parent / "fixtures" / "search_results.json"
+
+# 응답 본문을 채우는 데 쓰는 어휘 (토큰 수를 맞추기 위한 반복용)
+_FILLER = (
+    "지원자는 프로젝트에서 API 성능을 개선하고 팀과 협업하며 문제를 해결한 경험을 바탕으로 "
+    "회사의 서비스 성장에 기여하고자 합니다"
+).split()
+
+
+class FakeChatModel(BaseChatModel):
+    """지연 시간과 출력 토큰 수를 지정할 수 있는 결정적 가짜 채팅 모델
+
+    마지막 메시지로 호출 종류를 판단해 평가 유형 분석에는 JSON, 검색어 추출에는 쉼표 목록,
+    그 외에는 output_tokens 단어 길이의 본문을 반환하며 usage_metadata도 함께 채웁니다.
+    """
+
+    model_name: str = "benchmark-fake"
+    latency: float = 0.5  # 첫 토큰까지의 시간(초)
+    token_latency: float = 0.0  # 스트리밍 시 토큰 간 간격(초)
+    output_tokens: int = 200
+    evaluation_type: str = "both"
+
+    @property
+    def _llm_type(self) -> str:
+        return "benchmark-fake"
+
+    def _content(self, messages) -> str:
+        prompt = messages[-1].content
+        if "평가 유형" in prompt:
+            return json.dumps({"evaluation_type": self.evaluation_type, "reason": "benchmark"})
+        if "쉼표로" in prompt:
+            return "API 성능 개선, 협업 경험, 서비스 성장"
+        return " ".join(_FILLER[i % len(_FILLER)] for i in range(self.output_tokens))
+
+    def _message(self, messages, content: str) -> AIMessage:
+        prompt_tokens = sum(count_tokens(str(message.content)) for message in messages)
+        completion_tokens = count_tokens(content)
+        return AIMessage(content=content, usage_metadata={
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        })
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        content = self._content(messages)
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages, content))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        content = self._content(messages)
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages, content))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        content = self._content(messages)
+        for word in content.split(" "):
+            if self.token_latency:
+                await asyncio.sleep(self.token_latency)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=word + " "))
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+        usage = self._message(messages, content).usage_metadata
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=usage))
+
+
+class HashEmbeddings(Embeddings):
+    """단어 해시를 차원에 누적하는 결정적 임베딩 (같은 단어를 공유하는 텍스트일수록 유사)
+
+    호출마다 latency + 텍스트 수 * per_text_latency 만큼 지연합니다.
+    """
+
+    def __init__(self, size: int = 256, latency: float = 0.0, per_text_latency: float = 0.0):
+        self.size = size
+        self.latency = latency
+        self.per_text_latency = per_text_latency
+        self.calls = 0
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.size, dtype=np.float32)
+        for word in re.findall(r"\w+", text.lower()):
+            digest = hashlib.md5(word.encode("utf-8")).digest()
+            index = int.from_bytes(digest[:4], "little") % self.size
+            vector[index] += 1.0 if digest[4] % 2 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        time.sleep(self.latency + len(texts) * self.per_text_latency)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        await asyncio.sleep(self.latency + len(texts) * self.per_text_latency)
+        return [self._embed(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+class RecordedSearch:
+    """fixtures/search_results.json의 기록된 결과를 반환하는 DDGS 대체 클라이언트
+
+    기록되지 않은 검색어는 검색어 해시로 기본 결과 풀에서 결정적으로 골라 반환합니다.
+    """
+
+    def __init__(self, fixture: Dict[str, Any], latency: float = 0.0):
+        self.recorded: Dict[str, List[Dict[str, str]]] = fixture["recorded"]
+        self.pool: List[Dict[str, str]] = fixture["pool"]
+        self.latency = latency
+
+    def text(self, query: str, max_results: Optional[int] = 5, **kwargs) -> List[Dict[str, str]]:
+        time.sleep(self.latency)
+        if query in self.recorded:
+            return self.recorded[query][:max_results]
+        rng = random.Random(hashlib.sha256(query.encode("utf-8")).digest())
+        picked = rng.sample(self.pool, min(max_results or 5, len(self.pool)))
+        # 문서 중복 제거가 검색어 단위로 동작하도록 출처에 검색어를 포함
+        return [{**result, "href": f"{result['href']}?q={query}"} for result in picked]
+
+
+def install(
+    llm_latency: float = 0.5,
+    token_latency: float = 0.0,
+    output_tokens: int = 200,
+    evaluation_type: str = "both",
+    embedding_latency: float = 0.0,
+    search_latency: float = 0.2,
+) -> None:
+    """get_llm/get_embeddings/웹 검색을 가짜 구현으로 교체합니다."""
+    fixture = json.loads(SEARCH_FIXTURE_PATH.read_text(encoding="utf-8"))
+    llm = FakeChatModel(
+        latency=llm_latency,
+        token_latency=token_latency,
+        output_tokens=output_tokens,
+        evaluation_type=evaluation_type,
+    )
+    embeddings = HashEmbeddings(latency=embedding_latency)
+    search = RecordedSearch(fixture, latency=search_latency)
+
+    override_clients(
+        llm_factory=lambda model, temperature, streaming: llm,
+        embeddings_factory=lambda model: embeddings,
+    )
+    set_search_client(lambda: search)
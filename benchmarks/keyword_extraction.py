@@ -0,0 +1,103 @@
+"""로컬 키워드 추출기와 LLM 키워드 추출 비교 벤치마크 (오프라인)
+
+fixtures/keyword_extraction.json의 기준 키워드(LLM 출력)와 로컬 추출 결과의
+겹침 정도와 지연 시간을 비교합니다. --record를 주면 실제 LLM을 호출해 fixture를 갱신합니다.
+
+    python -m benchmarks.keyword_extraction
+    python -m benchmarks.keyword_extraction --record   # OPENAI_API_KEY 필요
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from backend.rag.keyword_extractor import extract_keywords
+from backend.rag.search_service import _build_query_messages, _parse_queries
+from backend.utils.config import get_llm
+from backend.workflow.state import AgentType
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "keyword_extraction.json"
+
+
+def _normalize(keyword: str) -> str:
+    return keyword.lower().replace(" ", "")
+
+
+def overlap(predicted: list, expected: list) -> float:
+    """기준 키워드 중 로컬 결과와 일치(포함 관계 허용)하는 비율"""
+    if not expected:
+        return 0.0
+    predicted = [_normalize(k) for k in predicted]
+    matched = sum(
+        any(e in p or p in e for p in predicted)
+        for e in (_normalize(k) for k in expected)
+    )
+    return matched / len(expected)
+
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(q * (len(values) - 1))))
+    return values[index]
+
+
+def record(samples: list) -> None:
+    """실제 LLM을 호출해 기준 키워드와 지연 시간을 기록합니다."""
+    for sample in samples:
+        messages = _build_query_messages(sample["content"], AgentType(sample["role"]))
+        start = time.perf_counter()
+        response = get_llm().invoke(messages)
+        sample["llm_latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        sample["llm_keywords"] = _parse_queries(response.content)
+        sample["source"] = "recorded"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--record", action="store_true", help="실제 LLM 응답으로 fixture 갱신")
+    parser.add_argument("--repeat", type=int, default=50, help="로컬 추출 반복 횟수")
+    args = parser.parse_args()
+
+    fixture = json.loads(FIXTURE_PATH.read_text(encoding="utf-8"))
+    samples = fixture["samples"]
+
+    if args.record:
+        record(samples)
+        FIXTURE_PATH.write_text(json.dumps(fixture, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+    local_latencies = []
+    rows = []
+    for sample in samples:
+        role = AgentType(sample["role"])
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            keywords = extract_keywords(sample["content"], role, top_n=3)
+            local_latencies.append((time.perf_counter() - start) * 1000)
+        rows.append({
+            "role": sample["role"],
+            "llm_keywords": sample["llm_keywords"],
+            "local_keywords": keywords,
+            "overlap": round(overlap(keywords, sample["llm_keywords"]), 3),
+        })
+
+    llm_latencies = [s["llm_latency_ms"] for s in samples if s.get("llm_latency_ms") is not None]
+    print(json.dumps({
+        "samples": rows,
+        "mean_overlap": round(statistics.mean(r["overlap"] for r in rows), 3),
+        "local_latency_ms": {
+            "p50": round(percentile(local_latencies, 0.5), 3),
+            "p95": round(percentile(local_latencies, 0.95), 3),
+        },
+        "llm_latency_ms": {
+            "p50": round(percentile(llm_latencies, 0.5), 1),
+            "p95": round(percentile(llm_latencies, 0.95), 1),
+        } if llm_latencies else None,
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""기술/문화 평가 병렬 실행에 따른 지연 시간 절감 벤치마크
+
+LLM 호출을 고정 지연을 갖는 가짜 모델로 대체하고(RAG 비활성화),
+"both" 문항에 대해 순차 실행 그래프와 병렬 실행 그래프의 소요 시간을 비교합니다.
+
+    python -m benchmarks.parallel_evaluation --latency 0.5 --runs 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.graph import END, StateGraph
+
+import backend.workflow.agents.agent as agent_module
+from backend.workflow.agents.content_analyzer import ContentAnalyzer
+from backend.workflow.agents.evaluation_agents import CultureEvaluator, FinalReviewer, TechnicalEvaluator
+from backend.workflow.agents.resume_agent import ResumeWritingAgent
+from backend.workflow.graph import create_resume_graph
+from backend.workflow.state import AgentType, ResumeState
+
+
+class FixedLatencyChatModel(BaseChatModel):
+    """호출마다 고정 시간 대기 후 응답하는 가짜 채팅 모델"""
+
+    latency: float = 0.5
+
+    @property
+    def _llm_type(self) -> str:
+        return "fixed-latency-fake"
+
+    def _reply(self, messages) -> ChatResult:
+        if "평가 유형" in messages[-1].content:
+            content = json.dumps({"evaluation_type": "both", "reason": "benchmark"})
+        else:
+            content = "벤치마크 응답"
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return self._reply(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._reply(messages)
+
+
+def build_sequential_graph():
+    """병렬화 이전 구조(기술 평가 후 문화 평가)를 재현한 비교용 그래프"""
+    workflow = StateGraph(ResumeState)
+    nodes = [
+        (AgentType.RESUME_WRITER, ResumeWritingAgent(k=0)),
+        (AgentType.CONTENT_ANALYZER, ContentAnalyzer(k=0)),
+        (AgentType.TECHNICAL_EVALUATOR, TechnicalEvaluator(k=0)),
+        (AgentType.CULTURE_EVALUATOR, CultureEvaluator(k=0)),
+        (AgentType.FINAL_REVIEWER, FinalReviewer(k=0)),
+    ]
+    for name, agent in nodes:
+        workflow.add_node(name, agent.as_node())
+    for (src, _), (dst, _) in zip(nodes, nodes[1:]):
+        workflow.add_edge(src, dst)
+    workflow.add_edge(AgentType.FINAL_REVIEWER, END)
+    workflow.set_entry_point(AgentType.RESUME_WRITER)
+    return workflow.compile()
+
+
+def initial_state() -> dict:
+    return {
+        "organization": "네이버",
+        "position": "백엔드 개발자",
+        "requirements": "Python, FastAPI 기반 API 개발 경험",
+        "description": "검색 서비스 백엔드 개발",
+        "company_values": "도전과 협업",
+        "user_profile": {
+            "education": "컴퓨터공학 학사",
+            "experience": "신입",
+            "skills": "Python, FastAPI",
+            "certificates": "",
+            "projects": "쇼핑몰 백엔드 개발",
+            "achievements": "",
+        },
+        "questions": [{
+            "question_id": 1,
+            "content": "지원동기를 작성해주세요",
+            "max_length": 500,
+            "min_length": 200,
+            "category": "지원동기",
+        }],
+        "current_question_id": 1,
+        "drafts": {},
+        "evaluation_types": {},
+        "technical_feedbacks": {},
+        "culture_feedbacks": {},
+        "final_drafts": {},
+        "messages": [],
+    }
+
+
+async def measure(graph, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await graph.ainvoke(initial_state())
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.5, help="LLM 호출당 지연 시간(초)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    fake_llm = FixedLatencyChatModel(latency=args.latency)
+    agent_module.get_llm = lambda *a, **kw: fake_llm
+
+    sequential = asyncio.run(measure(build_sequential_graph(), args.runs))
+    parallel = asyncio.run(measure(create_resume_graph(enable_rag=False), args.runs))
+
+    seq_median = statistics.median(sequential)
+    par_median = statistics.median(parallel)
+    print(json.dumps({
+        "llm_latency_s": args.latency,
+        "runs": args.runs,
+        "sequential_median_s": round(seq_median, 3),
+        "parallel_median_s": round(par_median, 3),
+        "saved_s": round(seq_median - par_median, 3),
+        "saved_ratio": round(1 - par_median / seq_median, 3),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
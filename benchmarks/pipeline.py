@@ -0,0 +1,184 @@
+"""자소서 생성 파이프라인 전체 부하 벤치마크 (오프라인)
+
+benchmarks.fakes의 가짜 LLM(지연 시간/출력 길이 지정), 기록된 검색 결과, 해시 임베딩으로
+create_resume_graph(graph) 또는 /create 엔드포인트(api)를 동시 요청 수와 문항 수를 바꿔가며 실행하고
+시나리오별 p50/p95 지연 시간, 처리량, 최대 RSS를 JSON으로 출력합니다.
+DB_PATH는 임시 파일을 사용하므로 검색/임베딩 캐시는 매 실행마다 비어 있는 상태에서 시작합니다.
+
+    python -m benchmarks.pipeline
+    python -m benchmarks.pipeline --target api --concurrency 1,4,8 --questions 1,3 --requests 16
+    python -m benchmarks.pipeline --llm-latency 1.0 --output-tokens 400 --output baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("OPENAI_EMBEDDING_MODEL", "benchmark-hash")
+os.environ.setdefault("DB_PATH", os.path.join(tempfile.mkdtemp(prefix="benchmark-"), "benchmark.db"))
+# 가짜 검색 클라이언트에는 DuckDuckGo 속도 제한을 적용하지 않음
+os.environ.setdefault("SEARCH_RATE_LIMIT", "0")
+# 같은 fixture 요청을 서로 다른 사용자의 요청으로 취급 (api 대상에서 /create 중복 요청 공유 비활성화)
+os.environ.setdefault("CREATE_COALESCING_ENABLED", "false")
+
+import httpx
+
+from backend.main import app
+from backend.rag.session_store import end_session
+from backend.utils.metrics import metrics
+from backend.workflow.graph import create_resume_graph
+from benchmarks import fakes
+from benchmarks.keyword_extraction import percentile
+
+REQUEST_FIXTURE_PATH = Path(__file__).parent / "fixtures" / "pipeline_request.json"
+
+
+def build_request(template: dict, questions: int) -> dict:
+    """fixture 문항을 순환해 questions개 문항을 가진 /create 요청 본문을 만듭니다."""
+    base = template["questions"]
+    return {
+        **template,
+        "questions": [
+            {**base[i % len(base)], "question_id": i + 1}
+            for i in range(questions)
+        ],
+    }
+
+
+def initial_state(request: dict) -> dict:
+    return {
+        **request,
+        "drafts": {},
+        "evaluation_types": {},
+        "technical_feedbacks": {},
+        "culture_feedbacks": {},
+        "final_drafts": {},
+        "messages": [],
+    }
+
+
+def peak_rss_mb() -> float:
+    # Linux의 ru_maxrss는 KB 단위 (프로세스 시작 이후 최댓값)
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+async def _run_graph(graph, request: dict) -> None:
+    session_id = uuid.uuid4().hex
+    try:
+        await graph.ainvoke(initial_state(request), {"configurable": {"session_id": session_id}})
+    finally:
+        end_session(session_id)
+
+
+async def _run_api(client: httpx.AsyncClient, request: dict) -> None:
+    response = await client.post("/resume/api/v1/resume/create", json=request)
+    response.raise_for_status()
+
+
+async def run_scenario(target: str, concurrency: int, questions: int, requests: int, template: dict) -> dict:
+    """동시 요청 수를 concurrency로 유지하며 requests개 요청을 실행하고 결과를 집계합니다."""
+    request = build_request(template, questions)
+    graph = create_resume_graph(enable_rag=True)
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=None
+    ) as client:
+        async def one() -> None:
+            nonlocal errors
+            async with semaphore:
+                started_at = time.perf_counter()
+                try:
+                    if target == "api":
+                        await _run_api(client, request)
+                    else:
+                        await _run_graph(graph, request)
+                except Exception as e:
+                    errors += 1
+                    print(f"요청 실패: {str(e)}")
+                    return
+                latencies.append(time.perf_counter() - started_at)
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started_at
+
+    return {
+        "target": target,
+        "concurrency": concurrency,
+        "questions": questions,
+        "requests": requests,
+        "errors": errors,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.5) * 1000, 1),
+            "p95": round(percentile(latencies, 0.95) * 1000, 1),
+            "mean": round(statistics.mean(latencies) * 1000, 1),
+        } if latencies else None,
+        "throughput_rps": round(len(latencies) / elapsed, 3),
+        "wall_s": round(elapsed, 3),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _int_list(value: str) -> list:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=["graph", "api"], default="graph")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 4], help="동시 요청 수 목록 (쉼표 구분)")
+    parser.add_argument("--questions", type=_int_list, default=[1, 3], help="요청당 문항 수 목록 (쉼표 구분)")
+    parser.add_argument("--requests", type=int, default=8, help="시나리오별 요청 수")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="LLM 호출당 지연 시간(초)")
+    parser.add_argument("--output-tokens", type=int, default=200, help="LLM 응답 길이(단어 수)")
+    parser.add_argument("--evaluation-type", choices=["technical", "culture", "both"], default="both")
+    parser.add_argument("--search-latency", type=float, default=0.2, help="검색어당 지연 시간(초)")
+    parser.add_argument("--embedding-latency", type=float, default=0.0, help="임베딩 호출당 지연 시간(초)")
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    fakes.install(
+        llm_latency=args.llm_latency,
+        output_tokens=args.output_tokens,
+        evaluation_type=args.evaluation_type,
+        embedding_latency=args.embedding_latency,
+        search_latency=args.search_latency,
+    )
+    template = json.loads(REQUEST_FIXTURE_PATH.read_text(encoding="utf-8"))
+
+    scenarios = [
+        asyncio.run(run_scenario(args.target, concurrency, questions, args.requests, template))
+        for questions in args.questions
+        for concurrency in args.concurrency
+    ]
+    snapshot = metrics.snapshot()
+    report = json.dumps({
+        "config": {
+            "llm_latency_s": args.llm_latency,
+            "output_tokens": args.output_tokens,
+            "evaluation_type": args.evaluation_type,
+            "search_latency_s": args.search_latency,
+            "embedding_latency_s": args.embedding_latency,
+        },
+        "scenarios": scenarios,
+        "llm_calls": sum(snapshot.get("llm_calls_total", {}).values()),
+        "peak_rss_mb": peak_rss_mb(),
+    }, ensure_ascii=False, indent=2)
+
+    print(report)
+    if args.output:
+        args.output.write_text(report + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""노드별 상태 쓰기 크기와 직렬화 시간 측정 (오프라인)
+
+benchmarks.fakes로 외부 호출을 대체한 뒤 N개 문항 요청으로 그래프를 실행하고,
+각 노드가 반환한(채널에 기록되는) 값을 체크포인터와 같은 JsonPlusSerializer로 직렬화해
+노드별 바이트 수와 직렬화 시간을 집계합니다. 상태 구조 변경 전후 비교에 사용합니다.
+
+    python -m benchmarks.state_size
+    python -m benchmarks.state_size --questions 6 --runs 3
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("OPENAI_EMBEDDING_MODEL", "benchmark-hash")
+os.environ.setdefault("DB_PATH", os.path.join(tempfile.mkdtemp(prefix="benchmark-"), "benchmark.db"))
+os.environ.setdefault("SEARCH_RATE_LIMIT", "0")
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from backend.rag.session_store import end_session
+from backend.workflow.graph import create_resume_graph
+from benchmarks import fakes
+from benchmarks.pipeline import REQUEST_FIXTURE_PATH, build_request, initial_state
+
+# 집계할 노드 (에이전트 내부 노드와 문항/에이전트 노드)
+AGENT_INNER_NODES = {"retrieve_context", "prepare_messages", "generate_response", "update_state"}
+
+
+async def measure(graph, request: dict, serializer: JsonPlusSerializer) -> dict:
+    """그래프를 한 번 실행하며 노드 이름별 (호출 수, 바이트, 직렬화 초)를 모읍니다."""
+    totals = defaultdict(lambda: {"calls": 0, "bytes": 0, "seconds": 0.0})
+    session_id = uuid.uuid4().hex
+    config = {"configurable": {"session_id": session_id}}
+    try:
+        async for event in graph.astream_events(initial_state(request), config, version="v2"):
+            if event["event"] != "on_chain_end":
+                continue
+            node = event.get("metadata", {}).get("langgraph_node")
+            if node is None or event["name"] != node:
+                continue
+            output = event["data"].get("output")
+            if not isinstance(output, dict):
+                continue
+            started_at = time.perf_counter()
+            _, payload = serializer.dumps_typed(output)
+            elapsed = time.perf_counter() - started_at
+
+            name = f"agent.{node}" if node in AGENT_INNER_NODES else node
+            totals[name]["calls"] += 1
+            totals[name]["bytes"] += len(payload)
+            totals[name]["seconds"] += elapsed
+    finally:
+        end_session(session_id)
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=6)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output-tokens", type=int, default=300, help="LLM 응답 길이(단어 수)")
+    args = parser.parse_args()
+
+    fakes.install(llm_latency=0.0, output_tokens=args.output_tokens, search_latency=0.0)
+    template = json.loads(REQUEST_FIXTURE_PATH.read_text(encoding="utf-8"))
+    request = build_request(template, args.questions)
+    graph = create_resume_graph(enable_rag=True)
+    serializer = JsonPlusSerializer()
+
+    runs = [asyncio.run(measure(graph, request, serializer)) for _ in range(args.runs)]
+    nodes = {}
+    for name in sorted(runs[0]):
+        calls = runs[0][name]["calls"]
+        total_bytes = runs[0][name]["bytes"]
+        seconds = min(run[name]["seconds"] for run in runs)
+        nodes[name] = {
+            "calls": calls,
+            "bytes_per_call": round(total_bytes / calls),
+            "total_bytes": total_bytes,
+            "serialize_ms": round(seconds * 1000, 3),
+        }
+
+    print(json.dumps({
+        "questions": args.questions,
+        "output_tokens": args.output_tokens,
+        "nodes": nodes,
+        "total_bytes": sum(node["total_bytes"] for node in nodes.values()),
+        "total_serialize_ms": round(sum(node["serialize_ms"] for node in nodes.values()), 3),
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
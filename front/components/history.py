@@ -11,20 +11,30 @@ def format_datetime(dt: str) -> str:
 def render_history():
     """히스토리 목록을 사이드바에 표시"""
     try:
-        history_data = None#get_resume_histories()
+        # 더 보기로 불러온 항목은 세션에 누적
+        if "history_items" not in st.session_state:
+            history_data = get_resume_histories()
+            st.session_state.history_items = history_data["items"]
+            st.session_state.history_cursor = history_data["next_cursor"]
         
-        if not history_data:
+        # 히스토리는 서버에서 비동기로 저장되므로 방금 작성한 결과가 없으면 새로고침
+        if st.button("🔄 새로고침", key="history_refresh"):
+            del st.session_state.history_items
+            st.rerun()
+        
+        history_items = st.session_state.history_items
+        if not history_items:
             st.info("작성 히스토리가 없습니다.")
             return
         
         # 히스토리 목록 표시
-        for item in history_data:
+        for item in history_items:
             with st.expander(
                 f"📝 {item['organization']} - {item['position']}",
                 expanded=False
             ):
                 st.write(f"작성일시: {format_datetime(item['created_at'])}")
-                st.write(f"문항 수: {len(item['questions'])}개")
+                st.write(f"문항 수: {item['question_count']}개")
                 
                 if st.button("상세 보기", key=f"view_{item['id']}"):
                     st.session_state.selected_history = item['id']
@@ -32,9 +42,16 @@ def render_history():
                 if st.button("삭제", key=f"delete_{item['id']}", type="secondary"):
                     if delete_resume_history(item['id']):
                         st.success("삭제되었습니다.")
+                        del st.session_state.history_items
                         st.rerun()
                     else:
                         st.error("삭제 중 오류가 발생했습니다.")
+        
+        if st.session_state.history_cursor and st.button("더 보기", key="history_more"):
+            history_data = get_resume_histories(cursor=st.session_state.history_cursor)
+            st.session_state.history_items = history_items + history_data["items"]
+            st.session_state.history_cursor = history_data["next_cursor"]
+            st.rerun()
     
     except Exception as e:
         st.error(f"히스토리 조회 중 오류가 발생했습니다: {str(e)}")
@@ -83,11 +100,12 @@ def render_history_detail():
                 st.write("**초안**")
                 st.write(detail_data['drafts'][str(question['question_id'])])
                 
-                if 'technical_feedbacks' in detail_data:
+                # 평가 유형에 따라 한쪽 평가만 있을 수 있음
+                if str(question['question_id']) in detail_data.get('technical_feedbacks', {}):
                     st.write("**기술 평가**")
                     st.write(detail_data['technical_feedbacks'][str(question['question_id'])])
                 
-                if 'culture_feedbacks' in detail_data:
+                if str(question['question_id']) in detail_data.get('culture_feedbacks', {}):
                     st.write("**문화 평가**")
                     st.write(detail_data['culture_feedbacks'][str(question['question_id'])])
                 
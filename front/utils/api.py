@@ -1,5 +1,7 @@
+import json
 import requests
-from typing import Dict, Any, List
+from sseclient import Event
+from typing import Dict, Any, List, Iterator, Iterable, Optional
 
 def get_api_url() -> str:
     """API 기본 URL을 반환합니다."""
@@ -16,6 +18,36 @@ def send_resume_request(data: Dict[str, Any]) -> Dict[str, Any]:
     except requests.exceptions.RequestException as e:
         raise Exception(f"API 요청 실패: {str(e)}")
 
+def _parse_sse(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """SSE 응답 줄을 빈 줄 단위로 묶어 {"event": 이벤트명, "data": dict} 형태로 반환합니다."""
+    buffer: List[str] = []
+    for line in lines:
+        if line:
+            buffer.append(line)
+            continue
+        if buffer:
+            event = Event.parse("\n".join(buffer))
+            buffer = []
+            if event.data:
+                yield {"event": event.event, "data": json.loads(event.data)}
+
+def stream_resume_request(data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """자기소개서 작성 요청을 보내고 진행 이벤트(노드 시작/종료, 토큰, 최종 결과)를 차례로 반환합니다."""
+    url = f"{get_api_url()}/resume/api/v1/resume/create/stream"
+    
+    try:
+        with requests.post(
+            url,
+            json=data,
+            stream=True,
+            headers={"Accept": "text/event-stream"},
+        ) as response:
+            response.raise_for_status()
+            response.encoding = "utf-8"
+            yield from _parse_sse(response.iter_lines(decode_unicode=True))
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"API 요청 실패: {str(e)}")
+
 def get_resume_status(session_id: str) -> Dict[str, Any]:
     """자기소개서 작성 상태를 조회합니다."""
     url = f"{get_api_url()}/resume/api/v1/resume/status/{session_id}"
@@ -27,12 +59,13 @@ def get_resume_status(session_id: str) -> Dict[str, Any]:
     except requests.exceptions.RequestException as e:
         raise Exception(f"상태 조회 실패: {str(e)}")
 
-def get_resume_histories() -> List[Dict[str, Any]]:
-    """자기소개서 히스토리 목록을 조회합니다."""
+def get_resume_histories(cursor: Optional[str] = None, organization: Optional[str] = None) -> Dict[str, Any]:
+    """자기소개서 히스토리 목록을 조회합니다. (items, 다음 페이지 조회용 next_cursor)"""
     url = f"{get_api_url()}/resume/histories"
+    params = {"cursor": cursor, "organization": organization}
     
     try:
-        response = requests.get(url)
+        response = requests.get(url, params={k: v for k, v in params.items() if v})
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -1,14 +1,83 @@
 import streamlit as st
 from front.components.sidebar import render_sidebar, init_session_state
 from front.components.history import render_history, render_history_detail
-from front.utils.api import send_resume_request
-from typing import Dict, Any
+from front.utils.api import stream_resume_request
+from typing import Dict, Any, Tuple
+
+# 스트리밍 중 생성 텍스트를 표시할 에이전트와 제목
+STREAMED_NODES = {
+    "RESUME_WRITER": "📝 초안",
+    "TECHNICAL_EVALUATOR": "💻 기술 평가",
+    "CULTURE_EVALUATOR": "🤝 조직문화 평가",
+    "FINAL_REVIEWER": "✨ 최종본",
+}
+
+NODE_NAMES = {
+    "RESUME_WRITER": "자소서 작성",
+    "CONTENT_ANALYZER": "내용 분석",
+    "TECHNICAL_EVALUATOR": "기술 평가",
+    "CULTURE_EVALUATOR": "조직문화 평가",
+    "FINAL_REVIEWER": "최종 검토",
+}
+
+def render_stream(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """스트리밍 응답을 받아 문항별 진행 상황과 생성 중인 텍스트를 점진적으로 표시합니다.
+
+    완료되면 진행 화면을 지우고 최종 결과(첫 토큰까지의 시간 포함)를 반환합니다.
+    """
+    area = st.empty()
+    result: Dict[str, Any] = {}
+    
+    with area.container():
+        status = st.empty()
+        status.info("자기소개서 작성을 시작합니다...")
+        panels: Dict[Tuple[Any, str], Any] = {}
+        texts: Dict[Tuple[Any, str], str] = {}
+        
+        for event in stream_resume_request(request_data):
+            name, data = event["event"], event["data"]
+            
+            if name == "node_start":
+                status.info(f"문항 {data['question_id']} - {NODE_NAMES.get(data['node'], data['node'])} 진행 중...")
+            
+            elif name == "token" and data["node"] in STREAMED_NODES:
+                key = (data["question_id"], data["node"])
+                if key not in panels:
+                    with st.expander(f"문항 {key[0]} {STREAMED_NODES[key[1]]}", expanded=True):
+                        panels[key] = st.empty()
+                texts[key] = texts.get(key, "") + data["token"]
+                panels[key].markdown(texts[key])
+            
+            elif name == "node_end" and data["node"] in STREAMED_NODES:
+                # 캐시된 응답처럼 토큰 없이 끝난 노드는 결과를 한 번에 표시
+                key = (data["question_id"], data["node"])
+                if key not in panels and data["output"].get("messages"):
+                    with st.expander(f"문항 {key[0]} {STREAMED_NODES[key[1]]}", expanded=True):
+                        panels[key] = st.empty()
+                    panels[key].markdown(data["output"]["messages"][-1]["content"])
+            
+            elif name == "error":
+                raise Exception(data["detail"])
+            
+            elif name == "result":
+                result = data
+    
+    area.empty()
+    return result
 
 def render_responses(response_data: Dict[str, Any]):
     """에이전트 응답을 화면에 표시합니다."""
     if not response_data:
         return
     
+    # 스트리밍 측정값 표시
+    stream_metrics = response_data.get("metrics") or {}
+    if stream_metrics.get("ttft_ms") is not None:
+        st.caption(
+            f"첫 토큰까지 {stream_metrics['ttft_ms'] / 1000:.1f}초 · "
+            f"전체 {stream_metrics['total_ms'] / 1000:.1f}초"
+        )
+    
     # 초안 표시
     if "drafts" in response_data:
         st.subheader("📝 초안")
@@ -73,10 +142,11 @@ def main():
         if sidebar_result and sidebar_result.get("submit_clicked") and not st.session_state.is_processing:
             try:
                 st.session_state.is_processing = True
-                with st.spinner("자기소개서를 작성 중입니다..."):
-                    request_data = {k: v for k, v in sidebar_result.items() if k != "submit_clicked"}
-                    response = send_resume_request(request_data)
-                    st.session_state.current_response = response
+                request_data = {k: v for k, v in sidebar_result.items() if k != "submit_clicked"}
+                response = render_stream(request_data)
+                st.session_state.current_response = response
+                # 새로 작성한 결과가 히스토리 탭에 보이도록 목록을 다시 조회
+                st.session_state.pop("history_items", None)
                 st.success("자기소개서 작성이 완료되었습니다!")
             except Exception as e:
                 st.error(f"오류가 발생했습니다: {str(e)}")